@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2016, Maximilian Köhl <mail@koehlma.de>
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License version 3 as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along
+# with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Memory used by idle connections accepted from a TCP server, with and
+without lightweight handles. Only memory allocated through Python's
+allocators is measured, the libuv handle structures come on top.
+"""
+
+from __future__ import print_function, unicode_literals, division, absolute_import
+
+import argparse
+import gc
+import socket
+import tracemalloc
+
+import uv
+
+
+ADDRESS = ('127.0.0.1', 42321)
+
+
+def measure(count, lightweight):
+    loop = uv.Loop()
+    connections = []
+
+    def on_read(connection, status, data):
+        if status != uv.StatusCodes.SUCCESS:
+            connection.close()
+
+    def on_connection(server, status):
+        connection = server.accept(lightweight=lightweight)
+        connection.read_start(on_read=on_read)
+        connections.append(connection)
+
+    server = uv.TCP(loop=loop)
+    server.bind(ADDRESS)
+    server.listen(backlog=count, on_connection=on_connection)
+    # plain sockets are queued in the backlog without touching the loop
+    clients = [socket.create_connection(ADDRESS) for _ in range(count)]
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    while len(connections) < count:
+        loop.run(uv.RunModes.ONCE)
+    gc.collect()
+    total = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    for client in clients:
+        client.close()
+    server.close()
+    loop.run()
+    loop.close()
+    return total / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--connections', type=int, default=2000)
+    arguments = parser.parse_args()
+    regular = measure(arguments.connections, False)
+    lightweight = measure(arguments.connections, True)
+    print('regular handles:     {:8.1f} bytes per idle connection'.format(regular))
+    print('lightweight handles: {:8.1f} bytes per idle connection'.format(lightweight))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,526 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2016, Maximilian Köhl <mail@koehlma.de>
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License version 3 as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along
+# with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Throughput and latency benchmarks. Servers and clients run on the same
+loop in a single process. Every benchmark performs a fixed number of
+operations with a fixed number of concurrent workers, each worker starts
+its next operation as soon as the previous one has completed. Results
+are reported as JSON and may be compared against a previous run. Every
+benchmark runs in a separate process, so that the reported peak resident
+set size belongs to that benchmark alone.
+"""
+
+from __future__ import print_function, unicode_literals, division, absolute_import
+
+import argparse
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+
+import uv
+
+from uv import http
+from uv.library import lib
+
+
+MESSAGE = b'x' * 64
+
+HTTP_REQUEST = (b'GET / HTTP/1.1\r\n'
+                b'Host: localhost\r\n'
+                b'Connection: keep-alive\r\n\r\n')
+
+# response of the uv.http server, used to find the end of a response
+HTTP_RESPONSE = (b'HTTP/1.1 200 OK\r\n'
+                 b'Content-Type: text/plain\r\n'
+                 b'Content-Length: 13\r\n\r\n'
+                 b'Hello World!\n')
+
+
+class Recorder(object):
+    """
+    Hands out operations to the workers and records their latencies.
+    """
+
+    def __init__(self, loop, operations):
+        self.loop = loop
+        self.operations = operations
+        self.started = 0
+        self.latencies = []
+        self.start_time = None
+        self.end_time = None
+        self.on_done = None
+
+    def acquire(self):
+        """
+        Reserve the next operation, returns its start time or `None` if
+        all operations have been started.
+
+        :rtype: int | None
+        """
+        if self.started >= self.operations:
+            return None
+        self.started += 1
+        return lib.uv_hrtime()
+
+    def complete(self, start):
+        """
+        Record the latency of a completed operation.
+
+        :type start: int
+        """
+        self.latencies.append(lib.uv_hrtime() - start)
+        if len(self.latencies) == self.operations:
+            self.end_time = lib.uv_hrtime()
+            if self.on_done is not None:
+                self.on_done()
+
+    @property
+    def done(self):
+        return len(self.latencies) == self.operations
+
+    def run(self, on_done=None):
+        """
+        Run the loop until all operations have completed.
+
+        :param on_done:
+            callback which should release all benchmark handles
+        """
+        self.on_done = on_done
+        self.start_time = lib.uv_hrtime()
+        self.loop.run()
+        if not self.done:
+            raise RuntimeError('loop stopped after %d of %d operations'
+                               % (len(self.latencies), self.operations))
+
+    def percentile(self, fraction):
+        ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, int(fraction * len(ordered)))
+        return ordered[index] / 1e6
+
+    def result(self):
+        seconds = (self.end_time - self.start_time) / 1e9
+        return {'operations': self.operations,
+                'seconds': seconds,
+                'rps': self.operations / seconds if seconds else 0.0,
+                'p50_ms': self.percentile(0.5),
+                'p99_ms': self.percentile(0.99)}
+
+
+class StreamClient(object):
+    """
+    Request-response client on a stream. A response is complete after
+    `size` bytes have been received.
+    """
+
+    def __init__(self, recorder, stream, message, size):
+        self.recorder = recorder
+        self.stream = stream
+        self.message = message
+        self.size = size
+        self.received = 0
+        self.start = None
+
+    def on_connect(self, request, status):
+        self.stream.read_start(on_read=self.on_read)
+        self.send()
+
+    def send(self):
+        self.start = self.recorder.acquire()
+        if self.start is not None:
+            self.received = 0
+            self.stream.write(self.message)
+
+    def on_read(self, stream, status, data):
+        if status != uv.StatusCodes.SUCCESS:
+            stream.close()
+            return
+        self.received += len(data)
+        if self.received >= self.size:
+            self.recorder.complete(self.start)
+            self.send()
+
+
+def on_echo_read(stream, status, data):
+    if status != uv.StatusCodes.SUCCESS:
+        stream.close()
+    elif data:
+        stream.write(data)
+
+
+def on_echo_connection(server, status):
+    connection = server.accept()
+    connection.read_start(on_read=on_echo_read)
+
+
+def bench_tcp_echo(loop, concurrency, operations):
+    recorder = Recorder(loop, operations)
+    server = uv.TCP(loop=loop)
+    server.bind(('127.0.0.1', 0))
+    server.listen(concurrency, on_connection=on_echo_connection)
+    for _ in range(concurrency):
+        client = StreamClient(recorder, uv.TCP(loop=loop), MESSAGE, len(MESSAGE))
+        client.stream.connect(server.sockname, on_connect=client.on_connect)
+    recorder.run(loop.close_all_handles)
+    return recorder
+
+
+def bench_pipe_echo(loop, concurrency, operations):
+    recorder = Recorder(loop, operations)
+    directory = tempfile.mkdtemp()
+    try:
+        path = os.path.join(directory, 'echo.sock')
+        server = uv.Pipe(loop=loop)
+        server.bind(path)
+        server.listen(concurrency, on_connection=on_echo_connection)
+        for _ in range(concurrency):
+            client = StreamClient(recorder, uv.Pipe(loop=loop), MESSAGE, len(MESSAGE))
+            client.stream.connect(path, on_connect=client.on_connect)
+        recorder.run(loop.close_all_handles)
+    finally:
+        shutil.rmtree(directory)
+    return recorder
+
+
+def on_http_request(server, request):
+    request.respond(200, [('Content-Type', 'text/plain')], b'Hello World!\n')
+
+
+def bench_http_keepalive(loop, concurrency, operations):
+    recorder = Recorder(loop, operations)
+    server = http.HTTPServer(on_request=on_http_request, loop=loop)
+    server.listen(('127.0.0.1', 0), concurrency)
+    for _ in range(concurrency):
+        client = StreamClient(recorder, uv.TCP(loop=loop), HTTP_REQUEST,
+                              len(HTTP_RESPONSE))
+        client.stream.connect(server.sockname, on_connect=client.on_connect)
+    recorder.run(loop.close_all_handles)
+    return recorder
+
+
+def bench_udp_pingpong(loop, concurrency, operations):
+    recorder = Recorder(loop, operations)
+
+    def on_server_receive(udp, status, address, data, flags):
+        if data:
+            udp.send(data, address)
+
+    def make_client():
+        state = {'start': None}
+
+        def send():
+            state['start'] = recorder.acquire()
+            if state['start'] is not None:
+                client.send(MESSAGE, server.sockname)
+
+        def on_receive(udp, status, address, data, flags):
+            if data:
+                recorder.complete(state['start'])
+                send()
+
+        client = uv.UDP(loop=loop)
+        client.bind(('127.0.0.1', 0))
+        client.receive_start(on_receive=on_receive)
+        send()
+
+    server = uv.UDP(loop=loop)
+    server.bind(('127.0.0.1', 0))
+    server.receive_start(on_receive=on_server_receive)
+    for _ in range(concurrency):
+        make_client()
+    recorder.run(loop.close_all_handles)
+    return recorder
+
+
+def bench_timer_churn(loop, concurrency, operations):
+    recorder = Recorder(loop, operations)
+
+    def start_timer():
+        start = recorder.acquire()
+        if start is not None:
+            timer = uv.Timer(loop=loop)
+            timer.start(0, on_timeout=lambda timer_handle: on_timeout(timer_handle, start))
+
+    def on_timeout(timer, start):
+        timer.close()
+        recorder.complete(start)
+        start_timer()
+
+    for _ in range(concurrency):
+        start_timer()
+    recorder.run()
+    return recorder
+
+
+def bench_call_later(loop, concurrency, operations):
+    recorder = Recorder(loop, operations)
+
+    def schedule():
+        start = recorder.acquire()
+        if start is not None:
+            loop.call_later(on_call, start)
+
+    def on_call(start):
+        recorder.complete(start)
+        schedule()
+
+    # call_later does not keep the loop alive on its own
+    keep_alive = uv.Idle(loop=loop)
+    keep_alive.start()
+    for _ in range(concurrency):
+        schedule()
+    recorder.run(keep_alive.close)
+    return recorder
+
+
+def bench_getaddrinfo(loop, concurrency, operations):
+    recorder = Recorder(loop, operations)
+
+    def resolve():
+        start = recorder.acquire()
+        if start is not None:
+            uv.dns.getaddrinfo('localhost', 80, callback=lambda *_: on_resolved(start),
+                               loop=loop)
+
+    def on_resolved(start):
+        recorder.complete(start)
+        resolve()
+
+    for _ in range(concurrency):
+        resolve()
+    recorder.run()
+    return recorder
+
+
+def bench_process_spawn(loop, concurrency, operations):
+    recorder = Recorder(loop, operations)
+    arguments = [sys.executable, '-c', '']
+
+    def spawn():
+        start = recorder.acquire()
+        if start is not None:
+            uv.Process(arguments, loop=loop,
+                       on_exit=lambda process, *_: on_exit(process, start))
+
+    def on_exit(process, start):
+        process.close()
+        recorder.complete(start)
+        spawn()
+
+    for _ in range(concurrency):
+        spawn()
+    recorder.run()
+    return recorder
+
+
+def bench_import(loop, concurrency, operations):
+    # compare against process_spawn to get the time spent importing uv
+    recorder = Recorder(loop, operations)
+    arguments = [sys.executable, '-c', 'import uv']
+    environ = dict(os.environ)
+    environ['PYTHONPATH'] = os.pathsep.join(filter(None, [
+        os.path.dirname(os.path.dirname(os.path.abspath(uv.__file__))),
+        environ.get('PYTHONPATH')]))
+
+    def spawn():
+        start = recorder.acquire()
+        if start is not None:
+            uv.Process(arguments, env=environ, loop=loop,
+                       on_exit=lambda process, *_: on_exit(process, start))
+
+    def on_exit(process, start):
+        process.close()
+        recorder.complete(start)
+        spawn()
+
+    for _ in range(concurrency):
+        spawn()
+    recorder.run()
+    return recorder
+
+
+# status codes passed to callbacks, the last one is not a libuv error
+STATUS_CODES = [0, uv.StatusCodes.EOF.value, uv.StatusCodes.ECANCELED.value, -1000]
+
+LOOKUPS = 1000
+
+
+def lookup_enumeration(loop, operations, lookup):
+    recorder = Recorder(loop, operations)
+
+    def on_idle(idle):
+        idle.close()
+        codes = STATUS_CODES * (LOOKUPS // len(STATUS_CODES))
+        start = recorder.acquire()
+        while start is not None:
+            for code in codes:
+                lookup(code)
+            recorder.complete(start)
+            start = recorder.acquire()
+
+    uv.Idle(loop=loop).start(on_idle=on_idle)
+    recorder.run()
+    return recorder
+
+
+def bench_status_lookup(loop, concurrency, operations):
+    # one operation converts a batch of status codes like the callbacks do
+    return lookup_enumeration(loop, operations, uv.StatusCodes.get)
+
+
+def bench_status_construct(loop, concurrency, operations):
+    # previous conversion by calling the enumeration class, for comparison
+    def lookup(code):
+        try:
+            return uv.StatusCodes(code)
+        except ValueError:
+            return code
+    return lookup_enumeration(loop, operations, lookup)
+
+
+# name -> (benchmark, fraction of --operations to perform)
+BENCHMARKS = {
+    'tcp_echo': (bench_tcp_echo, 1),
+    'pipe_echo': (bench_pipe_echo, 1),
+    'udp_pingpong': (bench_udp_pingpong, 1),
+    'http_keepalive': (bench_http_keepalive, 1),
+    'timer_churn': (bench_timer_churn, 1),
+    'call_later': (bench_call_later, 1),
+    'getaddrinfo': (bench_getaddrinfo, 0.1),
+    'process_spawn': (bench_process_spawn, 0.01),
+    'import': (bench_import, 0.01),
+    'status_lookup': (bench_status_lookup, 0.1),
+    'status_construct': (bench_status_construct, 0.1),
+}
+
+
+def max_rss_kb():
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on OS X and in kilobytes elsewhere
+    return max_rss // 1024 if sys.platform == 'darwin' else max_rss
+
+
+def run_benchmark(name, concurrency, operations):
+    benchmark, fraction = BENCHMARKS[name]
+    operations = max(concurrency, int(operations * fraction))
+    loop = uv.Loop()
+    try:
+        recorder = benchmark(loop, concurrency, operations)
+    finally:
+        loop.close_all_handles()
+        loop.run()
+        loop.close()
+    result = recorder.result()
+    result.update(benchmark=name, concurrency=concurrency, max_rss_kb=max_rss_kb())
+    return result
+
+
+def run_isolated(name, concurrency, operations):
+    """
+    Run the benchmark in a fresh interpreter. The peak resident set size
+    is a high-water mark of the whole process, measured in a separate
+    process it belongs to this benchmark alone.
+    """
+    output = subprocess.check_output([sys.executable, os.path.abspath(__file__),
+                                      '--child', name, '--concurrency', str(concurrency),
+                                      '--operations', str(operations)])
+    return json.loads(output.decode('utf-8'))
+
+
+def compare(results, baseline, tolerance):
+    """
+    Compare the results against a previous run and return a message for
+    every benchmark whose throughput dropped by more than `tolerance`.
+    """
+    previous = {(result['benchmark'], result['concurrency']): result
+                for result in baseline['results']}
+    regressions = []
+    for result in results:
+        old = previous.get((result['benchmark'], result['concurrency']))
+        if old is None or not old['rps']:
+            continue
+        change = result['rps'] / old['rps'] - 1
+        if change < -tolerance:
+            regressions.append('{benchmark} (concurrency {concurrency}): '
+                               '{old:.0f} -> {new:.0f} req/s ({change:+.1%})'
+                               .format(benchmark=result['benchmark'],
+                                       concurrency=result['concurrency'],
+                                       old=old['rps'], new=result['rps'],
+                                       change=change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('benchmarks', nargs='*', metavar='benchmark',
+                        help='one of {} (default: all)'.format(', '.join(sorted(BENCHMARKS))))
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 16, 64])
+    parser.add_argument('--operations', type=int, default=20000)
+    parser.add_argument('--output', help='write the JSON report to this file')
+    parser.add_argument('--baseline', help='JSON report of a previous run to compare with')
+    parser.add_argument('--tolerance', type=float, default=0.1,
+                        help='throughput drop reported as regression (default: 0.1)')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    arguments = parser.parse_args()
+    for name in arguments.benchmarks:
+        if name not in BENCHMARKS:
+            parser.error('unknown benchmark: {}'.format(name))
+
+    if arguments.child:
+        result = run_benchmark(arguments.benchmarks[0], arguments.concurrency[0],
+                               arguments.operations)
+        print(json.dumps(result))
+        return
+
+    print('every benchmark runs in its own process, '
+          'rss is the peak resident set size of that process', file=sys.stderr)
+    results = []
+    for name in arguments.benchmarks or sorted(BENCHMARKS):
+        for concurrency in arguments.concurrency:
+            result = run_isolated(name, concurrency, arguments.operations)
+            print('{benchmark:>15} c={concurrency:<4} {rps:>10.0f} req/s  '
+                  'p50 {p50_ms:8.3f} ms  p99 {p99_ms:8.3f} ms  '
+                  'rss {max_rss_kb} kB'.format(**result), file=sys.stderr)
+            results.append(result)
+
+    report = {'python': '{} {}'.format(platform.python_implementation(),
+                                       platform.python_version()),
+              'platform': platform.platform(),
+              'uv': uv.__version__,
+              'libuv': uv.uv_version.string,
+              'max_rss_kb': 'peak resident set size of a separate process per benchmark',
+              'results': results}
+    if arguments.output:
+        with open(arguments.output, 'w') as output:
+            json.dump(report, output, indent=2, sort_keys=True)
+    else:
+        print(json.dumps(report, indent=2, sort_keys=True))
+
+    if arguments.baseline:
+        with open(arguments.baseline) as baseline:
+            regressions = compare(results, json.load(baseline), arguments.tolerance)
+        for regression in regressions:
+            print('regression: ' + regression, file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -763,6 +763,16 @@ typedef struct {
 cross_ipv6_additional cross_get_ipv6_additional(struct sockaddr_in6*);
 void cross_set_ipv6_additional(struct sockaddr_in6*, uint64_t, uint64_t);
 
+typedef struct {
+    int family;
+    int port;
+    uint64_t flowinfo;
+    uint64_t scope_id;
+    char host[46];
+} cross_sockaddr_info;
+
+int cross_unpack_sockaddr(const struct sockaddr*, cross_sockaddr_info*);
+
 
 int cross_uv_poll_init_socket(uv_loop_t*, uv_poll_t*, int);
 uv_handle_type cross_uv_guess_handle(int);
@@ -770,12 +780,48 @@ int cross_uv_tty_init(uv_loop_t*, uv_tty_t*, int, int);
 int cross_uv_pipe_open(uv_pipe_t*, int);
 int cross_uv_tcp_open(uv_tcp_t*, int);
 int cross_uv_udp_open(uv_udp_t*, int);
+
+#define CROSS_UV_UDP_RECVMMSG ...
+#define CROSS_UV_UDP_MMSG_CHUNK_SIZE ...
+
+typedef void (*cross_udp_batch_cb)(uv_udp_t*, ssize_t);
+
+typedef struct {
+    char* base;
+    size_t slot_size;
+    unsigned int slots;
+    unsigned int count;
+    ssize_t* lengths;
+    unsigned int* flags;
+    struct sockaddr_storage* addresses;
+    cross_udp_batch_cb callback;
+} cross_udp_batch_t;
+
+typedef struct {
+    uv_udp_t udp;
+    cross_udp_batch_t* batch;
+    ...;
+} cross_udp_t;
+
+int cross_uv_udp_init_ex(uv_loop_t*, cross_udp_t*, unsigned int);
+int cross_uv_udp_recv_batch_start(cross_udp_t*);
 void cross_set_process_uid_gid(uv_process_options_t*, int, int);
 
 struct sockaddr* interface_address_get_address(uv_interface_address_t*);
 struct sockaddr* interface_address_get_netmask(uv_interface_address_t*);
 
 int cross_uv_fs_close(uv_loop_t*, uv_fs_t*, int, uv_fs_cb);
+int cross_uv_fs_read(uv_loop_t*, uv_fs_t*, int, const uv_buf_t[], unsigned int, int64_t, uv_fs_cb);
+int cross_uv_fs_write(uv_loop_t*, uv_fs_t*, int, const uv_buf_t[], unsigned int, int64_t, uv_fs_cb);
+int cross_uv_fs_fstat(uv_loop_t*, uv_fs_t*, int, uv_fs_cb);
+int cross_uv_fs_fsync(uv_loop_t*, uv_fs_t*, int, uv_fs_cb);
+int cross_uv_fs_fdatasync(uv_loop_t*, uv_fs_t*, int, uv_fs_cb);
+int cross_uv_fs_ftruncate(uv_loop_t*, uv_fs_t*, int, int64_t, uv_fs_cb);
+int cross_uv_fs_sendfile(uv_loop_t*, uv_fs_t*, int, int, int64_t, size_t, uv_fs_cb);
+int cross_uv_fs_fchmod(uv_loop_t*, uv_fs_t*, int, int, uv_fs_cb);
+int cross_uv_fs_futime(uv_loop_t*, uv_fs_t*, int, double, double, uv_fs_cb);
+int cross_uv_fs_fchown(uv_loop_t*, uv_fs_t*, int, int, int, uv_fs_cb);
+int cross_uv_fs_chown(uv_loop_t*, uv_fs_t*, const char*, int, int, uv_fs_cb);
 
 void py_uv_buf_set(uv_buf_t*, char*, unsigned long);
 char* py_uv_buf_get(uv_buf_t*, unsigned long*);
\ No newline at end of file
@@ -13,6 +13,8 @@
  * with this program. If not, see <http://www.gnu.org/licenses/>.
  */
 
+#include <string.h>
+
 #include <uv.h>
 
 /* Python */
@@ -37,6 +39,36 @@ void cross_set_ipv6_additional(struct sockaddr_in6* addr, uint64_t flowinfo, uin
     addr->sin6_scope_id = scope_id;
 }
 
+typedef struct {
+    int family;
+    int port;
+    uint64_t flowinfo;
+    uint64_t scope_id;
+    char host[46];
+} cross_sockaddr_info;
+
+int cross_unpack_sockaddr(const struct sockaddr* addr, cross_sockaddr_info* info) {
+    const struct sockaddr_in* addr4;
+    const struct sockaddr_in6* addr6;
+    info->family = addr->sa_family;
+    info->flowinfo = 0;
+    info->scope_id = 0;
+    switch (addr->sa_family) {
+        case AF_INET:
+            addr4 = (const struct sockaddr_in*) addr;
+            info->port = ntohs(addr4->sin_port);
+            return uv_ip4_name(addr4, info->host, sizeof(info->host));
+        case AF_INET6:
+            addr6 = (const struct sockaddr_in6*) addr;
+            info->port = ntohs(addr6->sin6_port);
+            info->flowinfo = (uint64_t) addr6->sin6_flowinfo;
+            info->scope_id = (uint64_t) addr6->sin6_scope_id;
+            return uv_ip6_name(addr6, info->host, sizeof(info->host));
+        default:
+            return UV_EAFNOSUPPORT;
+    }
+}
+
 
 
 int cross_uv_poll_init_socket(uv_loop_t* loop, uv_poll_t* poll, int fd) {
@@ -59,6 +91,99 @@ int cross_uv_udp_open(uv_udp_t* udp, int fd) {
     return uv_udp_open(udp, (uv_os_sock_t) fd);
 }
 
+/* Batched UDP receive */
+#if UV_VERSION_MAJOR > 1 || (UV_VERSION_MAJOR == 1 && UV_VERSION_MINOR >= 40)
+#define CROSS_UV_UDP_RECVMMSG UV_UDP_RECVMMSG
+#define CROSS_UV_UDP_MMSG_FREE UV_UDP_MMSG_FREE
+#else
+#define CROSS_UV_UDP_RECVMMSG 0
+#define CROSS_UV_UDP_MMSG_FREE 0
+#endif
+/* libuv splits the receive buffer into chunks of this size for recvmmsg */
+#define CROSS_UV_UDP_MMSG_CHUNK_SIZE (64 * 1024)
+
+typedef void (*cross_udp_batch_cb)(uv_udp_t*, ssize_t);
+
+typedef struct {
+    char* base;
+    size_t slot_size;
+    unsigned int slots;
+    unsigned int count;
+    ssize_t* lengths;
+    unsigned int* flags;
+    struct sockaddr_storage* addresses;
+    cross_udp_batch_cb callback;
+} cross_udp_batch_t;
+
+typedef struct {
+    uv_udp_t udp;
+    cross_udp_batch_t* batch;
+} cross_udp_t;
+
+int cross_uv_udp_init_ex(uv_loop_t* loop, cross_udp_t* udp, unsigned int flags) {
+    udp->batch = NULL;
+    return uv_udp_init_ex(loop, &udp->udp, flags);
+}
+
+static void cross_udp_batch_alloc_cb(uv_handle_t* handle, size_t suggested_size,
+                                     uv_buf_t* buffer) {
+    cross_udp_batch_t* batch = ((cross_udp_t*) handle)->batch;
+    unsigned int available;
+    if (batch == NULL || batch->count >= batch->slots) {
+        buffer->base = NULL;
+        buffer->len = 0;
+        return;
+    }
+    available = 1;
+#if CROSS_UV_UDP_RECVMMSG
+    /* with recvmmsg libuv fills as many consecutive chunks as possible */
+    if (batch->slot_size == CROSS_UV_UDP_MMSG_CHUNK_SIZE &&
+        uv_udp_using_recvmmsg((uv_udp_t*) handle)) {
+        available = batch->slots - batch->count;
+    }
+#endif
+    buffer->base = batch->base + batch->count * batch->slot_size;
+    buffer->len = available * batch->slot_size;
+}
+
+static void cross_udp_batch_recv_cb(uv_udp_t* udp, ssize_t length, const uv_buf_t* buffer,
+                                    const struct sockaddr* address, unsigned int flags) {
+    cross_udp_batch_t* batch = ((cross_udp_t*) udp)->batch;
+    unsigned int index;
+    if (batch == NULL || flags & CROSS_UV_UDP_MMSG_FREE) {
+        return;
+    }
+    if (address == NULL) {
+        /* socket has been drained or an error occurred */
+        if (batch->count > 0) {
+            batch->callback(udp, 0);
+        }
+        if (length < 0) {
+            batch = ((cross_udp_t*) udp)->batch;
+            if (batch != NULL) {
+                batch->callback(udp, length);
+            }
+        }
+        return;
+    }
+    index = (unsigned int) ((buffer->base - batch->base) / batch->slot_size);
+    batch->lengths[index] = length;
+    batch->flags[index] = flags;
+    if (address->sa_family == AF_INET6) {
+        memcpy(batch->addresses + index, address, sizeof(struct sockaddr_in6));
+    } else {
+        memcpy(batch->addresses + index, address, sizeof(struct sockaddr_in));
+    }
+    batch->count = index + 1;
+    if (batch->count >= batch->slots) {
+        batch->callback(udp, 0);
+    }
+}
+
+int cross_uv_udp_recv_batch_start(cross_udp_t* udp) {
+    return uv_udp_recv_start(&udp->udp, cross_udp_batch_alloc_cb, cross_udp_batch_recv_cb);
+}
+
 
 void cross_set_process_uid_gid(uv_process_options_t* options, int uid, int gid) {
     options->uid = (uv_uid_t) uid;
@@ -68,6 +193,48 @@ void cross_set_process_uid_gid(uv_process_options_t* options, int uid, int gid)
 int cross_uv_fs_close(uv_loop_t* loop, uv_fs_t* request, int fd, uv_fs_cb callback) {
     return uv_fs_close(loop, request, (uv_file) fd, callback);
 }
+int cross_uv_fs_read(uv_loop_t* loop, uv_fs_t* request, int fd, const uv_buf_t buffers[],
+                     unsigned int count, int64_t offset, uv_fs_cb callback) {
+    return uv_fs_read(loop, request, (uv_file) fd, buffers, count, offset, callback);
+}
+int cross_uv_fs_write(uv_loop_t* loop, uv_fs_t* request, int fd, const uv_buf_t buffers[],
+                      unsigned int count, int64_t offset, uv_fs_cb callback) {
+    return uv_fs_write(loop, request, (uv_file) fd, buffers, count, offset, callback);
+}
+int cross_uv_fs_fstat(uv_loop_t* loop, uv_fs_t* request, int fd, uv_fs_cb callback) {
+    return uv_fs_fstat(loop, request, (uv_file) fd, callback);
+}
+int cross_uv_fs_fsync(uv_loop_t* loop, uv_fs_t* request, int fd, uv_fs_cb callback) {
+    return uv_fs_fsync(loop, request, (uv_file) fd, callback);
+}
+int cross_uv_fs_fdatasync(uv_loop_t* loop, uv_fs_t* request, int fd, uv_fs_cb callback) {
+    return uv_fs_fdatasync(loop, request, (uv_file) fd, callback);
+}
+int cross_uv_fs_ftruncate(uv_loop_t* loop, uv_fs_t* request, int fd, int64_t offset,
+                          uv_fs_cb callback) {
+    return uv_fs_ftruncate(loop, request, (uv_file) fd, offset, callback);
+}
+int cross_uv_fs_sendfile(uv_loop_t* loop, uv_fs_t* request, int out_fd, int in_fd,
+                         int64_t offset, size_t length, uv_fs_cb callback) {
+    return uv_fs_sendfile(loop, request, (uv_file) out_fd, (uv_file) in_fd, offset, length,
+                          callback);
+}
+int cross_uv_fs_fchmod(uv_loop_t* loop, uv_fs_t* request, int fd, int mode,
+                       uv_fs_cb callback) {
+    return uv_fs_fchmod(loop, request, (uv_file) fd, mode, callback);
+}
+int cross_uv_fs_futime(uv_loop_t* loop, uv_fs_t* request, int fd, double atime, double mtime,
+                       uv_fs_cb callback) {
+    return uv_fs_futime(loop, request, (uv_file) fd, atime, mtime, callback);
+}
+int cross_uv_fs_fchown(uv_loop_t* loop, uv_fs_t* request, int fd, int uid, int gid,
+                       uv_fs_cb callback) {
+    return uv_fs_fchown(loop, request, (uv_file) fd, (uv_uid_t) uid, (uv_gid_t) gid, callback);
+}
+int cross_uv_fs_chown(uv_loop_t* loop, uv_fs_t* request, const char* path, int uid, int gid,
+                      uv_fs_cb callback) {
+    return uv_fs_chown(loop, request, path, (uv_uid_t) uid, (uv_gid_t) gid, callback);
+}
 
 void py_uv_buf_set(uv_buf_t* buffer, char* base, unsigned long length) {
     buffer->base = base;
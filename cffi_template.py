@@ -18,6 +18,8 @@ __project__ = 'Python libuv CFFI Bindings'
 __author__ = 'Maximilian Köhl'
 __email__ = 'mail@koehlma.de'
 
+import os
+
 import cffi
 
 declarations = '''
@@ -30,12 +32,17 @@ source = '''
 
 try:
     from _uvcffi import ffi, lib
+    precompiled = True
 except ImportError:
+    if os.environ.get('PYTHON_UV_REQUIRE_PRECOMPILED', None) == 'True':
+        raise ImportError('precompiled _uvcffi extension is missing')
+    # compiling the extension at import time is only meant for development
     ffi = cffi.FFI()
     ffi.cdef(declarations)
     try:
         ffi.set_source('_uvcffi', source, libraries=['uv'])
         ffi.compile()
         from _uvcffi import ffi, lib
-    except AttributeError or ImportError:
+    except (AttributeError, ImportError):
         lib = ffi.verify(source, modulename='_uvcffi', libraries=['uv'])
+    precompiled = False
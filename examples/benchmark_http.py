@@ -15,29 +15,14 @@
 
 import uv
 
-RESPONSE = (b'HTTP/1.1 200 OK\r\n'
-            b'Content-Type: text/plain\r\n'
-            b'Content-Length: 13\r\n\r\n'
-            b'Hello World!\n')
+from uv import http
 
+HEADERS = [('Content-Type', 'text/plain')]
+BODY = b'Hello World!\n'
 
-def on_shutdown(request, _):
-    request.stream.close()
 
-
-def on_read(stream, status, data):
-    if status != uv.StatusCodes.SUCCESS:
-        stream.close()
-    data = data.strip()
-    if not data:
-        return
-    stream.write(RESPONSE)
-    stream.shutdown(on_shutdown)
-
-
-def on_connection(server, _):
-    connection = server.accept()
-    connection.read_start(on_read=on_read)
+def on_request(server, request):
+    request.respond(200, HEADERS, BODY)
 
 
 def on_quit(sigint, _):
@@ -47,9 +32,8 @@ def on_quit(sigint, _):
 def main():
     loop = uv.Loop.get_current()
 
-    server = uv.TCP()
-    server.bind(('0.0.0.0', 4444))
-    server.listen(1000, on_connection=on_connection)
+    server = http.HTTPServer(on_request=on_request)
+    server.listen(('0.0.0.0', 4444), backlog=1000)
 
     sigint = uv.Signal()
     sigint.start(uv.Signals.SIGINT, on_signal=on_quit)
@@ -227,6 +227,13 @@ class BuildExtensions(build_ext):
             self.use_bundled_libuv()
 
         build_ext.build_extensions(self)
+        self.check_extension()
+
+    def check_extension(self):
+        # uvcffi silently compiles the extension on import if it is missing
+        path = self.get_ext_fullpath(extension.name)
+        if not os.path.isfile(path):
+            raise DistutilsError('precompiled extension is missing (%s)' % path)
 
     def use_bundled_libuv(self):
         if self.libuv_force_fetch:
@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import os
+import sys
+
+import uv
+import uv.cluster
+
+once = sys.argv[1:] == ['once']
+
+
+def on_connection(worker, connection):
+    message = '{}:{}'.format(worker.identifier, os.getpid())
+    connection.write(message.encode(), on_write=lambda request, status: connection.close())
+    if once:
+        worker.close()
+
+
+worker = uv.cluster.Worker(on_connection=on_connection)
+uv.Loop.get_current().run()
@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2016, Maximilian Köhl <mail@koehlma.de>
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License version 3 as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along
+# with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import print_function, unicode_literals, division, absolute_import
+
+import ssl
+import sys
+import threading
+import unittest
+
+import common
+
+import uv
+
+try:
+    import asyncio
+    import uv.asyncio
+except ImportError:
+    asyncio = None
+
+
+class EchoProtocol(object if asyncio is None else asyncio.Protocol):
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def data_received(self, data):
+        self.transport.write(data)
+
+    def eof_received(self):
+        self.transport.close()
+
+
+class ClientProtocol(object if asyncio is None else asyncio.Protocol):
+    def __init__(self, event_loop):
+        self.received = []
+        self.closed = event_loop.create_future()
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def data_received(self, data):
+        self.received.append(bytes(data))
+
+    def connection_lost(self, exception):
+        self.closed.set_result(exception)
+
+
+class DatagramProtocol(object if asyncio is None else asyncio.DatagramProtocol):
+    def __init__(self, event_loop):
+        self.received = event_loop.create_future()
+
+    def datagram_received(self, data, address):
+        if not self.received.done():
+            self.received.set_result(data)
+
+
+@unittest.skipIf(asyncio is None, 'asyncio is not available')
+class TestAsyncio(common.TestCase):
+    def set_up(self):
+        self.event_loop = uv.asyncio.EventLoop(self.loop)
+        self.contexts = []
+        self.event_loop.set_exception_handler(lambda loop, context: self.contexts.append(context))
+
+    def tear_down(self):
+        self.event_loop.close()
+        self.assert_equal(self.contexts, [])
+
+    def test_call_soon_later(self):
+        results = []
+        future = self.event_loop.create_future()
+
+        def on_later(argument):
+            results.append(argument)
+            future.set_result(argument)
+
+        self.event_loop.call_later(0.02, on_later, 'later')
+        self.event_loop.call_soon(results.append, 'soon')
+        self.event_loop.call_later(0.01, results.append, 'cancelled').cancel()
+        self.event_loop.call_at(self.event_loop.time() + 0.01, results.append, 'at')
+
+        self.assert_equal(self.event_loop.run_until_complete(future), 'later')
+        self.assert_equal(results, ['soon', 'at', 'later'])
+        self.assert_false(self.event_loop.is_running())
+
+    def test_call_soon_threadsafe(self):
+        future = self.event_loop.create_future()
+
+        def in_thread():
+            self.event_loop.call_soon_threadsafe(future.set_result, threading.current_thread())
+
+        thread = threading.Thread(target=in_thread)
+        self.event_loop.call_soon(thread.start)
+        self.assert_is(self.event_loop.run_until_complete(future), thread)
+        thread.join()
+
+    def test_stop(self):
+        results = []
+        self.event_loop.call_soon(results.append, 1)
+        self.event_loop.call_soon(self.event_loop.stop)
+        self.event_loop.call_later(10, results.append, 2)
+        self.event_loop.run_forever()
+        self.assert_equal(results, [1])
+
+    def test_coroutine(self):
+        self.assert_equal(self.event_loop.run_until_complete(asyncio.sleep(0.01, 'slept')),
+                          'slept')
+
+    def test_run_in_executor(self):
+        future = self.event_loop.run_in_executor(None, threading.current_thread)
+        thread = self.event_loop.run_until_complete(future)
+        self.assert_is_not(thread, threading.current_thread())
+
+    def test_getaddrinfo(self):
+        future = self.event_loop.getaddrinfo(common.TEST_IPV4, common.TEST_PORT1)
+        addrinfo = self.event_loop.run_until_complete(future)
+        self.assert_in((common.TEST_IPV4, common.TEST_PORT1), [info[4] for info in addrinfo])
+
+    def test_tcp_echo(self):
+        server = self.event_loop.run_until_complete(self.event_loop.create_server(
+            EchoProtocol, common.TEST_IPV4, common.TEST_PORT1))
+        self.assert_true(server.is_serving())
+        self.assert_equal(server.sockets[0].getsockname(),
+                          (common.TEST_IPV4, common.TEST_PORT1))
+
+        transport, protocol = self.event_loop.run_until_complete(
+            self.event_loop.create_connection(lambda: ClientProtocol(self.event_loop),
+                                              common.TEST_IPV4, common.TEST_PORT1))
+        self.assert_equal(transport.get_extra_info('peername'),
+                          (common.TEST_IPV4, common.TEST_PORT1))
+        transport.write(b'hello ')
+        transport.write(bytearray(b'world'))
+        transport.write_eof()
+        self.assert_is_none(self.event_loop.run_until_complete(protocol.closed))
+        self.assert_equal(b''.join(protocol.received), b'hello world')
+
+        server.close()
+        self.event_loop.run_until_complete(server.wait_closed())
+        self.assert_false(server.is_serving())
+
+    def test_ssl_echo(self):
+        server_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        # the test key is too small for the default security level
+        server_context.set_ciphers('DEFAULT:@SECLEVEL=0')
+        server_context.load_cert_chain(common.resolve_path('server.crt'),
+                                       common.resolve_path('server.key'))
+        client_context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+        client_context.check_hostname = False
+        client_context.verify_mode = ssl.CERT_NONE
+
+        server = self.event_loop.run_until_complete(self.event_loop.create_server(
+            EchoProtocol, common.TEST_IPV4, common.TEST_PORT1, ssl=server_context))
+        reader, writer = self.event_loop.run_until_complete(
+            asyncio.open_connection(common.TEST_IPV4, common.TEST_PORT1, ssl=client_context))
+        writer.write(b'ping\n')
+        self.assert_equal(self.event_loop.run_until_complete(reader.readline()), b'ping\n')
+        writer.close()
+        server.close()
+        self.event_loop.run_until_complete(server.wait_closed())
+
+    @common.skip_platform('win32')
+    def test_unix_echo(self):
+        self.event_loop.run_until_complete(self.event_loop.create_unix_server(
+            EchoProtocol, common.TEST_PIPE1))
+        transport, protocol = self.event_loop.run_until_complete(
+            self.event_loop.create_unix_connection(lambda: ClientProtocol(self.event_loop),
+                                                   common.TEST_PIPE1))
+        transport.write(b'hello')
+        transport.write_eof()
+        self.event_loop.run_until_complete(protocol.closed)
+        self.assert_equal(b''.join(protocol.received), b'hello')
+
+    def test_stream_api(self):
+        server = self.event_loop.run_until_complete(self.event_loop.create_server(
+            EchoProtocol, common.TEST_IPV4, common.TEST_PORT1))
+        reader, writer = self.event_loop.run_until_complete(
+            asyncio.open_connection(common.TEST_IPV4, common.TEST_PORT1))
+        writer.write(b'ping\n')
+        self.assert_equal(self.event_loop.run_until_complete(reader.readline()), b'ping\n')
+        writer.close()
+        server.close()
+        self.event_loop.run_until_complete(server.wait_closed())
+
+    def test_datagram(self):
+        server_transport, server_protocol = self.event_loop.run_until_complete(
+            self.event_loop.create_datagram_endpoint(
+                lambda: DatagramProtocol(self.event_loop),
+                local_addr=(common.TEST_IPV4, common.TEST_PORT1)))
+        client_transport, _ = self.event_loop.run_until_complete(
+            self.event_loop.create_datagram_endpoint(
+                lambda: DatagramProtocol(self.event_loop),
+                remote_addr=(common.TEST_IPV4, common.TEST_PORT1)))
+        client_transport.sendto(b'hello')
+        self.assert_equal(self.event_loop.run_until_complete(server_protocol.received),
+                          b'hello')
+        client_transport.close()
+        server_transport.close()
+
+    @common.skip_platform('win32')
+    def test_subprocess(self):
+        process = self.event_loop.run_until_complete(asyncio.create_subprocess_exec(
+            sys.executable, '-c', 'import sys; sys.stdout.write(sys.stdin.read())',
+            stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE))
+        stdout, _ = self.event_loop.run_until_complete(process.communicate(b'hello'))
+        self.assert_equal(stdout, b'hello')
+        self.assert_equal(process.returncode, 0)
+
+    def test_policy(self):
+        policy = uv.asyncio.EventLoopPolicy()
+        event_loop = policy.new_event_loop()
+        self.assert_is_instance(event_loop, uv.asyncio.EventLoop)
+        event_loop.close()
+        self.assert_true(event_loop.is_closed())
+
+    def test_policy_alias(self):
+        self.assert_is(uv.asyncio.Policy, uv.asyncio.EventLoopPolicy)
+        previous = asyncio.get_event_loop_policy()
+        asyncio.set_event_loop_policy(uv.asyncio.Policy())
+        try:
+            event_loop = asyncio.new_event_loop()
+            self.assert_is_instance(event_loop, uv.asyncio.EventLoop)
+            event_loop.close()
+            self.assert_true(event_loop.is_closed())
+        finally:
+            asyncio.set_event_loop_policy(previous)
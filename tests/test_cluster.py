@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2016, Maximilian Köhl <mail@koehlma.de>
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License version 3 as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along
+# with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import print_function, unicode_literals, division, absolute_import
+
+import os
+import os.path
+import sys
+
+import common
+
+import uv
+import uv.cluster
+
+
+PROGRAM_CLUSTER_WORKER = common.resolve_path('program_cluster_worker.py')
+
+ADDRESS = (common.TEST_IPV4, common.TEST_PORT1)
+
+
+class TestCluster(common.TestCase):
+    def set_up(self):
+        self.environment = dict(os.environ)
+        package_path = os.path.dirname(os.path.dirname(os.path.abspath(uv.__file__)))
+        self.environment['PYTHONPATH'] = package_path
+        self.responses = []
+
+    def request(self, on_response=None):
+        buffer = []
+
+        def on_read(client, status, data):
+            if status == uv.StatusCodes.SUCCESS:
+                buffer.append(data)
+            else:
+                client.close()
+                self.responses.append(b''.join(buffer).decode())
+                if on_response is not None:
+                    on_response()
+
+        client = uv.TCP()
+        client.connect(ADDRESS, on_connect=lambda request, status: None)
+        client.read_start(on_read=on_read)
+
+    def test_worker_id(self):
+        self.assert_false(uv.cluster.is_worker())
+        self.assert_raises(RuntimeError, uv.cluster.Worker)
+
+    @common.skip_platform('win32')
+    def test_round_robin(self):
+        def on_response():
+            if len(self.responses) == 4:
+                self.master.stop()
+
+        self.master = uv.cluster.Master([sys.executable, PROGRAM_CLUSTER_WORKER], ADDRESS,
+                                        workers=2, mode=uv.cluster.Modes.ROUND_ROBIN,
+                                        env=self.environment)
+        self.assert_equal(self.master.sockname, ADDRESS)
+        self.master.start()
+        for _ in range(4):
+            self.request(on_response)
+        self.loop.run()
+
+        identifiers = sorted(response.split(':')[0] for response in self.responses)
+        self.assert_equal(identifiers, ['0', '0', '1', '1'])
+        self.assert_false(any(worker.alive for worker in self.master.workers))
+
+    @common.skip_platform('win32')
+    def test_shared_restart(self):
+        self.exits = []
+
+        def on_worker_exit(master, worker, returncode, signum):
+            self.exits.append(returncode)
+
+        def on_worker_ready(master, worker):
+            if not self.responses:
+                self.request(on_response)
+
+        def on_response():
+            if len(self.responses) == 1:
+                self.request(on_response)
+            else:
+                self.master.stop()
+
+        self.master = uv.cluster.Master([sys.executable, PROGRAM_CLUSTER_WORKER, 'once'],
+                                        ADDRESS, workers=1, restart_delay=0,
+                                        env=self.environment,
+                                        on_worker_ready=on_worker_ready,
+                                        on_worker_exit=on_worker_exit)
+        self.master.start()
+        self.loop.run()
+
+        self.assert_equal(len(self.responses), 2)
+        first, second = [response.split(':') for response in self.responses]
+        self.assert_equal(first[0], '0')
+        self.assert_equal(second[0], '0')
+        self.assert_not_equal(first[1], second[1])
+        self.assert_equal(self.master.workers[0].restarts, 1)
+        self.assert_equal(self.exits[0], 0)
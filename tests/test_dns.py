@@ -54,3 +54,76 @@ class TestDNS(common.TestCase):
         self.assert_equal(addrinfo.protocol, 2)
         self.assert_is(addrinfo.canonname, None)
         self.assert_equal(addrinfo.address, address6)
+
+    def test_unpack_sockaddr(self):
+        uv.dns.clear_sockaddr_cache()
+        c_sockaddr = uv.dns.make_c_sockaddr(common.TEST_IPV4, common.TEST_PORT1)
+        address4 = uv.dns.unpack_sockaddr(c_sockaddr)
+        self.assert_equal(address4, (common.TEST_IPV4, common.TEST_PORT1))
+        self.assert_is_instance(address4, uv.Address4)
+        self.assert_is(uv.dns.unpack_sockaddr(c_sockaddr), address4)
+
+        c_sockaddr = uv.dns.make_c_sockaddr(common.TEST_IPV6, common.TEST_PORT1, 42, 442)
+        address6 = uv.dns.unpack_sockaddr(c_sockaddr)
+        self.assert_equal(address6, (common.TEST_IPV6, common.TEST_PORT1, 42, 442))
+        self.assert_is_instance(address6, uv.Address6)
+
+        for port in range(uv.dns.SOCKADDR_CACHE_SIZE + 10):
+            c_sockaddr = uv.dns.make_c_sockaddr(common.TEST_IPV4, port)
+            self.assert_equal(uv.dns.unpack_sockaddr(c_sockaddr).port, port)
+        self.assert_equal(len(uv.dns._sockaddr_cache), uv.dns.SOCKADDR_CACHE_SIZE)
+        uv.dns.clear_sockaddr_cache()
+
+    def test_resolver(self):
+        resolver = uv.dns.Resolver(loop=self.loop)
+        self.results = []
+
+        def on_addrinfo(request, code, addrinfo):
+            self.assert_is(request, resolver)
+            self.assert_equal(code, uv.StatusCodes.SUCCESS)
+            self.assert_true(addrinfo)
+            self.results.append(addrinfo)
+
+        resolver.getaddrinfo('localhost', 80, callback=on_addrinfo)
+        resolver.getaddrinfo('localhost', 80, callback=on_addrinfo)
+        self.assert_equal(len(resolver.pending_addrinfo), 1)
+        self.loop.run()
+        self.assert_equal(len(self.results), 2)
+
+        resolver.getaddrinfo('localhost', 80, callback=on_addrinfo)
+        self.assert_false(resolver.pending_addrinfo)
+        self.loop.run()
+        self.assert_equal(len(self.results), 3)
+        self.assert_equal(self.results[2], self.results[0])
+        self.assert_equal(resolver.getaddrinfo('localhost', 80), self.results[0])
+
+        def on_nameinfo(request, code, hostname, service):
+            self.assert_equal(service, 'http')
+            self.results.append(service)
+
+        resolver.getnameinfo('127.0.0.1', 80, callback=on_nameinfo)
+        self.loop.run()
+        resolver.getnameinfo('127.0.0.1', 80, callback=on_nameinfo)
+        self.assert_false(resolver.pending_nameinfo)
+        self.loop.run()
+        self.assert_equal(self.results[3:], ['http', 'http'])
+        self.assert_equal(resolver.getnameinfo('127.0.0.1', 80).service, 'http')
+        resolver.close()
+        self.loop.run()
+        self.assert_true(resolver.closed)
+
+    def test_resolver_cache(self):
+        resolver = uv.dns.Resolver(size=2, loop=self.loop)
+        for port in (80, 81, 82):
+            resolver.getaddrinfo('localhost', port)
+        self.assert_equal([key[1] for key in resolver.addrinfo_cache], [81, 82])
+
+        self.assert_raises(uv.error.UVError, resolver.getaddrinfo, 'localhost', 80, -1)
+        self.assert_equal([key[1] for key in resolver.addrinfo_cache], [82, 80])
+        self.assert_raises(uv.error.UVError, resolver.getaddrinfo, 'localhost', 80, -1)
+
+        resolver.negative_ttl = 0
+        resolver.clear()
+        self.assert_raises(uv.error.UVError, resolver.getaddrinfo, 'localhost', 80, -1)
+        self.assert_false(resolver.addrinfo_cache)
+        resolver.close()
@@ -31,6 +31,13 @@ class TestError(common.TestCase):
         eagain_exception = uv.StatusCodes.EAGAIN.exception
         self.assert_is(eagain_exception, uv.error.TemporaryUnavailableError)
 
+    def test_code_get_member(self):
+        for code in uv.StatusCodes:
+            self.assert_is(uv.StatusCodes.get(int(code)), code)
+        self.assert_is(uv.request.RequestType.get(int(uv.request.RequestType.WRITE)),
+                       uv.request.RequestType.WRITE)
+        self.assert_equal(uv.request.RequestType.get(-1), -1)
+
     def test_raise(self):
         def test1():
             raise uv.UVError(int(uv.StatusCodes.EAGAIN))
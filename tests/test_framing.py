@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2016, Maximilian Köhl <mail@koehlma.de>
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License version 3 as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along
+# with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import print_function, unicode_literals, division, absolute_import
+
+import common
+
+import uv
+
+from uv import framing
+
+
+class TestFraming(common.TestCase):
+    def exchange(self, splitter, chunks, max_frame=2**20):
+        address = (common.TEST_IPV4, common.TEST_PORT1)
+        self.frames = []
+
+        def on_frame(reader, status, frame):
+            if status == uv.StatusCodes.SUCCESS:
+                self.frames.append(frame)
+            else:
+                self.frames.append(status)
+                reader.stream.close()
+
+        def on_connection(server, status):
+            connection = server.accept()
+            self.reader = framing.FrameReader(connection, splitter, on_frame, max_frame)
+            server.close()
+
+        def on_connect(request, status):
+            for chunk in chunks:
+                request.stream.write(chunk)
+            request.stream.close()
+
+        self.server = uv.TCP()
+        self.server.bind(address)
+        self.server.listen(on_connection=on_connection)
+
+        self.client = uv.TCP()
+        self.client.connect(address, on_connect=on_connect)
+
+        self.loop.run()
+
+    def test_delimiter(self):
+        splitter = framing.DelimiterSplitter(b'\r\n')
+        self.exchange(splitter, [b'hello\r', b'\nworld\r\n\r\nrest'])
+        self.assert_equal([bytes(frame) for frame in self.frames[:3]],
+                          [b'hello', b'world', b''])
+        self.assert_equal(self.frames[3], uv.StatusCodes.EOF)
+        self.assert_equal(self.reader.pending, b'rest')
+
+    def test_fixed_length(self):
+        splitter = framing.FixedLengthSplitter(4)
+        self.exchange(splitter, [b'abcdef', b'gh', b'ij'])
+        self.assert_equal([bytes(frame) for frame in self.frames[:2]],
+                          [b'abcd', b'efgh'])
+        self.assert_equal(self.reader.pending, b'ij')
+
+    def test_length_prefix(self):
+        for size in (1, 2, 4, 8):
+            for byteorder in ('big', 'little'):
+                splitter = framing.LengthPrefixSplitter(size, byteorder)
+                payloads = [b'a', b'', b'hello world']
+                chunks = [buffer for payload in payloads
+                          for buffer in splitter.encode(payload)]
+                self.exchange(splitter, chunks)
+                self.assert_equal([bytes(frame) for frame in self.frames[:3]],
+                                  payloads)
+                self.assert_equal(self.frames[3], uv.StatusCodes.EOF)
+
+    def test_max_frame(self):
+        splitter = framing.DelimiterSplitter()
+        self.exchange(splitter, [b'short\n', b'x' * 100], max_frame=10)
+        self.assert_equal(bytes(self.frames[0]), b'short')
+        self.assert_equal(self.frames[1], uv.StatusCodes.ENOBUFS)
+        self.assert_true(self.reader.paused)
+
+    def test_invalid(self):
+        self.assert_raises(ValueError, framing.DelimiterSplitter, b'')
+        self.assert_raises(ValueError, framing.FixedLengthSplitter, 0)
+        self.assert_raises(ValueError, framing.LengthPrefixSplitter, 3)
+        self.assert_raises(ValueError, framing.LengthPrefixSplitter, 4, 'middle')
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2016, Maximilian Köhl <mail@koehlma.de>
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License version 3 as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along
+# with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import print_function, unicode_literals, division, absolute_import
+
+import os
+import os.path
+import shutil
+import tempfile
+
+import common
+
+import uv
+
+
+class TestFS(common.TestCase):
+    def set_up(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'test.txt')
+
+    def tear_down(self):
+        shutil.rmtree(self.directory)
+
+    def test_file(self):
+        self.results = []
+
+        def on_close(request, status):
+            self.assert_equal(status, uv.StatusCodes.SUCCESS)
+            self.results.append('close')
+
+        def on_read(request, status, data):
+            self.assert_equal(status, uv.StatusCodes.SUCCESS)
+            self.assert_equal(data, b'world')
+            self.results.append('read')
+            self.file.close(on_close)
+
+        def on_stat(request, status, stat):
+            self.assert_equal(status, uv.StatusCodes.SUCCESS)
+            self.assert_equal(stat.size, 11)
+            self.results.append('stat')
+            self.file.read(5, 6, on_read)
+
+        def on_fsync(request, status):
+            self.assert_equal(status, uv.StatusCodes.SUCCESS)
+            self.results.append('fsync')
+            self.file.stat(on_stat)
+
+        def on_write(request, status, written):
+            self.assert_equal(status, uv.StatusCodes.SUCCESS)
+            self.assert_equal(written, 11)
+            self.results.append('write')
+            self.file.fsync(on_fsync)
+
+        def on_open(request, status, file):
+            self.assert_equal(status, uv.StatusCodes.SUCCESS)
+            self.assert_is_instance(file, uv.fs.File)
+            self.results.append('open')
+            self.file = file
+            self.file.write([b'hello ', bytearray(b'world')], 0, on_write)
+
+        flags = os.O_RDWR | os.O_CREAT
+        uv.fs.File.open(self.path, flags, callback=on_open, loop=self.loop)
+        self.loop.run()
+
+        self.assert_equal(self.results, ['open', 'write', 'fsync', 'stat', 'read', 'close'])
+        self.assert_true(self.file.closed)
+        self.assert_raises(uv.error.ClosedStructureError, self.file.read, 5)
+        with open(self.path, 'rb') as file:
+            self.assert_equal(file.read(), b'hello world')
+
+    def test_file_synchronous(self):
+        file = uv.fs.File.open(self.path, os.O_RDWR | os.O_CREAT, loop=self.loop)
+        self.assert_equal(file.write(b'hello world'), 11)
+        file.truncate(5)
+        self.assert_equal(file.read(100, 0), b'hello')
+        self.assert_equal(file.stat().size, 5)
+        file.close()
+
+    def test_open_error(self):
+        def on_open(request, status, fd):
+            self.status = status
+            self.fd = fd
+
+        uv.fs.open(os.path.join(self.directory, 'missing'), os.O_RDONLY, callback=on_open,
+                   loop=self.loop)
+        self.loop.run()
+        self.assert_equal(self.status, uv.StatusCodes.ENOENT)
+        self.assert_is_none(self.fd)
+
+        self.assert_raises(uv.error.UVError, uv.fs.File.open,
+                           os.path.join(self.directory, 'missing'), loop=self.loop)
+
+    def test_directories(self):
+        self.entries = None
+
+        def on_scandir(request, status, entries):
+            self.assert_equal(status, uv.StatusCodes.SUCCESS)
+            self.entries = entries
+
+        sub_directory = os.path.join(self.directory, 'sub')
+        uv.fs.mkdir(sub_directory, loop=self.loop)
+        with open(self.path, 'wb') as file:
+            file.write(b'hello')
+        uv.fs.scandir(self.directory, callback=on_scandir, loop=self.loop)
+        self.loop.run()
+
+        self.assert_equal(sorted(self.entries),
+                          [uv.fs.Dirent('sub', uv.fs.DirentType.DIR),
+                           uv.fs.Dirent('test.txt', uv.fs.DirentType.FILE)])
+
+        temporary = uv.fs.mkdtemp(os.path.join(self.directory, 'tmpXXXXXX'), loop=self.loop)
+        self.assert_true(os.path.isdir(temporary))
+        uv.fs.rmdir(temporary, loop=self.loop)
+        self.assert_false(os.path.exists(temporary))
+
+        renamed = os.path.join(sub_directory, 'renamed.txt')
+        uv.fs.rename(self.path, renamed, loop=self.loop)
+        self.assert_equal(uv.fs.stat(renamed, loop=self.loop).size, 5)
+        uv.fs.unlink(renamed, loop=self.loop)
+        self.assert_false(os.path.exists(renamed))
+
+    @common.skip_platform('win32')
+    def test_links(self):
+        with open(self.path, 'wb') as file:
+            file.write(b'hello')
+        link = os.path.join(self.directory, 'link')
+        uv.fs.symlink(self.path, link, loop=self.loop)
+        self.assert_equal(uv.fs.readlink(link, loop=self.loop), self.path)
+        self.assert_not_equal(uv.fs.lstat(link, loop=self.loop).size, 5)
+        uv.fs.chmod(self.path, 0o600, loop=self.loop)
+        self.assert_equal(uv.fs.stat(link, loop=self.loop).mode & 0o777, 0o600)
+        uv.fs.access(self.path, os.R_OK, loop=self.loop)
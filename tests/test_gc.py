@@ -86,3 +86,60 @@ class TestGC(common.TestCase):
         self.assert_is(weak_client(), None)
 
         self.loop.close()
+
+    def test_gc_lightweight(self):
+        tcp = uv.TCP(lightweight=True)
+        self.assert_is_instance(tcp.base_handle, uv.base.HandleReference)
+        self.assert_is(tcp.base_handle.user_handle, tcp)
+        weak_handle = weakref.ref(tcp)
+        base_handle = tcp.base_handle
+        del tcp
+        gc.collect()
+        self.assert_is(weak_handle(), None)
+        self.assert_in(base_handle, self.loop.base_loop.handles_to_close)
+        uv.Timer().start(1)
+        self.loop.run()
+        self.assert_true(base_handle.closed)
+        self.assert_false(base_handle in self.loop.base_loop.handles)
+
+        def on_connection(server, status):
+            connection = server.accept(lightweight=True)
+            connection.read_start(on_read=on_read)
+            self.weak_connection = weakref.ref(connection)
+            server.close()
+
+        def on_read(connection, status, data):
+            connection.close()
+
+        server = uv.TCP()
+        server.bind((common.TEST_IPV4, common.TEST_PORT1))
+        server.listen(on_connection=on_connection)
+        client = uv.TCP()
+        client.connect((common.TEST_IPV4, common.TEST_PORT1))
+        while not hasattr(self, 'weak_connection'):
+            self.loop.run(uv.RunModes.ONCE)
+        gc.collect()
+        self.assert_is_not(self.weak_connection(), None)
+        client.close()
+        self.loop.run()
+        gc.collect()
+        self.assert_is(self.weak_connection(), None)
+
+    def test_gc_lightweight_pending(self):
+        loop = uv.Loop()
+        tcp = uv.TCP(loop=loop, lightweight=True)
+        tcp.set_pending()
+        weak_loop = weakref.ref(loop)
+        weak_handle = weakref.ref(tcp)
+        base_handle = tcp.base_handle
+
+        self.loop.make_current()
+        del loop
+        del tcp
+
+        gc.collect()
+
+        # the pending handle does not keep the loop alive but is closed with it
+        self.assert_is(weak_loop(), None)
+        self.assert_is(weak_handle(), None)
+        self.assert_true(base_handle.closed)
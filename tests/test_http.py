@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2016, Maximilian Köhl <mail@koehlma.de>
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License version 3 as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along
+# with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import print_function, unicode_literals, division, absolute_import
+
+import common
+
+import uv
+
+from uv import http
+
+
+class TestHTTP(common.TestCase):
+    def exchange(self, data, on_request, **keywords):
+        address = (common.TEST_IPV4, common.TEST_PORT1)
+        self.requests = []
+        self.response = b''
+
+        def on_server_request(server, request):
+            self.requests.append(request)
+            on_request(request)
+
+        def on_read(stream, status, data):
+            if status == uv.StatusCodes.SUCCESS:
+                self.response += data
+            else:
+                stream.close()
+                self.server.close()
+
+        def on_connect(request, status):
+            request.stream.read_start(on_read=on_read)
+            request.stream.write(data)
+
+        self.server = http.HTTPServer(on_request=on_server_request, **keywords)
+        self.server.listen(address)
+
+        self.client = uv.TCP()
+        self.client.connect(address, on_connect=on_connect)
+
+        self.loop.run()
+
+    def test_pipelining(self):
+        pending = []
+
+        def on_request(request):
+            if request.target == '/first':
+                # answer the first request after the second one
+                pending.append(request)
+            else:
+                request.respond(200, [('X-Target', request.target)], request.body)
+                while pending:
+                    first = pending.pop()
+                    first.respond(200, [('X-Target', first.target)], b'first')
+
+        self.exchange(b'GET /first HTTP/1.1\r\n\r\n'
+                      b'POST /second HTTP/1.1\r\nContent-Length: 6\r\n\r\nsecond'
+                      b'POST /third HTTP/1.1\r\nTransfer-Encoding: chunked\r\n'
+                      b'Connection: close\r\n\r\n'
+                      b'3\r\nthi\r\n2\r\nrd\r\n0\r\n\r\n', on_request)
+
+        self.assert_equal([request.target for request in self.requests],
+                          ['/first', '/second', '/third'])
+        self.assert_equal(self.requests[2].body, b'third')
+        self.assert_equal(self.response,
+                          b'HTTP/1.1 200 OK\r\nX-Target: /first\r\n'
+                          b'Content-Length: 5\r\n\r\nfirst'
+                          b'HTTP/1.1 200 OK\r\nX-Target: /second\r\n'
+                          b'Content-Length: 6\r\n\r\nsecond'
+                          b'HTTP/1.1 200 OK\r\nX-Target: /third\r\n'
+                          b'Content-Length: 5\r\nConnection: close\r\n\r\nthird')
+
+    def test_malformed(self):
+        self.exchange(b'GET /\r\n\r\n', lambda request: request.respond())
+        self.assert_equal(self.requests, [])
+        self.assert_true(self.response.startswith(b'HTTP/1.1 400 '))
+
+    def test_limits(self):
+        self.exchange(b'POST / HTTP/1.1\r\nContent-Length: 100\r\n\r\n',
+                      lambda request: request.respond(), max_body_size=10)
+        self.assert_true(self.response.startswith(b'HTTP/1.1 413 '))
+
+        self.exchange(b'GET / HTTP/1.1\r\nX-Long: ' + b'x' * 100,
+                      lambda request: request.respond(), max_header_size=64)
+        self.assert_true(self.response.startswith(b'HTTP/1.1 431 '))
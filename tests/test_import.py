@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2016, Maximilian Köhl <mail@koehlma.de>
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License version 3 as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along
+# with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import print_function, unicode_literals, division, absolute_import
+
+import os
+import subprocess
+import sys
+import unittest
+
+import common
+
+import uv
+
+
+LAZY_IMPORT = '''
+import sys
+import uv
+assert 'uv.secure' not in sys.modules
+assert 'uv.http' not in sys.modules
+assert uv.secure.__name__ == 'uv.secure'
+'''
+
+GUESS_HANDLE = '''
+import socket
+import uv
+sock = socket.socket()
+handle_type = uv.misc.guess_handle(sock.fileno())
+assert handle_type is uv.TCP, handle_type
+'''
+
+
+class TestImport(common.TestCase):
+    @unittest.skipIf(sys.version_info < (3, 7), 'modules are imported eagerly')
+    def test_lazy_import(self):
+        root = os.path.dirname(os.path.dirname(os.path.abspath(uv.__file__)))
+        subprocess.check_call([sys.executable, '-c', LAZY_IMPORT], cwd=root)
+
+    def test_guess_handle_fresh(self):
+        root = os.path.dirname(os.path.dirname(os.path.abspath(uv.__file__)))
+        subprocess.check_call([sys.executable, '-c', GUESS_HANDLE], cwd=root)
+
+    def test_attributes(self):
+        self.assert_is(uv.Async, getattr(uv, 'async').Async)
+        self.assert_is(uv.getaddrinfo, uv.dns.getaddrinfo)
+        self.assert_in('UDP', dir(uv))
+        self.assert_raises(AttributeError, getattr, uv, 'does_not_exist')
@@ -13,8 +13,15 @@
 # You should have received a copy of the GNU Lesser General Public License along
 # with this program. If not, see <http://www.gnu.org/licenses/>.
 
+import os
 import threading
 import time
+import unittest
+
+try:
+    import concurrent.futures
+except ImportError:
+    concurrent = None
 
 import common
 
@@ -172,6 +179,62 @@ class TestLoop(common.TestCase):
 
         self.assert_true(self.callback_called)
 
+    @unittest.skipIf(concurrent is None, 'concurrent.futures is not available')
+    def test_submit_threadsafe(self):
+        # keep the loop alive
+        self.prepare = uv.Prepare()
+        self.prepare.start()
+
+        def function(value):
+            self.assert_is(uv.Loop.get_current(), self.loop)
+            self.prepare.close()
+            return value * 2
+
+        results = []
+
+        def submit():
+            future = self.loop.submit_threadsafe(function, 21)
+            results.append(future.result())
+
+        thread = threading.Thread(target=submit)
+        thread.start()
+        self.loop.run()
+        thread.join()
+
+        self.assert_equal(results, [42])
+
+    @unittest.skipIf(concurrent is None, 'concurrent.futures is not available')
+    def test_submit_threadsafe_exception(self):
+        self.prepare = uv.Prepare()
+        self.prepare.start()
+
+        def function():
+            self.prepare.close()
+            raise ValueError('test')
+
+        future = self.loop.submit_threadsafe(function)
+        self.loop.run()
+
+        self.assert_is_instance(future.exception(), ValueError)
+
+    @unittest.skipIf(concurrent is None, 'concurrent.futures is not available')
+    def test_run_in_executor(self):
+        executor = concurrent.futures.ThreadPoolExecutor(2)
+        threads = []
+
+        def on_done(future):
+            threads.append(threading.current_thread())
+
+        future = self.loop.run_in_executor(executor, time.sleep, 0.01)
+        future.add_done_callback(on_done)
+        failing = self.loop.run_in_executor(executor, int, 'x')
+        self.loop.run()
+        executor.shutdown()
+
+        self.assert_true(future.done())
+        self.assert_is_instance(failing.exception(), ValueError)
+        self.assert_equal(threads, [threading.current_thread()])
+
     def test_current_loop(self):
         self.assertEqual(uv.Loop.get_default(), uv.Loop.get_current())
 
@@ -292,3 +355,108 @@ class TestLoop(common.TestCase):
 
     def test_poll_timeout(self):
         self.assert_equal(self.loop.get_timeout(), 0)
+
+    def test_pooled_allocator(self):
+        self.loop.allocator = uv.loop.PooledAllocator(chunk_size=1024, slab_chunks=2)
+        self.data = []
+
+        def on_read(connection, status, data):
+            if status == uv.StatusCodes.SUCCESS and data:
+                self.assert_is_instance(data, memoryview)
+                self.data.append(data)
+            if len(self.data) == 1:
+                connection.close()
+                self.server.close()
+
+        def on_connection(server, status):
+            connection = server.accept()
+            connection.read_start(on_read=on_read)
+
+        self.server = uv.Pipe()
+        self.server.bind(common.TEST_PIPE1)
+        self.server.listen(on_connection=on_connection)
+
+        self.client = uv.Pipe()
+        self.client.connect(common.TEST_PIPE1)
+        self.client.write(b'hello', on_write=lambda request, status: self.client.close())
+
+        self.loop.run()
+
+        self.assert_equal(bytes(self.data[0]), b'hello')
+        self.assert_equal(self.loop.allocator.chunks_in_use, 1)
+        self.data.pop().release()
+        self.assert_equal(self.loop.allocator.chunks_in_use, 0)
+
+    def test_pooled_allocator_exhausted(self):
+        allocator = uv.loop.PooledAllocator(chunk_size=16, slab_chunks=1, max_chunks=1)
+        uv_buffers = uv.library.ffi.new('uv_buf_t[]', 2)
+
+        allocator.allocate(None, 16, uv_buffers + 0)
+        allocator.allocate(None, 16, uv_buffers + 1)
+        self.assert_false(uv.library.uv_buffer_get(uv_buffers + 1).base)
+        self.assert_equal(allocator.finalize(None, -1, uv_buffers + 1), b'')
+
+        self.assert_equal(allocator.chunks_in_use, 1)
+        self.assert_equal(allocator.finalize(None, 0, uv_buffers + 0), b'')
+        self.assert_equal(allocator.chunks_in_use, 0)
+
+    def test_metrics(self):
+        self.assert_false(self.loop.metrics_enabled)
+        self.assert_equal(self.loop.metrics().iterations, 0)
+
+        self.loop.enable_metrics()
+        self.assert_true(self.loop.metrics_enabled)
+
+        self.timer_called = 0
+
+        def on_timeout(timer):
+            self.timer_called += 1
+            time.sleep(0.01)
+            if self.timer_called == 5:
+                timer.close()
+
+        self.timer = uv.Timer(on_timeout=on_timeout)
+        self.timer.start(5, repeat=5)
+        self.loop.call_later(uv.common.dummy_callback)
+        self.loop.run()
+
+        metrics = self.loop.metrics()
+        self.assert_greater_equal(metrics.iterations, 5)
+        self.assert_equal(metrics.callbacks['Timer'].count, 6)
+        self.assert_greater_equal(metrics.callbacks['Timer'].time, 0.05)
+        self.assert_equal(metrics.callbacks['Loop'].count, 1)
+        self.assert_greater_equal(metrics.callback_time, metrics.callbacks['Timer'].time)
+        self.assert_greater_equal(metrics.max_lag, 0.01)
+        self.assert_greater_equal(metrics.max_lag, metrics.mean_lag)
+        self.assert_greater_equal(metrics.poll_time, 0)
+
+        self.loop.disable_metrics()
+        self.assert_false(self.loop.metrics_enabled)
+        self.timer = uv.Timer(on_timeout=lambda timer: timer.close())
+        self.timer.start(1)
+        self.loop.run()
+        self.assert_equal(self.loop.metrics(), metrics)
+
+        self.loop.enable_metrics(reset=True)
+        self.assert_equal(self.loop.metrics().callbacks, {})
+
+    @common.skip_platform('win32')
+    def test_metrics_prepare(self):
+        read_fd, write_fd = os.pipe()
+
+        def on_write(request, status):
+            time.sleep(0.05)
+            stream.close()
+
+        self.loop.enable_metrics()
+        stream = uv.Pipe()
+        stream.open(write_fd)
+        stream.set_try_write()
+        stream.write(b'hello', on_write=on_write)
+        self.loop.run()
+        os.close(read_fd)
+
+        metrics = self.loop.metrics()
+        # the deferred write callback runs before polling, not while polling
+        self.assert_less(metrics.poll_time, 0.05)
+        self.assert_greater_equal(metrics.max_lag, 0.05)
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2016, Maximilian Köhl <mail@koehlma.de>
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License version 3 as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along
+# with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import print_function, unicode_literals, division, absolute_import
+
+import common
+
+import uv
+import uv.pool
+
+
+ADDRESS = (common.TEST_IPV4, common.TEST_PORT1)
+
+
+class TestPool(common.TestCase):
+    def set_up(self):
+        self.accepted = []
+        self.server = uv.TCP()
+        self.server.bind(ADDRESS)
+        self.server.listen(on_connection=self.on_connection)
+
+    def on_connection(self, server, status):
+        connection = server.accept()
+        connection.read_start(on_read=self.on_server_read)
+        self.accepted.append(connection)
+
+    def on_server_read(self, connection, status, data):
+        if status != uv.StatusCodes.SUCCESS:
+            connection.close()
+
+    def test_reuse(self):
+        pool = uv.pool.ConnectionPool(max_per_endpoint=1)
+        self.streams = []
+
+        def on_second(connection_pool, status, stream):
+            self.assert_equal(status, uv.StatusCodes.SUCCESS)
+            self.streams.append(stream)
+            connection_pool.release(stream)
+            self.assert_equal(connection_pool.idle_count, 1)
+            self.server.close()
+            self.accepted[0].close()
+
+        def on_first(connection_pool, status, stream):
+            self.assert_equal(status, uv.StatusCodes.SUCCESS)
+            self.assert_is_instance(stream, uv.TCP)
+            self.streams.append(stream)
+            connection_pool.acquire(ADDRESS, on_second)
+            self.assert_equal(connection_pool.waiting_count, 1)
+            connection_pool.release(stream)
+
+        pool.acquire(ADDRESS, on_first)
+        self.loop.run()
+
+        self.assert_equal(len(self.accepted), 1)
+        self.assert_is(self.streams[0], self.streams[1])
+        pool.close()
+        self.assert_equal(pool.connection_count, 0)
+        self.assert_true(self.streams[0].closing)
+
+    def test_idle_eof(self):
+        pool = uv.pool.ConnectionPool()
+
+        def on_acquire(connection_pool, status, stream):
+            connection_pool.release(stream)
+            self.server.close()
+
+        def on_timeout(timer):
+            if self.accepted and not self.accepted[0].closing:
+                self.accepted[0].close()
+            elif not pool.connection_count:
+                timer.close()
+
+        pool.acquire(ADDRESS, on_acquire)
+        uv.Timer(on_timeout=on_timeout).start(1, repeat=1)
+        self.loop.run()
+
+        self.assert_equal(pool.idle_count, 0)
+        self.assert_equal(pool.connection_count, 0)
+
+    def test_idle_timeout(self):
+        pool = uv.pool.ConnectionPool(max_idle_time=10)
+
+        def on_acquire(connection_pool, status, stream):
+            self.stream = stream
+            connection_pool.release(stream)
+
+        pool.acquire(ADDRESS, on_acquire)
+        self.loop.run(uv.RunModes.ONCE)
+        while not self.accepted or pool.idle_count:
+            self.loop.run(uv.RunModes.ONCE)
+
+        self.assert_true(self.stream.closing)
+        self.assert_equal(pool.connection_count, 0)
+        self.server.close()
+        self.loop.run()
+
+    def test_connect_error(self):
+        self.server.close()
+        pool = uv.pool.ConnectionPool(loop=self.loop)
+        self.statuses = []
+
+        def on_acquire(connection_pool, status, stream):
+            self.assert_is_none(stream)
+            self.statuses.append(status)
+
+        pool.acquire(ADDRESS, on_acquire)
+        self.loop.run()
+
+        self.assert_equal(self.statuses, [uv.StatusCodes.ECONNREFUSED])
+        self.assert_equal(pool.connection_count, 0)
+        pool.close()
+        self.assert_raises(uv.error.ClosedStructureError, pool.acquire, ADDRESS, on_acquire)
+
+    def test_close_connecting(self):
+        pool = uv.pool.ConnectionPool(loop=self.loop)
+        self.statuses = []
+
+        def on_acquire(connection_pool, status, stream):
+            self.assert_is_none(stream)
+            self.statuses.append(status)
+            self.server.close()
+            for connection in self.accepted:
+                connection.close()
+
+        pool.acquire(ADDRESS, on_acquire)
+        pool.close()
+        self.loop.run()
+
+        self.assert_equal(self.statuses, [uv.StatusCodes.ECANCELED])
+        self.assert_equal(pool.connection_count, 0)
@@ -37,3 +37,28 @@ class TestRequest(common.TestCase):
         self.assert_raises(uv.error.ArgumentError,
                            self.tcp.connect(('127.0.0.1', 80)).cancel)
 
+    @common.skip_interpreter('pypy')
+    def test_recycle(self):
+        self.receiver = uv.UDP()
+        self.receiver.bind(('127.0.0.1', 0))
+        self.sender = uv.UDP()
+
+        base_requests = []
+        for _ in range(3):
+            request = self.sender.send(b'hello', self.receiver.sockname)
+            base_requests.append(request.base_request)
+            del request
+            self.loop.run()
+        self.assert_is(base_requests[0], base_requests[1])
+        self.assert_is(base_requests[1], base_requests[2])
+
+        request = self.sender.send(b'hello', self.receiver.sockname)
+        self.loop.run()
+        other = self.sender.send(b'hello', self.receiver.sockname)
+        self.loop.run()
+        self.assert_true(request.base_request.finished)
+        self.assert_is_not(request.base_request, other.base_request)
+
+        self.sender.close()
+        self.receiver.close()
+        self.loop.run()
@@ -15,6 +15,9 @@
 
 from __future__ import print_function, unicode_literals, division, absolute_import
 
+import ssl
+import unittest
+
 import common
 
 import uv
@@ -23,40 +26,94 @@ import uv
 KEYFILE = common.resolve_path('server.key')
 CERTFILE = common.resolve_path('server.crt')
 
+# dedicated client and server protocols are only available since Python 3.6
+PROTOCOL_SERVER = getattr(ssl, 'PROTOCOL_TLS_SERVER', ssl.PROTOCOL_SSLv23)
+PROTOCOL_CLIENT = getattr(ssl, 'PROTOCOL_TLS_CLIENT', ssl.PROTOCOL_SSLv23)
+
 
 @common.skip_interpreter('pypy')
+@unittest.skipIf(not hasattr(ssl, 'MemoryBIO'), 'TLS on memory buffers is not supported')
 class TestSecure(common.TestCase):
-    def test_secure(self):
-        def on_client_handshake(handshake_request, status, ssl_error):
-            import sys
-            print('client handshake:', status, file=sys.stderr)
-            self.client.close()
-
-        def on_connect(connect_request, status):
-            self.client.handshake(on_handshake=on_client_handshake)
-            import sys
-            print('client connection:', status, file=sys.stderr)
-
-        def on_server_handshake(handshake_request, status, ssl_error):
-            import sys
-            print('handshake server:', status, file=sys.stderr)
-            self.server.close()
-
-        def on_connection(secure_server, status):
-            connection = secure_server.accept(keyfile=KEYFILE, certfile=CERTFILE)
-            connection.handshake(on_handshake=on_server_handshake)
-            import sys
-            print('sever connection:', status, file=sys.stderr)
-
-        self.server = uv.secure.Secure()
-        self.server.bind((common.TEST_IPV4, common.TEST_PORT2))
-        self.server.listen(5, on_connection=on_connection)
-
-        self.client = uv.secure.Secure()
-        self.client.connect((common.TEST_IPV4, common.TEST_PORT2), on_connect=on_connect)
-
+    def set_up(self):
+        self.server_context = ssl.SSLContext(PROTOCOL_SERVER)
         try:
-            self.loop.run()
-        finally:
-            self.server._socket.close()
-            self.client._socket.close()
+            # the test key is too small for the default security level
+            self.server_context.set_ciphers('DEFAULT:@SECLEVEL=0')
+        except ssl.SSLError:
+            # security levels are only known since OpenSSL 1.1.0
+            self.server_context.set_ciphers('DEFAULT')
+        self.server_context.load_cert_chain(CERTFILE, KEYFILE)
+        self.client_context = ssl.SSLContext(PROTOCOL_CLIENT)
+        self.client_context.check_hostname = False
+        self.client_context.verify_mode = ssl.CERT_NONE
+        self.received = []
+        self.handshakes = []
+
+    def on_connection(self, server, status):
+        connection = uv.secure.Secure(server.accept(), self.server_context, server_side=True)
+        connection.read_start(on_read=self.on_server_read)
+        server.close()
+
+    def on_server_read(self, connection, status, data):
+        if status == uv.StatusCodes.SUCCESS:
+            connection.write(data)
+        else:
+            connection.shutdown(on_shutdown=lambda request, status: connection.close())
+
+    def on_client_read(self, client, status, data):
+        if status == uv.StatusCodes.SUCCESS:
+            self.received.append(data)
+        else:
+            self.received.append(status)
+            client.close()
+
+    def on_handshake(self, request, status, ssl_error):
+        self.assert_is_none(ssl_error)
+        self.handshakes.append(status)
+
+    def echo(self, server, client, address):
+        def on_connect(request, status):
+            self.assert_equal(status, uv.StatusCodes.SUCCESS)
+            secure = uv.secure.Secure(client, self.client_context)
+            secure.write(b'hello ')
+            secure.handshake(on_handshake=self.on_handshake)
+            secure.write([b'world', bytearray(b'!')], on_write=lambda request, status: None)
+            secure.read_start(on_read=self.on_client_read)
+            secure.shutdown()
+
+        server.bind(address)
+        server.listen(on_connection=self.on_connection)
+        client.connect(address, on_connect=on_connect)
+        self.loop.run()
+
+        self.assert_equal(self.handshakes, [uv.StatusCodes.SUCCESS])
+        self.assert_equal(self.received[-1], uv.StatusCodes.EOF)
+        self.assert_equal(b''.join(self.received[:-1]), b'hello world!')
+
+    def test_secure_tcp(self):
+        self.echo(uv.TCP(), uv.TCP(), (common.TEST_IPV4, common.TEST_PORT1))
+
+    @common.skip_platform('win32')
+    def test_secure_pipe(self):
+        self.echo(uv.Pipe(), uv.Pipe(), common.TEST_PIPE1)
+
+    def test_handshake_error(self):
+        def on_handshake(request, status, ssl_error):
+            self.assert_equal(status, uv.StatusCodes.EPROTO)
+            self.assert_is_instance(ssl_error, ssl.SSLError)
+            request.secure.close()
+            self.handshakes.append(status)
+
+        def on_connect(request, status):
+            client_context = ssl.create_default_context()
+            secure = uv.secure.Secure(client, client_context, server_hostname='localhost')
+            secure.handshake(on_handshake=on_handshake)
+
+        server = uv.TCP()
+        server.bind((common.TEST_IPV4, common.TEST_PORT1))
+        server.listen(on_connection=self.on_connection)
+        client = uv.TCP()
+        client.connect((common.TEST_IPV4, common.TEST_PORT1), on_connect=on_connect)
+        self.loop.run()
+
+        self.assert_equal(self.handshakes, [uv.StatusCodes.EPROTO])
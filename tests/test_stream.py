@@ -15,6 +15,9 @@
 
 from __future__ import print_function, unicode_literals, division, absolute_import
 
+import os
+import tempfile
+
 import common
 
 import uv
@@ -74,3 +77,489 @@ class TestStream(common.TestCase):
         self.pipe = uv.Pipe()
         self.assert_false(self.pipe.readable)
         self.assert_false(self.pipe.writable)
+
+    def test_write_zero_copy(self):
+        self.buffer = b''
+
+        def on_read(connection, status, data):
+            if status == uv.StatusCodes.SUCCESS:
+                self.buffer += data
+            else:
+                connection.close()
+
+        def on_connection(pipe_handle, status):
+            connection = pipe_handle.accept()
+            connection.read_start(on_read=on_read)
+            pipe_handle.close()
+
+        def on_write(request, status):
+            self.assert_equal(status, uv.StatusCodes.SUCCESS)
+            request.stream.close()
+
+        self.server = uv.Pipe()
+        self.server.bind(common.TEST_PIPE1)
+        self.server.listen(on_connection=on_connection)
+
+        self.client = uv.Pipe()
+        self.client.connect(common.TEST_PIPE1)
+        buffers = [b'hello ', bytearray(b'zero '), memoryview(b'xxcopy')[2:]]
+        self.client.write(buffers, on_write=on_write, copy=False)
+
+        self.loop.run()
+
+        self.assert_equal(self.buffer, b'hello zero copy')
+
+    def test_make_uv_buffers_generator(self):
+        for copy in (True, False):
+            uv_buffers = uv.library.make_uv_buffers((item for item in [b'a', b'bc']), copy)
+            self.assert_equal(len(uv_buffers), 2)
+            data = [uv.library.ffi.buffer(*uv.library.uv_buffer_get(uv_buffers + index))[:]
+                    for index in range(2)]
+            self.assert_equal(data, [b'a', b'bc'])
+
+    def test_make_uv_buffers_invalid(self):
+        self.assert_raises(TypeError, uv.library.make_uv_buffers, 42, True)
+        self.assert_raises(TypeError, uv.library.make_uv_buffers, 42, False)
+
+    @common.skip_platform('win32')
+    def test_write_try_write(self):
+        self.buffer = b''
+        self.events = []
+
+        def on_read(connection, status, data):
+            if status == uv.StatusCodes.SUCCESS:
+                self.buffer += data
+            else:
+                connection.close()
+
+        def on_connection(pipe_handle, status):
+            connection = pipe_handle.accept()
+            connection.read_start(on_read=on_read)
+            pipe_handle.close()
+
+        def on_write(request, status):
+            self.assert_is_none(request)
+            self.assert_equal(status, uv.StatusCodes.SUCCESS)
+            self.events.append('written')
+
+        def on_deferred_write(request, status):
+            self.assert_is_none(request)
+            self.events.append('deferred')
+            self.client.close()
+
+        def on_connect(request, status):
+            stream = request.stream
+            stream.set_try_write(deferred=False)
+            self.assert_is_none(stream.write([b'try ', bytearray(b'write ')],
+                                             on_write=on_write))
+            self.assert_equal(self.events, ['written'])
+            stream.set_try_write(deferred=True)
+            self.assert_is_none(stream.write(b'mode', on_write=on_deferred_write))
+            self.assert_equal(self.events, ['written'])
+
+        self.server = uv.Pipe()
+        self.server.bind(common.TEST_PIPE1)
+        self.server.listen(on_connection=on_connection)
+
+        self.client = uv.Pipe()
+        self.client.connect(common.TEST_PIPE1, on_connect=on_connect)
+
+        self.loop.run()
+
+        self.assert_equal(self.buffer, b'try write mode')
+        self.assert_equal(self.events, ['written', 'deferred'])
+
+    @common.skip_platform('win32')
+    def test_write_try_write_only_handle(self):
+        self.events = []
+        read_fd, write_fd = os.pipe()
+
+        def on_write(request, status):
+            self.assert_is_none(request)
+            self.assert_equal(status, uv.StatusCodes.SUCCESS)
+            self.events.append('written')
+            stream.close()
+
+        stream = uv.Pipe()
+        stream.open(write_fd)
+        stream.set_try_write()
+        self.assert_is_none(stream.write(b'hello', on_write=on_write))
+        self.loop.run()
+
+        self.assert_equal(self.events, ['written'])
+        self.assert_equal(os.read(read_fd, 5), b'hello')
+        os.close(read_fd)
+
+    @common.skip_platform('win32')
+    def test_close_flush_error(self):
+        self.events = []
+        read_fd, write_fd = os.pipe()
+
+        def on_write(request, status):
+            self.assert_is_none(request)
+            self.events.append(status)
+
+        stream = uv.Pipe()
+        stream.open(read_fd)
+        stream.cork()
+        stream.write(b'hello', on_write=on_write)
+        stream.close()
+        self.loop.run()
+        os.close(write_fd)
+
+        self.assert_equal(self.events, [uv.StatusCodes.EPIPE])
+
+    def test_cork(self):
+        self.buffer = b''
+        self.requests = []
+
+        def on_read(connection, status, data):
+            if status == uv.StatusCodes.SUCCESS:
+                self.buffer += data
+            else:
+                connection.close()
+
+        def on_connection(pipe_handle, status):
+            connection = pipe_handle.accept()
+            connection.read_start(on_read=on_read)
+            pipe_handle.close()
+
+        def on_write(request, status):
+            self.assert_equal(status, uv.StatusCodes.SUCCESS)
+            self.requests.append(request)
+            if len(self.requests) == 3:
+                request.stream.close()
+
+        self.server = uv.Pipe()
+        self.server.bind(common.TEST_PIPE1)
+        self.server.listen(on_connection=on_connection)
+
+        self.client = uv.Pipe()
+        self.client.connect(common.TEST_PIPE1)
+        self.client.cork()
+        data = bytearray(b'hello ')
+        self.assert_is_none(self.client.write(data, on_write=on_write))
+        data[:] = b'xxxxx '
+        self.client.write([b'corked ', b'world'], on_write=on_write)
+        self.client.write(b'', on_write=on_write)
+        self.assert_true(self.client.corked)
+        self.assert_is_instance(self.client.uncork(), uv.WriteRequest)
+        self.assert_false(self.client.corked)
+
+        self.loop.run()
+
+        self.assert_equal(self.buffer, b'hello corked world')
+        self.assert_equal(len(set(self.requests)), 1)
+
+    def test_cork_auto_flush(self):
+        self.buffer = b''
+        self.requests = []
+
+        def on_read(connection, status, data):
+            if status == uv.StatusCodes.SUCCESS:
+                self.buffer += data
+            else:
+                connection.close()
+
+        def on_connection(pipe_handle, status):
+            connection = pipe_handle.accept()
+            connection.read_start(on_read=on_read)
+            pipe_handle.close()
+
+        def on_write(request, status):
+            self.requests.append(request)
+            if len(self.requests) == 2:
+                request.stream.close()
+
+        def on_connect(request, status):
+            request.stream.write(b'auto ', on_write=on_write)
+            request.stream.write(b'flush', on_write=on_write)
+
+        self.server = uv.Pipe()
+        self.server.bind(common.TEST_PIPE1)
+        self.server.listen(on_connection=on_connection)
+
+        self.client = uv.Pipe()
+        self.client.cork(auto_flush=True)
+        self.client.connect(common.TEST_PIPE1, on_connect=on_connect)
+
+        self.loop.run()
+
+        self.assert_equal(self.buffer, b'auto flush')
+        self.assert_equal(len(set(self.requests)), 1)
+
+    def test_write_watermarks(self):
+        self.events = []
+
+        def on_read(connection, status, data):
+            if status != uv.StatusCodes.SUCCESS:
+                connection.close()
+
+        def on_connection(pipe_handle, status):
+            self.connection = pipe_handle.accept()
+            pipe_handle.close()
+
+        def on_pause_writing(stream):
+            self.events.append('pause')
+            self.connection.read_start(on_read=on_read)
+
+        def on_resume_writing(stream):
+            self.events.append('resume')
+            stream.close()
+
+        def on_connect(request, status):
+            stream = request.stream
+            while not stream.writing_paused:
+                stream.write(b'x' * 2**16)
+            self.assert_greater(stream.write_queue_size, 2**16)
+
+        self.server = uv.Pipe()
+        self.server.bind(common.TEST_PIPE1)
+        self.server.listen(on_connection=on_connection)
+
+        self.client = uv.Pipe()
+        self.client.set_write_watermarks(2**16, on_pause_writing=on_pause_writing,
+                                         on_resume_writing=on_resume_writing)
+        self.assert_equal(self.client.write_low_watermark, 2**14)
+        self.client.connect(common.TEST_PIPE1, on_connect=on_connect)
+
+        self.loop.run()
+
+        self.assert_equal(self.events, ['pause', 'resume'])
+        self.assert_equal(self.client.write_queue_size, 0)
+
+    def test_write_watermarks_close(self):
+        self.events = []
+
+        def on_connection(pipe_handle, status):
+            self.connection = pipe_handle.accept()
+            pipe_handle.close()
+
+        def on_pause_writing(stream):
+            self.events.append('pause')
+            stream.close(on_closed=lambda stream: self.events.append('closed'))
+            self.connection.close()
+
+        def on_resume_writing(stream):
+            self.events.append('resume')
+
+        def on_connect(request, status):
+            stream = request.stream
+            while not stream.writing_paused:
+                stream.write(b'x' * 2**16)
+
+        self.server = uv.Pipe()
+        self.server.bind(common.TEST_PIPE1)
+        self.server.listen(on_connection=on_connection)
+
+        self.client = uv.Pipe()
+        self.client.set_write_watermarks(2**16, on_pause_writing=on_pause_writing,
+                                         on_resume_writing=on_resume_writing)
+        self.client.connect(common.TEST_PIPE1, on_connect=on_connect)
+
+        self.loop.run()
+
+        self.assert_equal(self.events, ['pause', 'closed'])
+        self.assert_false(self.client.writing_paused)
+
+    @common.skip_platform('win32')
+    def test_sendfile(self):
+        self.buffer = b''
+        self.progress = []
+        self.status = None
+        content = os.urandom(2**22 + 42)
+
+        def on_read(connection, status, data):
+            if status == uv.StatusCodes.SUCCESS:
+                self.buffer += data
+            else:
+                connection.close()
+
+        def on_connection(pipe_handle, status):
+            connection = pipe_handle.accept()
+            # delay reading, so the socket buffer runs full
+            timer = uv.Timer(on_timeout=lambda timer: connection.read_start(on_read=on_read))
+            timer.start(20)
+            pipe_handle.close()
+
+        def on_progress(transfer, sent, count):
+            self.progress.append((sent, count))
+
+        def on_sendfile(transfer, status):
+            self.status = status
+            transfer.stream.close()
+
+        self.server = uv.Pipe()
+        self.server.bind(common.TEST_PIPE1)
+        self.server.listen(on_connection=on_connection)
+
+        with tempfile.TemporaryFile() as file:
+            file.write(content)
+            file.flush()
+
+            self.client = uv.Pipe()
+            self.client.connect(common.TEST_PIPE1)
+            self.client.write(b'head')
+            transfer = self.client.sendfile(file, 2, chunk_size=2**20, on_progress=on_progress,
+                                            on_sendfile=on_sendfile)
+            self.client.write(b'tail')
+            self.assert_equal(transfer.count, len(content) - 2)
+
+            self.loop.run()
+
+        self.assert_equal(self.status, uv.StatusCodes.SUCCESS)
+        self.assert_equal(self.progress[-1], (len(content) - 2, len(content) - 2))
+        self.assert_greater_equal(len(self.progress), 5)
+        self.assert_equal(self.buffer, b'head' + content[2:] + b'tail')
+
+    @common.skip_platform('win32')
+    def test_sendfile_deferred(self):
+        self.buffer = b''
+        self.events = []
+        first, second = os.urandom(2**21), os.urandom(2**20)
+
+        def on_read(connection, status, data):
+            if status == uv.StatusCodes.SUCCESS:
+                self.buffer += data
+            else:
+                connection.close()
+
+        def on_connection(pipe_handle, status):
+            connection = pipe_handle.accept()
+            timer = uv.Timer(on_timeout=lambda timer: connection.read_start(on_read=on_read))
+            timer.start(20)
+            pipe_handle.close()
+
+        def on_sendfile(transfer, status):
+            self.assert_equal(status, uv.StatusCodes.SUCCESS)
+            self.events.append(transfer.count)
+
+        def on_shutdown(request, status):
+            self.assert_equal(status, uv.StatusCodes.SUCCESS)
+            self.events.append('shutdown')
+            self.assert_true(request.stream.corked)
+            self.assert_true(request.stream.auto_flush)
+            request.stream.close()
+
+        self.server = uv.Pipe()
+        self.server.bind(common.TEST_PIPE1)
+        self.server.listen(on_connection=on_connection)
+
+        with tempfile.TemporaryFile() as file:
+            file.write(first + second)
+            file.flush()
+
+            self.client = uv.Pipe()
+            self.client.connect(common.TEST_PIPE1)
+            self.client.cork(auto_flush=True)
+            self.client.write(b'head')
+            self.client.sendfile(file, 0, len(first), on_sendfile=on_sendfile)
+            self.client.write(b'middle')
+            self.assert_is_none(self.client.flush())
+            self.client.sendfile(file, len(first), on_sendfile=on_sendfile)
+            self.client.write(b'tail')
+            self.assert_is_none(self.client.shutdown(on_shutdown=on_shutdown))
+
+            self.loop.run()
+
+        self.assert_equal(self.events, [len(first), len(second), 'shutdown'])
+        self.assert_equal(self.buffer, b'head' + first + b'middle' + second + b'tail')
+
+    @common.skip_platform('win32')
+    def test_sendfile_close_sending(self):
+        self.buffer = b''
+        self.events = []
+        content = os.urandom(2**20)
+
+        def on_read(connection, status, data):
+            if status == uv.StatusCodes.SUCCESS:
+                self.buffer += data
+            else:
+                connection.close()
+
+        def on_connection(pipe_handle, status):
+            connection = pipe_handle.accept()
+            timer = uv.Timer(on_timeout=lambda timer: connection.read_start(on_read=on_read))
+            timer.start(20)
+            pipe_handle.close()
+
+        def on_progress(transfer, sent, count):
+            self.events.append(sent)
+
+        def on_sendfile(transfer, status):
+            self.events.append(status)
+
+        def on_closed(stream):
+            self.events.append('closed')
+
+        self.server = uv.Pipe()
+        self.server.bind(common.TEST_PIPE1)
+        self.server.listen(on_connection=on_connection)
+
+        with tempfile.TemporaryFile() as file:
+            file.write(content)
+            file.flush()
+
+            self.client = uv.Pipe()
+            self.client.connect(common.TEST_PIPE1)
+            transfer = self.client.sendfile(file, chunk_size=2**18, on_progress=on_progress,
+                                            on_sendfile=on_sendfile)
+            # the first chunk is being sent, the stream is closed afterwards
+            self.client.close(on_closed=on_closed)
+            self.assert_true(self.client.closing)
+            self.assert_false(transfer.finished)
+
+            self.loop.run()
+
+        self.assert_equal(self.events, [uv.StatusCodes.ECANCELED, 'closed'])
+        self.assert_greater(len(self.buffer), 0)
+        self.assert_less(len(self.buffer), len(content))
+        self.assert_equal(self.buffer, content[:len(self.buffer)])
+
+    @common.skip_platform('win32')
+    def test_sendfile_eagain(self):
+        self.buffer = b''
+        self.status = None
+        content = os.urandom(2**20)
+        sendfile = uv.fs.sendfile
+
+        def sendfile_eagain(out_fd, in_fd, offset, length, callback=None, loop=None):
+            # behave like sendfile on a full non-blocking socket once
+            uv.fs.sendfile = sendfile
+            self.loop.call_later(callback, None, uv.StatusCodes.EAGAIN, 0)
+
+        def on_read(connection, status, data):
+            if status == uv.StatusCodes.SUCCESS:
+                self.buffer += data
+            else:
+                connection.close()
+
+        def on_connection(pipe_handle, status):
+            connection = pipe_handle.accept()
+            connection.read_start(on_read=on_read)
+            pipe_handle.close()
+
+        def on_sendfile(transfer, status):
+            self.status = status
+            self.assert_is_none(transfer.poll)
+            transfer.stream.close()
+
+        self.server = uv.Pipe()
+        self.server.bind(common.TEST_PIPE1)
+        self.server.listen(on_connection=on_connection)
+
+        with tempfile.TemporaryFile() as file:
+            file.write(content)
+            file.flush()
+
+            self.client = uv.Pipe()
+            self.client.connect(common.TEST_PIPE1)
+            uv.fs.sendfile = sendfile_eagain
+            try:
+                self.client.sendfile(file, chunk_size=2**18, on_sendfile=on_sendfile)
+                self.loop.run()
+            finally:
+                uv.fs.sendfile = sendfile
+
+        self.assert_equal(self.status, uv.StatusCodes.SUCCESS)
+        self.assert_equal(self.buffer, content)
@@ -124,3 +124,32 @@ class TestTimer(TestCase):
         self.assert_raises(uv.ClosedHandleError, self.timer.again)
         self.assert_raises(uv.ClosedHandleError, self.timer.start, 10)
         self.assert_is(self.timer.stop(), None)
+
+    def test_timer_wheel(self):
+        self.fired = []
+
+        def on_timeout(entry):
+            self.fired.append((entry.timeout, self.loop.now - self.start))
+            if entry.timeout == 10:
+                wheel.schedule(20, on_timeout)
+
+        wheel = uv.TimerWheel(resolution=5, slots=4)
+        self.start = self.loop.now
+        wheel.schedule(10, on_timeout)
+        wheel.schedule(50, on_timeout)
+        wheel.schedule(20, on_timeout).cancel()
+        reset = wheel.schedule(5, on_timeout)
+        reset.reset(45)
+        self.assert_equal(len(wheel), 3)
+
+        self.loop.run()
+
+        self.assert_equal(len(wheel), 0)
+        self.assert_equal([timeout for timeout, _ in self.fired], [10, 20, 45, 50])
+        self.assert_greater_equal(self.fired[1][1], 30)
+        for timeout, elapsed in self.fired[:1] + self.fired[2:]:
+            self.assert_greater_equal(elapsed, timeout)
+        self.assert_false(reset.active)
+
+        wheel.close()
+        self.assert_raises(uv.ClosedHandleError, wheel.schedule, 10)
@@ -60,6 +60,127 @@ class TestUDP(common.TestCase):
 
         self.assert_equal(self.datagram, b'hello')
 
+    def test_udp_zero_copy(self):
+        self.datagram = None
+
+        def on_receive(udp_handle, status, address, data, flags):
+            self.datagram = data
+            udp_handle.receive_stop()
+
+        self.server = uv.UDP(on_receive=on_receive)
+        self.server.bind((common.TEST_IPV4, common.TEST_PORT1))
+        self.server.receive_start()
+
+        self.client = uv.UDP()
+        buffers = [bytearray(b'hel'), memoryview(b'lo')]
+        self.client.send(buffers, (common.TEST_IPV4, common.TEST_PORT1), copy=False)
+
+        self.loop.run()
+
+        self.assert_equal(self.datagram, b'hello')
+
+    def run_udp_batch(self, flags):
+        self.batches = []
+        self.datagrams = []
+
+        def on_receive_batch(udp_handle, status, datagrams):
+            self.assert_equal(status, uv.StatusCodes.SUCCESS)
+            self.batches.append(len(datagrams))
+            for address, data, flags in datagrams:
+                self.assert_is_instance(data, memoryview)
+                self.assert_false(flags & uv.UDPFlags.PARTIAL)
+                self.datagrams.append((address, bytes(data)))
+            if len(self.datagrams) == 100:
+                udp_handle.receive_stop()
+
+        self.server = uv.UDP(flags)
+        self.server.bind((common.TEST_IPV4, common.TEST_PORT1))
+        self.server.receive_batch_start(on_receive_batch, slots=16)
+
+        client = socket.socket(type=socket.SOCK_DGRAM)
+        client.bind((common.TEST_IPV4, common.TEST_PORT2))
+        for number in range(100):
+            client.sendto(str(number).encode(), (common.TEST_IPV4, common.TEST_PORT1))
+        client.close()
+
+        self.loop.run()
+
+        self.assert_equal(self.datagrams, [((common.TEST_IPV4, common.TEST_PORT2),
+                                            str(number).encode())
+                                           for number in range(100)])
+        self.assert_less(len(self.batches), 100)
+        self.assert_less_equal(max(self.batches), 16)
+        self.assert_is_none(self.server.receive_batch)
+
+    def test_udp_batch(self):
+        self.run_udp_batch(0)
+
+    def test_udp_batch_recvmmsg(self):
+        self.run_udp_batch(uv.UDPFlags.RECVMMSG)
+
+    def test_udp_batch_partial(self):
+        self.datagrams = []
+
+        def on_receive_batch(udp_handle, status, datagrams):
+            self.assert_equal(status, uv.StatusCodes.SUCCESS)
+            for address, data, flags in datagrams:
+                self.datagrams.append((bytes(data), bool(flags & uv.UDPFlags.PARTIAL)))
+            if len(self.datagrams) == 2:
+                udp_handle.receive_stop()
+
+        self.server = uv.UDP()
+        self.server.bind((common.TEST_IPV4, common.TEST_PORT1))
+        self.server.receive_batch_start(on_receive_batch, slot_size=8)
+
+        client = socket.socket(type=socket.SOCK_DGRAM)
+        client.sendto(b'complete', (common.TEST_IPV4, common.TEST_PORT1))
+        client.sendto(b'truncated', (common.TEST_IPV4, common.TEST_PORT1))
+        client.close()
+
+        self.loop.run()
+
+        self.assert_equal(self.datagrams, [(b'complete', False), (b'truncate', True)])
+
+    def test_udp_write_watermarks(self):
+        self.events = []
+
+        def on_pause_writing(udp_handle):
+            self.events.append('pause')
+
+        def on_resume_writing(udp_handle):
+            self.events.append('resume')
+            udp_handle.close()
+
+        self.client = uv.UDP()
+        self.assert_equal(self.client.send_queue_size, 0)
+        self.assert_equal(self.client.send_queue_count, 0)
+        self.client.set_write_watermarks(0, on_pause_writing=on_pause_writing,
+                                         on_resume_writing=on_resume_writing)
+        self.client.writing_paused = True
+        self.client.send(b'hello', (common.TEST_IPV4, common.TEST_PORT1))
+
+        self.loop.run()
+
+        self.assert_equal(self.events, ['resume'])
+
+    def test_udp_write_watermarks_exception(self):
+        self.events = []
+
+        def on_resume_writing(udp_handle):
+            udp_handle.close()
+            raise ValueError('test')
+
+        def on_send(request, status):
+            self.events.append(status)
+
+        self.client = uv.UDP()
+        self.client.set_write_watermarks(0, on_resume_writing=on_resume_writing)
+        self.client.writing_paused = True
+        self.client.send(b'hello', (common.TEST_IPV4, common.TEST_PORT1), on_send=on_send)
+
+        self.assert_raises(ValueError, self.loop.run)
+        self.assert_equal(self.events, [uv.StatusCodes.SUCCESS])
+
     def test_udp_multicast(self):
         self.clients = []
         self.results = []
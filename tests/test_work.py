@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2016, Maximilian Köhl <mail@koehlma.de>
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License version 3 as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along
+# with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import print_function, unicode_literals, division, absolute_import
+
+import hashlib
+import threading
+
+from common import TestCase
+
+import uv
+
+
+class TestWork(TestCase):
+    def test_work(self):
+        data = b'x' * 2**20
+        results = []
+
+        def work(value):
+            results.append(threading.current_thread())
+            return hashlib.sha256(value).hexdigest()
+
+        def on_after_work(work_request, status, result, exception):
+            self.assert_equal(status, uv.StatusCodes.SUCCESS)
+            self.assert_equal(result, hashlib.sha256(data).hexdigest())
+            self.assert_is(exception, None)
+            results.append(threading.current_thread())
+
+        self.loop.enable_metrics()
+        uv.WorkRequest(work, (data, ), on_after_work=on_after_work)
+        self.loop.run()
+
+        self.assert_equal(len(results), 2)
+        self.assert_is_not(results[0], threading.current_thread())
+        self.assert_is(results[1], threading.current_thread())
+        self.assert_equal(self.loop.metrics().work_queued, 0)
+        self.assert_equal(self.loop.metrics().work_running, 0)
+        self.assert_equal(self.loop.metrics().max_work_queued, 1)
+
+    def test_exception(self):
+        def on_after_work(work_request, status, result, exception):
+            self.assert_is(result, None)
+            self.assert_is_instance(exception, ZeroDivisionError)
+            self.on_after_work_called = True
+
+        self.on_after_work_called = False
+        uv.WorkRequest(lambda: 1 / 0, on_after_work=on_after_work)
+        self.loop.run()
+
+        self.assert_true(self.on_after_work_called)
+
+    def test_threadpool_size(self):
+        self.assert_raises(RuntimeError, uv.work.set_threadpool_size, 8)
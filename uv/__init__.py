@@ -18,13 +18,19 @@ This package aims to provide an object oriented CFFI based wrapper around
 the libuv asynchronous IO library. It supports all handles as well as
 filesystem operations, dns utility functions and miscellaneous utilities.
 
-There are no plans to support the thread pool work scheduling and the
-threading and synchronization utilities because Python already provides
-nice solutions for those things in the standard library.
+Functions which release the global interpreter lock, e.g. hashing or
+compression, may be offloaded to libuv's thread pool with work requests.
+There are no plans to support the threading and synchronization utilities
+because Python already provides nice solutions for those things in the
+standard library.
 
 Based on Python's standard library's SSL module this package also provides
 support for asynchronous SSL sockets.
 
+Handles and requests are imported together with the package, add-ons like
+:mod:`uv.http` or :mod:`uv.secure` are imported on first access, e.g. the
+:mod:`ssl` module is therefore only imported when it is used.
+
 As you may have noticed this package is not totally PEP-8 conform when it
 comes to the maximum line length of 79 characters – instead we are using
 a maximum line length of 90 characters. This allows us to use longer and
@@ -34,6 +40,9 @@ overall makes the code more readable.
 
 from __future__ import print_function, unicode_literals, division, absolute_import
 
+import importlib as _importlib
+import sys as _sys
+
 from .metadata import __version__, __author__, __email__, __project__
 
 from .library import version as uv_version
@@ -47,7 +56,11 @@ from . import common, error, loop, handle, request
 
 from .abstract import Handle, Request, Stream
 
-from .handles.async import Async
+
+# handles and requests register their classes on the handle and request type
+# enumerations when their modules are imported, so they are imported eagerly
+# async is a keyword since Python 3.7
+Async = _importlib.import_module('.handles.async', __name__).Async
 from .handles.check import Check
 from .handles.idle import Idle
 from .handles.pipe import PipeConnectRequest, Pipe
@@ -55,16 +68,17 @@ from .handles.poll import PollEvent, Poll
 from .handles.prepare import Prepare
 from .handles.process import CreatePipe, PIPE, ProcessFlags, Process
 from .handles.signal import Signals, Signal
-from .handles.stream import ShutdownRequest, WriteRequest, ConnectRequest, UVStream
+from .handles.stream import (ShutdownRequest, WriteRequest, ConnectRequest, FileTransfer,
+                             UVStream)
 from .handles.tcp import TCPFlags, TCPConnectRequest, TCP
-from .handles.timer import Timer
+from .handles.timer import Timer, TimerWheelEntry, TimerWheel
 from .handles.tty import ConsoleSize, TTYMode, TTY
 from .handles.udp import UDPFlags, UDPMembership, UDPSendRequest, UDP
 
 from .handles.fs_event import FSEvents, FSEventFlags, FSEvent
 from .handles.fs_poll import FSPoll
 
-from .handles import async
+globals()['async'] = _importlib.import_module('.handles.async', __name__)
 from .handles import check
 from .handles import idle
 from .handles import pipe
@@ -80,11 +94,37 @@ from .handles import fs_event
 from .handles import fs_poll
 
 from .dns import (AddressFamilies, SocketTypes, SocketProtocols, Address, Address4,
-                  Address6, AddrInfo, NameInfo, getnameinfo, getaddrinfo)
+                  Address6, AddrInfo, NameInfo, Resolver, getnameinfo, getaddrinfo)
 
 from .fs import Stat
 
+from .work import WorkRequest
+
 from . import dns
 from . import fs
-from . import misc
-from . import secure
+from . import work
+
+
+# add-ons which are imported on first access
+_lazy_modules = ('cluster', 'framing', 'http', 'misc', 'pool', 'secure')
+
+
+def _load(name):
+    if name not in _lazy_modules:
+        raise AttributeError('module %r has no attribute %r' % (__name__, name))
+    value = _importlib.import_module('.' + name, __name__)
+    globals()[name] = value
+    return value
+
+
+if _sys.version_info >= (3, 7):
+    def __getattr__(name):
+        return _load(name)
+
+    def __dir__():
+        return sorted(set(globals()) | set(_lazy_modules))
+else:  # pragma: no cover
+    # modules can not define __getattr__ before Python 3.7
+    for _name in _lazy_modules:
+        _load(_name)
+    del _name
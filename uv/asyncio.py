@@ -0,0 +1,1587 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2016, Maximilian Köhl <mail@koehlma.de>
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License version 3 as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along
+# with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Implementation of an :mod:`asyncio` event loop and event loop policy
+running on top of :class:`uv.Loop`. Install the policy to run existing
+:mod:`asyncio` code on libuv::
+
+    import asyncio
+    import uv.asyncio
+
+    asyncio.set_event_loop_policy(uv.asyncio.Policy())
+
+All methods which are coroutines in the standard library return
+:class:`asyncio.Future` objects, so they can be awaited as usual.
+"""
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import asyncio
+import collections
+import concurrent.futures
+import errno
+import heapq
+import logging
+import math
+import os
+import socket
+import subprocess
+import sys
+import threading
+import weakref
+
+from . import dns, error
+from .handles.idle import Idle
+from .handles.pipe import Pipe
+from .handles.poll import Poll, PollEvent
+from .handles.process import CreatePipe, Process
+from .handles.signal import Signal
+from .handles.tcp import TCP
+from .handles.timer import Timer
+from .handles.udp import UDP
+from .library import lib
+from .loop import Loop
+
+try:
+    import ssl
+except ImportError:  # pragma: no cover
+    ssl = None
+
+
+__all__ = ['EventLoop', 'EventLoopPolicy', 'Policy', 'StreamTransport', 'DatagramTransport',
+           'SubprocessTransport', 'Server', 'ServerSocket']
+
+logger = logging.getLogger(__name__)
+
+_context_supported = sys.version_info >= (3, 7)
+
+_get_running_loop = getattr(asyncio.events, '_get_running_loop', lambda: None)
+_set_running_loop = getattr(asyncio.events, '_set_running_loop', lambda loop: None)
+
+
+def _set_result_unless_cancelled(future, result):
+    if not future.cancelled():
+        future.set_result(result)
+
+
+def _chain_future(event_loop, future):
+    """
+    Wrap a :class:`concurrent.futures.Future` into a future of the
+    given event loop.
+    """
+    result = event_loop.create_future()
+
+    def on_done(_):
+        if result.cancelled():
+            return
+        if future.cancelled():
+            result.cancel()
+        elif future.exception() is not None:
+            result.set_exception(future.exception())
+        else:
+            result.set_result(future.result())
+
+    def on_threadsafe_done(_):
+        event_loop.call_soon_threadsafe(on_done, None)
+
+    future.add_done_callback(on_threadsafe_done)
+    return result
+
+
+def _gather(event_loop, futures):
+    """
+    Return a future which is done after all given futures are done.
+    Exceptions are not propagated.
+    """
+    result = event_loop.create_future()
+    remaining = [len(futures)]
+
+    def on_done(_):
+        remaining[0] -= 1
+        if remaining[0] == 0:
+            _set_result_unless_cancelled(result, None)
+
+    if not futures:
+        result.set_result(None)
+    for future in futures:
+        future.add_done_callback(on_done)
+    return result
+
+
+def _feed_data(protocol, data):
+    if isinstance(protocol, getattr(asyncio, 'BufferedProtocol', ())):
+        asyncio.protocols._feed_data_to_buffered_proto(protocol, data)
+    else:
+        protocol.data_received(data)
+
+
+def _make_ssl_context(ssl_argument, server_side):
+    if ssl is None:  # pragma: no cover
+        raise RuntimeError('ssl module is not available')
+    if isinstance(ssl_argument, ssl.SSLContext):
+        return ssl_argument
+    if server_side:
+        raise ValueError('server side ssl needs a valid ssl context')
+    return ssl.create_default_context()
+
+
+class StreamTransport(asyncio.Transport):
+    """
+    Transport on top of a TCP or Pipe stream handle.
+
+    :param event_loop:
+        asyncio event loop the transport belongs to
+    :param stream:
+        connected stream handle
+    :param protocol:
+        protocol the transport is connected to
+    :param waiter:
+        future which is resolved after the protocol has been connected
+    :param extra:
+        extra information provided by :func:`get_extra_info`
+    :param server:
+        server the connection has been accepted on
+
+    :type event_loop:
+        uv.asyncio.EventLoop
+    :type stream:
+        uv.UVStream
+    :type protocol:
+        asyncio.Protocol
+    :type waiter:
+        asyncio.Future | None
+    :type extra:
+        dict | None
+    :type server:
+        uv.asyncio.Server | None
+    """
+
+    default_high_watermark = 2**16
+
+    def __init__(self, event_loop, stream, protocol, waiter=None, extra=None, server=None):
+        super(StreamTransport, self).__init__(extra)
+        self.event_loop = event_loop
+        self.stream = stream
+        self.protocol = protocol
+        self.server = server
+        self.closing = False
+        self.eof = False
+        self.reading = False
+        self.connection_lost = False
+        self.pending_writes = 0
+        for key in ('peername', 'sockname'):
+            try:
+                self._extra.setdefault(key, getattr(stream, key))
+            except (error.UVError, AttributeError):
+                pass
+        self.stream.set_write_watermarks(self.default_high_watermark,
+                                         on_pause_writing=self._on_pause_writing,
+                                         on_resume_writing=self._on_resume_writing)
+        if self.server is not None:
+            self.server.attach(self)
+        self.event_loop.call_soon(self.protocol.connection_made, self)
+        if self.stream.readable:
+            self.event_loop.call_soon(self.resume_reading)
+        if waiter is not None:
+            self.event_loop.call_soon(_set_result_unless_cancelled, waiter, None)
+
+    def __repr__(self):
+        return '<{} stream={!r}>'.format(type(self).__name__, self.stream)
+
+    def get_protocol(self):
+        return self.protocol
+
+    def set_protocol(self, protocol):
+        self.protocol = protocol
+
+    def is_closing(self):
+        return self.closing
+
+    def is_reading(self):
+        return self.reading
+
+    def pause_reading(self):
+        if self.closing or not self.reading:
+            return
+        self.reading = False
+        self.stream.read_stop()
+
+    def resume_reading(self):
+        if self.closing or self.reading:
+            return
+        self.reading = True
+        self.stream.read_start(on_read=self._on_read)
+
+    def get_write_buffer_size(self):
+        return 0 if self.stream.closing else self.stream.write_queue_size
+
+    def get_write_buffer_limits(self):
+        return self.stream.write_low_watermark, self.stream.write_high_watermark
+
+    def set_write_buffer_limits(self, high=None, low=None):
+        if high is None:
+            high = self.default_high_watermark if low is None else 4 * low
+        self.stream.set_write_watermarks(high, low)
+
+    def write(self, data):
+        if not isinstance(data, (bytes, bytearray, memoryview)):
+            raise TypeError('data argument must be a bytes-like object, '
+                            'not {!r}'.format(type(data).__name__))
+        if self.eof:
+            raise RuntimeError('cannot call write() after write_eof()')
+        if not data or self.closing:
+            return
+        self.pending_writes += 1
+        # bytes are immutable, so there is no need to copy them
+        copy = not isinstance(data, bytes)
+        try:
+            self.stream.write(data, on_write=self._on_write, copy=copy)
+        except error.UVError as exception:
+            self.pending_writes -= 1
+            self._fatal_error(exception, 'fatal write error on stream transport')
+
+    def writelines(self, list_of_data):
+        for data in list_of_data:
+            self.write(data)
+
+    def can_write_eof(self):
+        return True
+
+    def write_eof(self):
+        if self.closing or self.eof:
+            return
+        self.eof = True
+        try:
+            self.stream.shutdown()
+        except error.UVError as exception:
+            self._fatal_error(exception, 'fatal error on shutdown')
+
+    def close(self):
+        if self.closing:
+            return
+        self.closing = True
+        self._stop_reading()
+        if not self.pending_writes:
+            self._force_close(None)
+
+    def abort(self):
+        self._force_close(None)
+
+    def _stop_reading(self):
+        if self.reading:
+            self.reading = False
+            self.stream.read_stop()
+
+    def _force_close(self, exception):
+        self.closing = True
+        self._stop_reading()
+        if not self.stream.closing:
+            self.stream.close()
+        if not self.connection_lost:
+            self.connection_lost = True
+            self.event_loop.call_soon(self._call_connection_lost, exception)
+
+    def _call_connection_lost(self, exception):
+        try:
+            self.protocol.connection_lost(exception)
+        finally:
+            if self.server is not None:
+                self.server.detach(self)
+                self.server = None
+
+    def _fatal_error(self, exception, message):
+        if not isinstance(exception, (BrokenPipeError, ConnectionResetError,
+                                      ConnectionAbortedError)):
+            self.event_loop.call_exception_handler({
+                'message': message,
+                'exception': exception,
+                'transport': self,
+                'protocol': self.protocol,
+            })
+        self._force_close(exception)
+
+    def _on_read(self, stream, status, data):
+        if status == error.StatusCodes.EOF:
+            self._stop_reading()
+            try:
+                keep_open = self.protocol.eof_received()
+            except Exception as exception:
+                self._fatal_error(exception, 'fatal error: protocol.eof_received() call failed')
+                return
+            if not keep_open:
+                self.close()
+        elif status != error.StatusCodes.SUCCESS:
+            self._fatal_error(error.UVError(status), 'fatal read error on stream transport')
+        elif data:
+            try:
+                _feed_data(self.protocol, data)
+            except Exception as exception:
+                self._fatal_error(exception, 'fatal error: protocol.data_received() call failed')
+
+    def _on_write(self, write_request, status):
+        self.pending_writes -= 1
+        if status == error.StatusCodes.ECANCELED:
+            return
+        if status != error.StatusCodes.SUCCESS:
+            self._fatal_error(error.UVError(status), 'fatal write error on stream transport')
+        elif self.closing and not self.pending_writes:
+            self._force_close(None)
+
+    def _on_pause_writing(self, stream):
+        try:
+            self.protocol.pause_writing()
+        except Exception as exception:
+            self.event_loop.call_exception_handler({
+                'message': 'protocol.pause_writing() failed',
+                'exception': exception,
+                'transport': self,
+                'protocol': self.protocol,
+            })
+
+    def _on_resume_writing(self, stream):
+        try:
+            self.protocol.resume_writing()
+        except Exception as exception:
+            self.event_loop.call_exception_handler({
+                'message': 'protocol.resume_writing() failed',
+                'exception': exception,
+                'transport': self,
+                'protocol': self.protocol,
+            })
+
+
+class DatagramTransport(asyncio.DatagramTransport):
+    """
+    Transport on top of an UDP handle.
+
+    :param event_loop:
+        asyncio event loop the transport belongs to
+    :param udp:
+        bound UDP handle
+    :param protocol:
+        protocol the transport is connected to
+    :param address:
+        default remote address
+    :param waiter:
+        future which is resolved after the protocol has been connected
+
+    :type event_loop:
+        uv.asyncio.EventLoop
+    :type udp:
+        uv.UDP
+    :type protocol:
+        asyncio.DatagramProtocol
+    :type address:
+        tuple | None
+    :type waiter:
+        asyncio.Future | None
+    """
+
+    def __init__(self, event_loop, udp, protocol, address=None, waiter=None):
+        super(DatagramTransport, self).__init__({'peername': address})
+        self.event_loop = event_loop
+        self.udp = udp
+        self.protocol = protocol
+        self.address = address
+        self.closing = False
+        self.pending_sends = 0
+        try:
+            self._extra['sockname'] = udp.sockname
+        except error.UVError:
+            pass
+        self.event_loop.call_soon(self.protocol.connection_made, self)
+        self.event_loop.call_soon(self.udp.receive_start, self._on_receive)
+        if waiter is not None:
+            self.event_loop.call_soon(_set_result_unless_cancelled, waiter, None)
+
+    def get_protocol(self):
+        return self.protocol
+
+    def set_protocol(self, protocol):
+        self.protocol = protocol
+
+    def is_closing(self):
+        return self.closing
+
+    def get_write_buffer_size(self):
+        return 0 if self.udp.closing else self.udp.send_queue_size
+
+    def sendto(self, data, addr=None):
+        if not isinstance(data, (bytes, bytearray, memoryview)):
+            raise TypeError('data argument must be a bytes-like object, '
+                            'not {!r}'.format(type(data).__name__))
+        if self.closing:
+            return
+        address = addr or self.address
+        if address is None:
+            raise ValueError('no address specified')
+        if self.address is not None and addr not in (None, self.address):
+            raise ValueError('invalid address: must be None or {}'.format(self.address))
+        self.pending_sends += 1
+        try:
+            self.udp.send(data, address, on_send=self._on_send,
+                          copy=not isinstance(data, bytes))
+        except error.UVError as exception:
+            self.pending_sends -= 1
+            self.event_loop.call_soon(self.protocol.error_received, exception)
+
+    def close(self):
+        if self.closing:
+            return
+        self.closing = True
+        self.udp.receive_stop()
+        if not self.pending_sends:
+            self._force_close(None)
+
+    def abort(self):
+        self.closing = True
+        self._force_close(None)
+
+    def _force_close(self, exception):
+        if not self.udp.closing:
+            self.udp.close()
+            self.event_loop.call_soon(self.protocol.connection_lost, exception)
+
+    def _on_send(self, send_request, status):
+        self.pending_sends -= 1
+        if status not in (error.StatusCodes.SUCCESS, error.StatusCodes.ECANCELED):
+            self.protocol.error_received(error.UVError(status))
+        if self.closing and not self.pending_sends:
+            self._force_close(None)
+
+    def _on_receive(self, udp, status, address, data, flags):
+        if status != error.StatusCodes.SUCCESS:
+            self.protocol.error_received(error.UVError(status))
+        elif address is not None:
+            self.protocol.datagram_received(bytes(data), address)
+
+
+class _SubprocessPipeProtocol(asyncio.Protocol):
+    """
+    Forwards events of a subprocess pipe transport to the subprocess
+    transport it belongs to.
+    """
+
+    def __init__(self, transport, fd):
+        self.transport = transport
+        self.fd = fd
+        self.disconnected = False
+
+    def connection_made(self, transport):
+        pass
+
+    def data_received(self, data):
+        self.transport.protocol.pipe_data_received(self.fd, data)
+
+    def eof_received(self):
+        return False
+
+    def connection_lost(self, exception):
+        self.disconnected = True
+        self.transport.protocol.pipe_connection_lost(self.fd, exception)
+        self.transport.try_finish()
+
+    def pause_writing(self):
+        self.transport.protocol.pause_writing()
+
+    def resume_writing(self):
+        self.transport.protocol.resume_writing()
+
+
+class SubprocessTransport(asyncio.SubprocessTransport):
+    """
+    Transport on top of a process handle.
+
+    :param event_loop:
+        asyncio event loop the transport belongs to
+    :param protocol:
+        protocol the transport is connected to
+    :param arguments:
+        program and its arguments
+    :param stdin:
+        standard input (`subprocess.PIPE`, `subprocess.DEVNULL`, file
+        descriptor, file-like object or `None`)
+    :param stdout:
+        standard output (see `stdin`)
+    :param stderr:
+        standard error (see `stdin`)
+    :param waiter:
+        future which is resolved after the protocol has been connected
+    :param keywords:
+        passed to :class:`uv.Process`
+
+    :type event_loop:
+        uv.asyncio.EventLoop
+    :type protocol:
+        asyncio.SubprocessProtocol
+    :type arguments:
+        list[unicode]
+    :type waiter:
+        asyncio.Future | None
+    """
+
+    def __init__(self, event_loop, protocol, arguments, stdin, stdout, stderr,
+                 waiter=None, **keywords):
+        super(SubprocessTransport, self).__init__()
+        self.event_loop = event_loop
+        self.protocol = protocol
+        self.closing = False
+        self.finished = False
+        self.returncode = None
+        self.exit_waiters = []
+        self.pipes = {}
+        devnull = None
+        stdio = []
+        for fd, target in enumerate((stdin, stdout, stderr)):
+            if target == subprocess.PIPE:
+                target = CreatePipe(readable=fd == 0, writable=fd != 0)
+            elif target == subprocess.DEVNULL:
+                if devnull is None:
+                    devnull = os.open(os.devnull, os.O_RDWR)
+                target = devnull
+            elif target == subprocess.STDOUT:
+                raise ValueError('redirecting stderr to stdout is not supported')
+            stdio.append(target)
+        # pipes created by the process handle are bound to the current loop
+        event_loop.loop.make_current()
+        try:
+            self.process = Process(arguments, stdin=stdio[0], stdout=stdio[1],
+                                   stderr=stdio[2], loop=event_loop.loop,
+                                   on_exit=self._on_exit, **keywords)
+        finally:
+            if devnull is not None:
+                os.close(devnull)
+        self.pid = self.process.pid
+        for fd, stream in enumerate((self.process.stdin, self.process.stdout,
+                                     self.process.stderr)):
+            if isinstance(stream, Pipe):
+                pipe_protocol = _SubprocessPipeProtocol(self, fd)
+                self.pipes[fd] = StreamTransport(event_loop, stream, pipe_protocol)
+        self.event_loop.call_soon(self.protocol.connection_made, self)
+        if waiter is not None:
+            self.event_loop.call_soon(_set_result_unless_cancelled, waiter, None)
+
+    def __repr__(self):
+        return '<{} pid={} returncode={}>'.format(type(self).__name__, self.pid,
+                                                  self.returncode)
+
+    def get_protocol(self):
+        return self.protocol
+
+    def set_protocol(self, protocol):
+        self.protocol = protocol
+
+    def is_closing(self):
+        return self.closing
+
+    def get_pid(self):
+        return self.pid
+
+    def get_returncode(self):
+        return self.returncode
+
+    def get_pipe_transport(self, fd):
+        return self.pipes.get(fd)
+
+    def send_signal(self, signal):
+        if self.returncode is not None:
+            raise ProcessLookupError()
+        self.process.kill(signal)
+
+    def terminate(self):
+        self.send_signal(15)
+
+    def kill(self):
+        self.send_signal(9)
+
+    def close(self):
+        if self.closing:
+            return
+        self.closing = True
+        for pipe in self.pipes.values():
+            pipe.close()
+        if self.returncode is None:
+            try:
+                self.kill()
+            except (ProcessLookupError, error.UVError):
+                pass
+
+    def _wait(self):
+        """
+        Wait until the process exited, used by :mod:`asyncio.subprocess`.
+        """
+        waiter = self.event_loop.create_future()
+        if self.returncode is not None:
+            waiter.set_result(self.returncode)
+        else:
+            self.exit_waiters.append(waiter)
+        return waiter
+
+    def _on_exit(self, process, returncode, signum):
+        self.returncode = -signum if signum else returncode
+        process.close()
+        self.protocol.process_exited()
+        for waiter in self.exit_waiters:
+            _set_result_unless_cancelled(waiter, self.returncode)
+        self.exit_waiters = []
+        self.try_finish()
+
+    def try_finish(self):
+        """
+        Disconnect the protocol after the process exited and all pipes
+        have been closed.
+
+        .. warning::
+            This method is only for internal purposes and is not part
+            of the official API. You should never call it directly!
+        """
+        if self.finished or self.returncode is None:
+            return
+        if all(pipe.protocol.disconnected for pipe in self.pipes.values()):
+            self.finished = True
+            self.event_loop.call_soon(self.protocol.connection_lost, None)
+
+
+class ServerSocket(object):
+    """
+    Socket-like view on a listening stream handle of a server.
+
+    :param stream:
+        listening stream handle
+
+    :type stream:
+        uv.TCP | uv.Pipe
+    """
+
+    __slots__ = ['stream']
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def __repr__(self):
+        return '<ServerSocket sockname={!r}>'.format(self.getsockname())
+
+    @property
+    def family(self):
+        return self.stream.family
+
+    def fileno(self):
+        return self.stream.fileno()
+
+    def getsockname(self):
+        return self.stream.sockname
+
+
+class Server(asyncio.AbstractServer):
+    """
+    Server listening on one or more stream handles.
+
+    :param event_loop:
+        asyncio event loop the server belongs to
+    :param listeners:
+        listening stream handles
+    :param protocol_factory:
+        factory creating a protocol for each connection
+    :param ssl_context:
+        ssl context for new connections
+
+    :type event_loop:
+        uv.asyncio.EventLoop
+    :type listeners:
+        list[uv.TCP | uv.Pipe]
+    :type protocol_factory:
+        () -> asyncio.Protocol
+    :type ssl_context:
+        ssl.SSLContext | None
+    """
+
+    def __init__(self, event_loop, listeners, protocol_factory, ssl_context=None,
+                 backlog=100):
+        self.event_loop = event_loop
+        self.listeners = listeners
+        self.protocol_factory = protocol_factory
+        self.ssl_context = ssl_context
+        self.backlog = backlog
+        self.serving = False
+        self.transports = weakref.WeakSet()
+        self.active_count = 0
+        self.waiters = []
+
+    def __repr__(self):
+        return '<{} sockets={!r}>'.format(type(self).__name__, self.sockets)
+
+    @property
+    def sockets(self):
+        return [ServerSocket(listener) for listener in self.listeners]
+
+    def get_loop(self):
+        return self.event_loop
+
+    def is_serving(self):
+        return self.serving
+
+    def start_serving(self):
+        if not self.serving and self.listeners:
+            self.serving = True
+            for listener in self.listeners:
+                listener.listen(self.backlog, on_connection=self._on_connection)
+        return _gather(self.event_loop, [])
+
+    def serve_forever(self):
+        self.start_serving()
+        waiter = self.event_loop.create_future()
+        self.waiters.append(waiter)
+        return waiter
+
+    def close(self):
+        listeners, self.listeners = self.listeners, []
+        self.serving = False
+        for listener in listeners:
+            listener.close()
+        if not self.active_count:
+            self._wakeup()
+
+    def wait_closed(self):
+        waiter = self.event_loop.create_future()
+        if not self.listeners and not self.active_count:
+            waiter.set_result(None)
+        else:
+            self.waiters.append(waiter)
+        return waiter
+
+    def attach(self, transport):
+        """
+        .. warning::
+            This method is only for internal purposes and is not part
+            of the official API. You should never call it directly!
+        """
+        self.active_count += 1
+        self.transports.add(transport)
+
+    def detach(self, transport):
+        """
+        .. warning::
+            This method is only for internal purposes and is not part
+            of the official API. You should never call it directly!
+        """
+        self.active_count -= 1
+        if not self.active_count and not self.listeners:
+            self._wakeup()
+
+    def _wakeup(self):
+        waiters, self.waiters = self.waiters, []
+        for waiter in waiters:
+            _set_result_unless_cancelled(waiter, None)
+
+    def _on_connection(self, listener, status):
+        if status != error.StatusCodes.SUCCESS:
+            self.event_loop.call_exception_handler({
+                'message': 'error while accepting a connection',
+                'exception': error.UVError(status),
+            })
+            return
+        try:
+            connection = listener.accept(loop=self.event_loop.loop)
+        except error.UVError as exception:
+            self.event_loop.call_exception_handler({
+                'message': 'error while accepting a connection',
+                'exception': exception,
+            })
+            return
+        protocol = self.protocol_factory()
+        if self.ssl_context is not None:
+            self.event_loop.make_ssl_transport(connection, protocol, self.ssl_context,
+                                               server_side=True, server=self)
+        else:
+            StreamTransport(self.event_loop, connection, protocol, server=self)
+
+
+class EventLoop(asyncio.AbstractEventLoop):
+    """
+    An :mod:`asyncio` event loop running on top of a :class:`uv.Loop`.
+    Callbacks are executed in an idle handle once per iteration, timers
+    are multiplexed onto a single timer handle.
+
+    :param loop:
+        underlying libuv event loop, a new one is created by default
+
+    :type loop:
+        uv.Loop | None
+    """
+
+    clock_resolution = 1e-3
+
+    def __init__(self, loop=None):
+        self.loop = loop or Loop()
+        """
+        Underlying libuv event loop.
+
+        :readonly:
+            True
+        :type:
+            uv.Loop
+        """
+        self.loop.excepthook = self._excepthook
+        self.ready = collections.deque()
+        self.scheduled = []
+        self.idle = Idle(loop=self.loop, on_idle=self._on_idle)
+        self.timer = Timer(loop=self.loop, on_timeout=self._on_timeout)
+        self.timer.dereference()
+        self.stopping = False
+        self.closed = False
+        self.thread_id = None
+        self.debug = False
+        self.exception_handler = None
+        self.task_factory = None
+        self.executor = None
+        self.signal_handlers = {}
+        self.pollers = {}
+        self.asyncgens = weakref.WeakSet()
+        self.asyncgens_shutdown_called = False
+
+    def __repr__(self):
+        return '<{} running={} closed={} debug={}>'.format(
+            type(self).__name__, self.is_running(), self.closed, self.debug)
+
+    def _check_closed(self):
+        if self.closed:
+            raise RuntimeError('Event loop is closed')
+
+    def _excepthook(self, loop, exc_type, exc_value, exc_traceback):
+        self.call_exception_handler({
+            'message': 'unhandled exception in libuv callback',
+            'exception': exc_value,
+        })
+
+    def _on_idle(self, idle):
+        for _ in range(len(self.ready)):
+            handle = self.ready.popleft()
+            if not handle._cancelled:
+                handle._run()
+        if not self.ready:
+            self.idle.stop()
+        if self.stopping:
+            self.loop.stop()
+
+    def _on_timeout(self, timer):
+        end_time = self.time() + self.clock_resolution
+        while self.scheduled and self.scheduled[0]._when <= end_time:
+            handle = heapq.heappop(self.scheduled)
+            handle._scheduled = False
+            if not handle._cancelled:
+                self._add_ready(handle)
+        self._arm_timer()
+
+    def _arm_timer(self):
+        while self.scheduled and self.scheduled[0]._cancelled:
+            heapq.heappop(self.scheduled)._scheduled = False
+        if not self.scheduled:
+            self.timer.stop()
+            return
+        self.loop.update_time()
+        delay = max(0, self.scheduled[0]._when - self.time())
+        self.timer.start(int(math.ceil(delay * 1000)))
+
+    def _add_ready(self, handle):
+        if not self.ready:
+            self.idle.start()
+        self.ready.append(handle)
+
+    def _timer_handle_cancelled(self, handle):
+        if self.scheduled and self.scheduled[0] is handle:
+            self._arm_timer()
+
+    # running and stopping the event loop
+
+    def run_forever(self):
+        self._check_closed()
+        if self.is_running():
+            raise RuntimeError('This event loop is already running')
+        if _get_running_loop() is not None:
+            raise RuntimeError('Cannot run the event loop while another loop is running')
+        self.thread_id = threading.current_thread().ident
+        old_agen_hooks = None
+        if hasattr(sys, 'get_asyncgen_hooks'):
+            old_agen_hooks = sys.get_asyncgen_hooks()
+            sys.set_asyncgen_hooks(firstiter=self._asyncgen_firstiter_hook,
+                                   finalizer=self._asyncgen_finalizer_hook)
+        _set_running_loop(self)
+        self.loop.base_loop.reference_internal_async()
+        try:
+            if self.stopping:
+                self.idle.start()
+            self.loop.run()
+        finally:
+            self.loop.base_loop.dereference_internal_async()
+            self.stopping = False
+            self.thread_id = None
+            _set_running_loop(None)
+            if old_agen_hooks is not None:
+                sys.set_asyncgen_hooks(*old_agen_hooks)
+
+    def run_until_complete(self, future):
+        self._check_closed()
+        new_task = not asyncio.isfuture(future)
+        future = asyncio.ensure_future(future, loop=self)
+        if new_task:
+            future._log_destroy_pending = False
+
+        def on_done(_):
+            self.stop()
+
+        future.add_done_callback(on_done)
+        try:
+            self.run_forever()
+        except BaseException:
+            if new_task and future.done() and not future.cancelled():
+                future.exception()
+            raise
+        finally:
+            future.remove_done_callback(on_done)
+        if not future.done():
+            raise RuntimeError('Event loop stopped before Future completed.')
+        return future.result()
+
+    def stop(self):
+        self.stopping = True
+        if self.is_running():
+            self.idle.start()
+
+    def is_running(self):
+        return self.thread_id is not None
+
+    def is_closed(self):
+        return self.closed
+
+    def close(self):
+        if self.is_running():
+            raise RuntimeError('Cannot close a running event loop')
+        if self.closed:
+            return
+        self.closed = True
+        self.ready.clear()
+        self.scheduled = []
+        for signum in list(self.signal_handlers):
+            self.remove_signal_handler(signum)
+        executor, self.executor = self.executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+        self.loop.close_all_handles()
+        self.loop.run()
+        self.loop.close()
+
+    def shutdown_asyncgens(self):
+        self.asyncgens_shutdown_called = True
+        closing = list(self.asyncgens)
+        self.asyncgens.clear()
+        return _gather(self, [self.create_task(agen.aclose()) for agen in closing])
+
+    def shutdown_default_executor(self, timeout=None):
+        waiter = self.create_future()
+        executor, self.executor = self.executor, None
+        if executor is None:
+            waiter.set_result(None)
+            return waiter
+
+        def shutdown():
+            try:
+                executor.shutdown(wait=True)
+            finally:
+                self.call_soon_threadsafe(_set_result_unless_cancelled, waiter, None)
+
+        threading.Thread(target=shutdown).start()
+        return waiter
+
+    def _asyncgen_firstiter_hook(self, agen):
+        self.asyncgens.add(agen)
+
+    def _asyncgen_finalizer_hook(self, agen):
+        self.asyncgens.discard(agen)
+        if not self.closed:
+            self.call_soon_threadsafe(self.create_task, agen.aclose())
+
+    # scheduling callbacks
+
+    def _make_handle(self, callback, arguments, keywords):
+        if _context_supported:
+            return asyncio.Handle(callback, arguments, self, **keywords)
+        return asyncio.Handle(callback, arguments, self)
+
+    def call_soon(self, callback, *arguments, **keywords):
+        self._check_closed()
+        handle = self._make_handle(callback, arguments, keywords)
+        self._add_ready(handle)
+        return handle
+
+    def call_soon_threadsafe(self, callback, *arguments, **keywords):
+        self._check_closed()
+        handle = self._make_handle(callback, arguments, keywords)
+        self.loop.call_later(self._add_ready, handle)
+        return handle
+
+    def call_later(self, delay, callback, *arguments, **keywords):
+        return self.call_at(self.time() + delay, callback, *arguments, **keywords)
+
+    def call_at(self, when, callback, *arguments, **keywords):
+        self._check_closed()
+        if _context_supported:
+            handle = asyncio.TimerHandle(when, callback, arguments, self, **keywords)
+        else:
+            handle = asyncio.TimerHandle(when, callback, arguments, self)
+        heapq.heappush(self.scheduled, handle)
+        handle._scheduled = True
+        if self.scheduled[0] is handle:
+            self._arm_timer()
+        return handle
+
+    def time(self):
+        return lib.uv_hrtime() / 1e9
+
+    # futures and tasks
+
+    def create_future(self):
+        return asyncio.Future(loop=self)
+
+    def create_task(self, coro, **keywords):
+        self._check_closed()
+        if self.task_factory is not None:
+            return self.task_factory(self, coro, **keywords)
+        return asyncio.Task(coro, loop=self, **keywords)
+
+    def set_task_factory(self, factory):
+        self.task_factory = factory
+
+    def get_task_factory(self):
+        return self.task_factory
+
+    # executor
+
+    def run_in_executor(self, executor, func, *arguments):
+        self._check_closed()
+        if executor is None:
+            if self.executor is None:
+                self.executor = concurrent.futures.ThreadPoolExecutor()
+            executor = self.executor
+        return _chain_future(self, executor.submit(func, *arguments))
+
+    def set_default_executor(self, executor):
+        self.executor = executor
+
+    # name resolution
+
+    def getaddrinfo(self, host, port, family=0, type=0, proto=0, flags=0):
+        future = self.create_future()
+        if isinstance(host, bytes):
+            host = host.decode('idna')
+        if isinstance(port, bytes):
+            port = port.decode()
+        if host is None:
+            # libuv requires a host name, passive and loopback lookups are
+            # cheap enough to be performed synchronously
+            future.set_result(socket.getaddrinfo(host, port, family, type, proto, flags))
+            return future
+
+        def callback(request, status, addrinfo):
+            if future.cancelled():
+                return
+            if status != error.StatusCodes.SUCCESS:
+                future.set_exception(error.UVError(status))
+            else:
+                future.set_result(addrinfo)
+
+        dns.getaddrinfo(host, 0 if port is None else port, family, type, proto, flags,
+                        callback=callback, loop=self.loop)
+        return future
+
+    def getnameinfo(self, sockaddr, flags=0):
+        future = self.create_future()
+
+        def callback(request, status, hostname, service):
+            if future.cancelled():
+                return
+            if status != error.StatusCodes.SUCCESS:
+                future.set_exception(error.UVError(status))
+            else:
+                future.set_result((hostname, service))
+
+        dns.getnameinfo(sockaddr[0], sockaddr[1], flags, callback=callback, loop=self.loop)
+        return future
+
+    def _resolve(self, host, port, family, flags, on_resolved, future):
+        """
+        Resolve the address and call `on_resolved` with the resulting
+        address information list unless resolving failed.
+        """
+        def on_done(resolved):
+            if future.cancelled():
+                return
+            if resolved.exception() is not None:
+                future.set_exception(resolved.exception())
+                return
+            addrinfo = resolved.result()
+            if not addrinfo:
+                future.set_exception(OSError('getaddrinfo() returned empty list'))
+                return
+            try:
+                on_resolved(addrinfo)
+            except Exception as exception:
+                if not future.done():
+                    future.set_exception(exception)
+
+        resolved = self.getaddrinfo(host, port, family, socket.SOCK_STREAM, 0, flags)
+        resolved.add_done_callback(on_done)
+
+    # streams
+
+    def make_ssl_transport(self, stream, protocol, ssl_context, waiter=None,
+                           server_side=False, server_hostname=None, server=None):
+        """
+        Create a transport wrapping the given stream using TLS.
+
+        .. warning::
+            This method is only for internal purposes and is not part
+            of the official API. You should never call it directly!
+        """
+        ssl_protocol = asyncio.sslproto.SSLProtocol(self, protocol, ssl_context, waiter,
+                                                    server_side, server_hostname)
+        StreamTransport(self, stream, ssl_protocol, server=server)
+        return ssl_protocol._app_transport
+
+    def _connect_stream(self, stream, connect, protocol_factory, ssl_argument,
+                        server_hostname, future):
+        def on_connect(request, status):
+            if future.cancelled():
+                stream.close()
+                return
+            if status != error.StatusCodes.SUCCESS:
+                stream.close()
+                future.set_exception(error.UVError(status))
+                return
+            protocol = protocol_factory()
+            waiter = self.create_future()
+            if ssl_argument:
+                ssl_context = _make_ssl_context(ssl_argument, False)
+                transport = self.make_ssl_transport(stream, protocol, ssl_context, waiter,
+                                                    server_hostname=server_hostname)
+            else:
+                transport = StreamTransport(self, stream, protocol, waiter)
+
+            def on_ready(_):
+                if future.cancelled():
+                    transport.close()
+                elif waiter.exception() is not None:
+                    transport.close()
+                    future.set_exception(waiter.exception())
+                else:
+                    future.set_result((transport, protocol))
+
+            waiter.add_done_callback(on_ready)
+
+        try:
+            connect(on_connect)
+        except error.UVError:
+            stream.close()
+            raise
+
+    def create_connection(self, protocol_factory, host=None, port=None, ssl=None,
+                          family=0, proto=0, flags=0, sock=None, local_addr=None,
+                          server_hostname=None, **keywords):
+        future = self.create_future()
+        if server_hostname is None and ssl:
+            server_hostname = host
+        if sock is not None:
+            stream = TCP(loop=self.loop)
+            stream.open(sock.detach())
+            transport_future = self.create_future()
+            self._connect_stream(stream, lambda on_connect: on_connect(None, 0),
+                                 protocol_factory, ssl, server_hostname, transport_future)
+            return transport_future
+
+        def on_resolved(addrinfo):
+            stream = TCP(loop=self.loop)
+            if local_addr is not None:
+                stream.bind(local_addr)
+            address = addrinfo[0].address
+            self._connect_stream(stream, lambda on_connect: stream.connect(address, on_connect),
+                                 protocol_factory, ssl, server_hostname, future)
+
+        self._resolve(host, port, family, flags, on_resolved, future)
+        return future
+
+    def create_server(self, protocol_factory, host=None, port=None, family=socket.AF_UNSPEC,
+                      flags=socket.AI_PASSIVE, sock=None, backlog=100, ssl=None,
+                      reuse_address=None, reuse_port=None, start_serving=True, **keywords):
+        future = self.create_future()
+        ssl_context = _make_ssl_context(ssl, True) if ssl else None
+
+        def make_server(listeners):
+            server = Server(self, listeners, protocol_factory, ssl_context, backlog)
+            if start_serving:
+                server.start_serving()
+            future.set_result(server)
+
+        if sock is not None:
+            listener = TCP(loop=self.loop)
+            listener.open(sock.detach())
+            make_server([listener])
+            return future
+        if host == '':
+            host = None
+        hosts = host if isinstance(host, (list, tuple)) else [host]
+
+        def on_resolved(addrinfo):
+            listeners = []
+            try:
+                for info in addrinfo:
+                    listener = TCP(loop=self.loop)
+                    listeners.append(listener)
+                    listener.bind(info.address)
+            except error.UVError:
+                for listener in listeners:
+                    listener.close()
+                raise
+            make_server(listeners)
+
+        if len(hosts) == 1 and hosts[0] is not None:
+            self._resolve(hosts[0], port, family, flags, on_resolved, future)
+        else:
+            addrinfo = []
+            for entry in hosts:
+                addrinfo.extend(socket.getaddrinfo(entry, port, family, socket.SOCK_STREAM,
+                                                   0, flags))
+            on_resolved([dns.AddrInfo(*info) for info in addrinfo])
+        return future
+
+    def create_unix_connection(self, protocol_factory, path=None, ssl=None, sock=None,
+                               server_hostname=None, **keywords):
+        future = self.create_future()
+        stream = Pipe(loop=self.loop)
+        if sock is not None:
+            stream.open(sock.detach())
+            connect = lambda on_connect: on_connect(None, 0)
+        else:
+            connect = lambda on_connect: stream.connect(path, on_connect)
+        self._connect_stream(stream, connect, protocol_factory, ssl, server_hostname, future)
+        return future
+
+    def create_unix_server(self, protocol_factory, path=None, sock=None, backlog=100,
+                           ssl=None, start_serving=True, **keywords):
+        future = self.create_future()
+        listener = Pipe(loop=self.loop)
+        try:
+            if sock is not None:
+                listener.open(sock.detach())
+            else:
+                listener.bind(path)
+        except error.UVError:
+            listener.close()
+            raise
+        ssl_context = _make_ssl_context(ssl, True) if ssl else None
+        server = Server(self, [listener], protocol_factory, ssl_context, backlog)
+        if start_serving:
+            server.start_serving()
+        future.set_result(server)
+        return future
+
+    def connect_accepted_socket(self, protocol_factory, sock, ssl=None, **keywords):
+        future = self.create_future()
+        stream = Pipe(loop=self.loop) if sock.family == socket.AF_UNIX else TCP(loop=self.loop)
+        stream.open(sock.detach())
+        self._connect_stream(stream, lambda on_connect: on_connect(None, 0),
+                             protocol_factory, ssl, None, future)
+        return future
+
+    def _connect_pipe(self, protocol_factory, pipe):
+        future = self.create_future()
+        stream = Pipe(loop=self.loop)
+        stream.open(os.dup(pipe.fileno()))
+        protocol = protocol_factory()
+        waiter = self.create_future()
+        transport = StreamTransport(self, stream, protocol, waiter, {'pipe': pipe})
+
+        def on_ready(_):
+            future.set_result((transport, protocol))
+
+        waiter.add_done_callback(on_ready)
+        return future
+
+    def connect_read_pipe(self, protocol_factory, pipe):
+        return self._connect_pipe(protocol_factory, pipe)
+
+    def connect_write_pipe(self, protocol_factory, pipe):
+        return self._connect_pipe(protocol_factory, pipe)
+
+    # datagrams
+
+    def create_datagram_endpoint(self, protocol_factory, local_addr=None, remote_addr=None,
+                                 family=0, proto=0, flags=0, reuse_address=None,
+                                 reuse_port=None, allow_broadcast=None, sock=None):
+        future = self.create_future()
+        udp = UDP(loop=self.loop)
+        try:
+            if sock is not None:
+                udp.open(sock.detach())
+            elif local_addr is not None:
+                udp.bind(local_addr)
+            elif family == socket.AF_INET6 or (remote_addr and ':' in remote_addr[0]):
+                udp.bind(('::', 0))
+            else:
+                udp.bind(('0.0.0.0', 0))
+            if allow_broadcast:
+                udp.set_broadcast(True)
+        except error.UVError:
+            udp.close()
+            raise
+        protocol = protocol_factory()
+        waiter = self.create_future()
+        transport = DatagramTransport(self, udp, protocol, remote_addr, waiter)
+
+        def on_ready(_):
+            future.set_result((transport, protocol))
+
+        waiter.add_done_callback(on_ready)
+        return future
+
+    # subprocesses
+
+    def subprocess_exec(self, protocol_factory, program, *arguments, **keywords):
+        stdin = keywords.pop('stdin', subprocess.PIPE)
+        stdout = keywords.pop('stdout', subprocess.PIPE)
+        stderr = keywords.pop('stderr', subprocess.PIPE)
+        for unsupported in ('universal_newlines', 'shell', 'bufsize', 'text',
+                            'encoding', 'errors'):
+            if keywords.pop(unsupported, None):
+                raise ValueError('{} is not supported'.format(unsupported))
+        future = self.create_future()
+        protocol = protocol_factory()
+        waiter = self.create_future()
+        transport = SubprocessTransport(self, protocol, [program] + list(arguments),
+                                        stdin, stdout, stderr, waiter, **keywords)
+
+        def on_ready(_):
+            future.set_result((transport, protocol))
+
+        waiter.add_done_callback(on_ready)
+        return future
+
+    def subprocess_shell(self, protocol_factory, cmd, **keywords):
+        if isinstance(cmd, bytes):
+            cmd = cmd.decode()
+        return self.subprocess_exec(protocol_factory, '/bin/sh', '-c', cmd, **keywords)
+
+    # file descriptors and sockets
+
+    def _update_poller(self, fd):
+        reader, writer, poll = self.pollers[fd]
+        events = 0
+        if reader is not None:
+            events |= PollEvent.READABLE
+        if writer is not None:
+            events |= PollEvent.WRITABLE
+        if events:
+            poll.start(events)
+        else:
+            poll.close()
+            del self.pollers[fd]
+
+    def _on_poll_event(self, poll, status, events):
+        reader, writer, _ = self.pollers.get(poll.fileno, (None, None, None))
+        if status != error.StatusCodes.SUCCESS:
+            events = PollEvent.READABLE | PollEvent.WRITABLE
+        if events & PollEvent.READABLE and reader is not None and not reader._cancelled:
+            self._add_ready(reader)
+        if events & PollEvent.WRITABLE and writer is not None and not writer._cancelled:
+            self._add_ready(writer)
+
+    def _set_poll_handle(self, fd, index, handle):
+        if not isinstance(fd, int):
+            fd = fd.fileno()
+        if fd not in self.pollers:
+            if handle is None:
+                return False
+            self.pollers[fd] = [None, None, Poll(fd, loop=self.loop,
+                                                 on_event=self._on_poll_event)]
+        previous = self.pollers[fd][index]
+        self.pollers[fd][index] = handle
+        self._update_poller(fd)
+        if previous is not None:
+            previous.cancel()
+        return previous is not None
+
+    def add_reader(self, fd, callback, *arguments):
+        self._check_closed()
+        self._set_poll_handle(fd, 0, self._make_handle(callback, arguments, {}))
+
+    def remove_reader(self, fd):
+        return self._set_poll_handle(fd, 0, None)
+
+    def add_writer(self, fd, callback, *arguments):
+        self._check_closed()
+        self._set_poll_handle(fd, 1, self._make_handle(callback, arguments, {}))
+
+    def remove_writer(self, fd):
+        return self._set_poll_handle(fd, 1, None)
+
+    def _sock_operation(self, sock, writable, operation):
+        """
+        Retry the non-blocking socket operation whenever the socket
+        becomes readable or writable until it succeeds.
+        """
+        future = self.create_future()
+        fd = sock.fileno()
+        add, remove = ((self.add_writer, self.remove_writer) if writable else
+                       (self.add_reader, self.remove_reader))
+
+        def attempt(registered):
+            if future.cancelled():
+                remove(fd)
+                return
+            try:
+                result = operation()
+            except (BlockingIOError, InterruptedError):
+                if not registered:
+                    add(fd, attempt, True)
+                return
+            except Exception as exception:
+                future.set_exception(exception)
+            else:
+                future.set_result(result)
+            if registered:
+                remove(fd)
+
+        attempt(False)
+        return future
+
+    def sock_recv(self, sock, nbytes):
+        return self._sock_operation(sock, False, lambda: sock.recv(nbytes))
+
+    def sock_recv_into(self, sock, buf):
+        return self._sock_operation(sock, False, lambda: sock.recv_into(buf))
+
+    def sock_sendall(self, sock, data):
+        view = [memoryview(data)]
+
+        def send():
+            while view[0]:
+                view[0] = view[0][sock.send(view[0]):]
+
+        return self._sock_operation(sock, True, send)
+
+    def sock_connect(self, sock, address):
+        state = {'connecting': False}
+
+        def connect():
+            if not state['connecting']:
+                state['connecting'] = True
+                code = sock.connect_ex(address)
+            else:
+                code = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+            if code in (errno.EINPROGRESS, errno.EWOULDBLOCK):
+                raise BlockingIOError()
+            if code:
+                raise OSError(code, os.strerror(code))
+
+        return self._sock_operation(sock, True, connect)
+
+    def sock_accept(self, sock):
+        return self._sock_operation(sock, False, sock.accept)
+
+    # signals
+
+    def add_signal_handler(self, sig, callback, *arguments):
+        self._check_closed()
+        if threading.current_thread() is not threading.main_thread():
+            raise RuntimeError('signal handlers can only be installed in the main thread')
+        handle = self._make_handle(callback, arguments, {})
+
+        def on_signal(signal_handle, signum):
+            if not handle._cancelled:
+                self._add_ready(handle)
+
+        self.remove_signal_handler(sig)
+        signal_handle = Signal(loop=self.loop, on_signal=on_signal)
+        signal_handle.dereference()
+        try:
+            signal_handle.start(sig)
+        except error.UVError:
+            signal_handle.close()
+            raise
+        self.signal_handlers[sig] = signal_handle
+
+    def remove_signal_handler(self, sig):
+        signal_handle = self.signal_handlers.pop(sig, None)
+        if signal_handle is None:
+            return False
+        signal_handle.close()
+        return True
+
+    # error handling
+
+    def get_exception_handler(self):
+        return self.exception_handler
+
+    def set_exception_handler(self, handler):
+        if handler is not None and not callable(handler):
+            raise TypeError('a callable object or None is expected, '
+                            'got {!r}'.format(handler))
+        self.exception_handler = handler
+
+    def default_exception_handler(self, context):
+        message = context.get('message') or 'unhandled exception in event loop'
+        exception = context.get('exception')
+        exc_info = (type(exception), exception, exception.__traceback__) if exception else False
+        details = ['{}: {!r}'.format(key, context[key]) for key in sorted(context)
+                   if key not in ('message', 'exception')]
+        logger.error('\n'.join([message] + details), exc_info=exc_info)
+
+    def call_exception_handler(self, context):
+        if self.exception_handler is None:
+            try:
+                self.default_exception_handler(context)
+            except Exception:  # pragma: no cover
+                logger.error('exception in default exception handler', exc_info=True)
+            return
+        try:
+            self.exception_handler(self, context)
+        except Exception as exception:
+            try:
+                self.default_exception_handler({
+                    'message': 'unhandled error in exception handler',
+                    'exception': exception,
+                    'context': context,
+                })
+            except Exception:  # pragma: no cover
+                logger.error('exception in default exception handler', exc_info=True)
+
+    # debug flag
+
+    def get_debug(self):
+        return self.debug
+
+    def set_debug(self, enabled):
+        self.debug = enabled
+
+
+class EventLoopPolicy(asyncio.events.BaseDefaultEventLoopPolicy):
+    """
+    Event loop policy creating :class:`uv.asyncio.EventLoop` instances.
+    """
+
+    _loop_factory = EventLoop
+
+
+Policy = EventLoopPolicy
+""" Shorthand for :class:`uv.asyncio.EventLoopPolicy`. """
@@ -54,6 +54,16 @@ even if they are in pending state.
 The semantic is archived by the following reference system:
 - loop -> pending handles and requests
 - handles and requests -> loop
+
+Therefore there are two registries which can not be merged. The set of
+pending structures of the user code loop holds the pending user objects
+and is only reachable from the user code loop, so that they are garbage
+collected together with it. The base loop's registry of low level
+handles is rooted globally, it keeps the libuv memory of handles alive
+until libuv has closed them, even after the user code loop has been
+garbage collected. Rooting pending structures globally would keep their
+loop alive forever, rooting low level handles at the user code loop
+would free the memory of handles libuv has not closed yet.
 """
 
 import weakref
@@ -78,6 +88,13 @@ def base_prepare_cb(uv_prepare):
     base_loop.on_prepare()
 
 
+@ffi.callback('uv_check_cb')
+def base_check_cb(uv_check):
+    base_loop = ffi.from_handle(uv_check.data)
+    """ :type: BaseLoop """
+    base_loop.on_check()
+
+
 @ffi.callback('uv_walk_cb')
 def base_walk_close_cb(uv_handle, _):
     if not lib.uv_is_closing(uv_handle):
@@ -129,12 +146,17 @@ class BaseLoop(object):
         self.handles_to_close = set()
         self.requests_to_cancel = set()
 
+        self.free_requests = {}
+
         self.closed = False
 
         self.internal_uv_async = ffi.new('uv_async_t*')
         self.internal_uv_async.data = self.c_reference
         self.internal_uv_prepare = ffi.new('uv_prepare_t*')
         self.internal_uv_prepare.data = self.c_reference
+        self.internal_uv_check = ffi.new('uv_check_t*')
+        self.internal_uv_check.data = self.c_reference
+        self.internal_check_active = False
 
         if not default:
             code = lib.uv_loop_init(self.uv_loop)
@@ -144,6 +166,7 @@ class BaseLoop(object):
 
         self._init_internal_async()
         self._init_internal_prepare()
+        self._init_internal_check()
 
         _loops.add(self)
 
@@ -178,6 +201,23 @@ class BaseLoop(object):
         if not lib.uv_is_closing(uv_handle):
             lib.uv_close(uv_handle, ffi.NULL)
 
+    def _init_internal_check(self):
+        """
+        Initialize the internal check handle.
+        """
+        lib.uv_check_init(self.uv_loop, self.internal_uv_check)
+        lib.uv_unref(ffi.cast('uv_handle_t*', self.internal_uv_check))
+        if self.internal_check_active:
+            lib.uv_check_start(self.internal_uv_check, base_check_cb)
+
+    def _close_internal_check(self):
+        """
+        Close the internal check handle.
+        """
+        uv_handle = ffi.cast('uv_handle_t*', self.internal_uv_check)
+        if not lib.uv_is_closing(uv_handle):
+            lib.uv_close(uv_handle, ffi.NULL)
+
     def _destroy(self, _):
         """
         This method is invoked by the garbage collection after the user
@@ -206,6 +246,34 @@ class BaseLoop(object):
         """
         lib.uv_unref(ffi.cast('uv_handle_t*', self.internal_uv_async))
 
+    def reference_internal_prepare(self):
+        """
+        Reference the internal prepare handle to keep the loop alive
+        until the next prepare phase.
+        """
+        lib.uv_ref(ffi.cast('uv_handle_t*', self.internal_uv_prepare))
+
+    def dereference_internal_prepare(self):
+        """
+        Dereference the internal prepare handle.
+        """
+        lib.uv_unref(ffi.cast('uv_handle_t*', self.internal_uv_prepare))
+
+    def start_internal_check(self):
+        """
+        Start the internal check handle which runs right after polling
+        for IO without keeping the loop alive.
+        """
+        self.internal_check_active = True
+        lib.uv_check_start(self.internal_uv_check, base_check_cb)
+
+    def stop_internal_check(self):
+        """
+        Stop the internal check handle.
+        """
+        self.internal_check_active = False
+        lib.uv_check_stop(self.internal_uv_check)
+
     @property
     def user_loop(self):
         """
@@ -276,6 +344,7 @@ class BaseLoop(object):
 
         self._close_internal_async()
         self._close_internal_prepare()
+        self._close_internal_check()
         for handle in self.handles_to_close:
             handle.close()
         for request in self.requests_to_cancel:
@@ -287,8 +356,10 @@ class BaseLoop(object):
         if code != error.StatusCodes.SUCCESS:
             self._init_internal_async()
             self._init_internal_prepare()
+            self._init_internal_check()
         else:
             _loops.remove(self)
+            self.free_requests.clear()
             self.closed = True
         return code
 
@@ -310,6 +381,10 @@ class BaseLoop(object):
                 base_request.cancel()  # pragma: no cover
         except KeyError:
             pass
+        user_loop = self.user_loop
+        """ :type: uv.Loop """
+        if user_loop is not None:
+            user_loop.on_prepare()
 
     def on_wakeup(self):
         """
@@ -320,6 +395,15 @@ class BaseLoop(object):
         if user_loop is not None:
             user_loop.on_wakeup()
 
+    def on_check(self):
+        """
+        Internal check handle callback.
+        """
+        user_loop = self.user_loop
+        """ :type: uv.Loop """
+        if user_loop is not None:
+            user_loop.on_check()
+
 
 @ffi.callback('uv_close_cb')
 def uv_close_cb(uv_handle):
@@ -330,38 +414,31 @@ def uv_close_cb(uv_handle):
     user_handle = base_handle.user_handle
     """ :type: uv.Handle """
     if user_handle:
+        user_handle.clear_pending()
+        metrics = user_handle.loop.metrics_collector
+        if metrics is not None:
+            start = lib.uv_hrtime()
         try:
             user_handle.on_closed(user_handle)
         except Exception:
             user_handle.loop.handle_exception()
+        if metrics is not None:
+            metrics.record_callback(user_handle.__class__.__name__, lib.uv_hrtime() - start)
 
 
-class BaseHandle(object):
+class HandleState(object):
     """
-    This class implements an internal low level handle.
+    This class implements the state shared by all internal low level
+    handle types. It has no slots itself so it can be mixed into
+    :class:`HandleReference` which is a weak reference.
     """
 
-    __slots__ = ['c_reference', 'weak_user_handle', 'base_loop', 'uv_object',
-                 'uv_handle', 'closed', 'closing']
+    __slots__ = []
 
-    @staticmethod
-    def detach(uv_handle):
+    def init_state(self, base_loop, handle_type, handle_init, arguments):
         """
-        :type uv_handle:
-            ffi.CData[uv_handle_t*]
-        :rtype:
-            uv.Handle | None
-        """
-        try:
-            if uv_handle.data:
-                return ffi.from_handle(uv_handle.data).user_handle
-        except AttributeError:
-            return None
+        Allocate and initialize the libuv handle.
 
-    def __init__(self, user_handle, base_loop, handle_type, handle_init, arguments):
-        """
-        :type user_handle:
-            uv.Handle
         :type base_loop:
             Loop
         :type handle_type:
@@ -372,13 +449,11 @@ class BaseHandle(object):
             tuple
         """
         self.c_reference = ffi.new_handle(self)
-
-        self.weak_user_handle = weakref.ref(user_handle, self._destroy)
         self.base_loop = base_loop
 
         self.uv_object = ffi.new(handle_type)
-        self.uv_object.data = self.c_reference
         self.uv_handle = ffi.cast('uv_handle_t*', self.uv_object)
+        self.uv_handle.data = self.c_reference
 
         code = handle_init(self.base_loop.uv_loop, self.uv_object, *arguments)
         if code != error.StatusCodes.SUCCESS:
@@ -399,14 +474,6 @@ class BaseHandle(object):
         if not self.closing:
             self.base_loop.handles_to_close.add(self)
 
-    @property
-    def user_handle(self):
-        """
-        :rtype:
-            uv.Handle | None
-        """
-        return self.weak_user_handle()
-
     def set_closed(self):
         """
         Set the handle's state to closed. This method is called from
@@ -416,7 +483,7 @@ class BaseHandle(object):
         the global reference and allows the garbage collection to
         collect the low level handle.
         """
-        self.uv_object.data = ffi.NULL
+        self.uv_handle.data = ffi.NULL
         self.closed = True
         self.c_reference = None
         self.base_loop.detach_handle(self)
@@ -430,6 +497,108 @@ class BaseHandle(object):
             lib.uv_close(self.uv_handle, uv_close_cb)
 
 
+class BaseHandle(HandleState):
+    """
+    This class implements an internal low level handle.
+    """
+
+    __slots__ = ['c_reference', 'weak_user_handle', 'base_loop', 'uv_object',
+                 'uv_handle', 'closed', 'closing']
+
+    @staticmethod
+    def detach(uv_handle):
+        """
+        :type uv_handle:
+            ffi.CData[uv_handle_t*]
+        :rtype:
+            uv.Handle | None
+        """
+        try:
+            if uv_handle.data:
+                return ffi.from_handle(uv_handle.data).user_handle
+        except AttributeError:
+            return None
+
+    def __init__(self, user_handle, base_loop, handle_type, handle_init, arguments):
+        """
+        :type user_handle:
+            uv.Handle
+        :type base_loop:
+            Loop
+        :type handle_type:
+            unicode
+        :type handle_init:
+            callable
+        :type arguments:
+            tuple
+        """
+        self.weak_user_handle = weakref.ref(user_handle, self._destroy)
+        self.init_state(base_loop, handle_type, handle_init, arguments)
+
+    @property
+    def user_handle(self):
+        """
+        :rtype:
+            uv.Handle | None
+        """
+        return self.weak_user_handle()
+
+
+def _destroy_handle_reference(handle_reference):
+    handle_reference._destroy(handle_reference)
+
+
+class HandleReference(weakref.ref, HandleState):
+    """
+    This class implements a lightweight internal low level handle. It
+    is the weak reference to the user handle itself which saves the
+    separate base handle object, weak reference and bound finalizer
+    method per handle. The garbage collection semantic is exactly the
+    same as with :class:`BaseHandle`, so the handle is registered with
+    the base loop and, while pending, with the user code loop as well
+    (see the module documentation on why both registries are needed).
+    """
+
+    __slots__ = ['c_reference', 'base_loop', 'uv_object', 'uv_handle', 'closed',
+                 'closing']
+
+    def __new__(cls, user_handle, base_loop, handle_type, handle_init, arguments):
+        return weakref.ref.__new__(cls, user_handle, _destroy_handle_reference)
+
+    def __init__(self, user_handle, base_loop, handle_type, handle_init, arguments):
+        """
+        :type user_handle:
+            uv.Handle
+        :type base_loop:
+            Loop
+        :type handle_type:
+            unicode
+        :type handle_init:
+            callable
+        :type arguments:
+            tuple
+        """
+        super(HandleReference, self).__init__(user_handle, _destroy_handle_reference)
+        self.init_state(base_loop, handle_type, handle_init, arguments)
+
+    # weak references compare by their referents, handles by identity
+    __hash__ = object.__hash__
+
+    def __eq__(self, other):
+        return self is other
+
+    def __ne__(self, other):
+        return self is not other
+
+    @property
+    def user_handle(self):
+        """
+        :rtype:
+            uv.Handle | None
+        """
+        return self()
+
+
 def handle_callback(callback_type):
     """
     Decorator for handle callbacks.
@@ -441,10 +610,16 @@ def handle_callback(callback_type):
         def wrapper(uv_handle, *arguments):
             user_handle = BaseHandle.detach(uv_handle)
             if user_handle:
+                metrics = user_handle.loop.metrics_collector
+                if metrics is not None:
+                    start = lib.uv_hrtime()
                 try:
                     callback(user_handle, *arguments)
                 except:
                     user_handle.loop.handle_exception()
+                if metrics is not None:
+                    metrics.record_callback(user_handle.__class__.__name__,
+                                            lib.uv_hrtime() - start)
         return ffi.callback(callback_type, wrapper)
     return decorator
 
@@ -452,13 +627,51 @@ def handle_callback(callback_type):
 class BaseRequest(object):
     """
     This class implements an internal low level request.
+
+    Base requests created with :meth:`acquire` are recycled. After the
+    request has finished and the user request has been garbage collected
+    the base request together with its libuv request structure is put on
+    a free list of the base loop and reused by the next request of the
+    same type.
     """
 
     __slots__ = ['c_reference', 'weak_user_request', 'base_loop', 'uv_object',
-                 'uv_request', 'finished', 'canceled']
+                 'uv_request', 'request_type', 'recyclable', 'finished',
+                 'canceled']
+
+    max_free_requests = 64
+
+    @classmethod
+    def acquire(cls, user_request, base_loop, request_type, request_init,
+                arguments, uv_handle=None):
+        """
+        Reuse a base request from the free list of the base loop or
+        create a new recyclable one.
+
+        :type user_request:
+            uv.UVRequest
+        :type base_loop:
+            Loop
+        :type request_type:
+            unicode
+        :type request_init:
+            callable
+        :type arguments:
+            tuple
+        :rtype:
+            BaseRequest
+        """
+        free_requests = base_loop.free_requests.get(request_type)
+        if free_requests:
+            base_request = free_requests.pop()
+            base_request.recyclable = True
+            base_request.init_request(user_request, request_init, arguments, uv_handle)
+            return base_request
+        return cls(user_request, base_loop, request_type, request_init, arguments,
+                   uv_handle, recyclable=True)
 
     def __init__(self, user_request, base_loop, request_type, request_init,
-                 arguments, uv_handle=None):
+                 arguments, uv_handle=None, recyclable=False):
         """
         :type user_request:
             uv.UVRequest
@@ -470,18 +683,36 @@ class BaseRequest(object):
             callable
         :type arguments:
             tuple
+        :type recyclable:
+            bool
         """
         self.c_reference = ffi.new_handle(self)
-
-        self.weak_user_request = weakref.ref(user_request, self._destroy)
         self.base_loop = base_loop
 
+        self.request_type = request_type
+        self.recyclable = recyclable
+
         self.uv_object = ffi.new(request_type)
-        self.uv_object.data = self.c_reference
         self.uv_request = ffi.cast('uv_req_t*', self.uv_object)
 
+        self.init_request(user_request, request_init, arguments, uv_handle)
+
+    def init_request(self, user_request, request_init, arguments, uv_handle=None):
+        """
+        Initialize the libuv request on behalf of the given user request.
+
+        :type user_request:
+            uv.UVRequest
+        :type request_init:
+            callable
+        :type arguments:
+            tuple
+        """
+        self.weak_user_request = weakref.ref(user_request, self._destroy)
+        self.uv_object.data = self.c_reference
+
         if uv_handle is None:
-            code = request_init(base_loop.uv_loop, self.uv_object, *arguments)
+            code = request_init(self.base_loop.uv_loop, self.uv_object, *arguments)
         else:
             code = request_init(self.uv_object, uv_handle, *arguments)
 
@@ -500,7 +731,9 @@ class BaseRequest(object):
         request has been garbage collected. The request is not
         cancelled immediately because this may lead to data races.
         """
-        if not self.finished and not self.canceled:
+        if self.finished:
+            self.recycle()
+        elif not self.canceled:
             self.base_loop.requests_to_cancel.add(self)
 
     @property
@@ -522,8 +755,25 @@ class BaseRequest(object):
         """
         self.uv_object.data = ffi.NULL
         self.finished = True
-        self.c_reference = None
+        if not self.recyclable:
+            self.c_reference = None
         self.base_loop.detach_request(self)
+        if self.weak_user_request() is None:
+            self.recycle()
+
+    def recycle(self):
+        """
+        Put the request on the free list of the base loop if it is
+        recyclable. Must only be called after the request has finished
+        and the user request, which refers to it, is gone.
+        """
+        if self.recyclable:
+            self.recyclable = False
+            free_requests = self.base_loop.free_requests.setdefault(self.request_type, [])
+            if not self.base_loop.closed and len(free_requests) < self.max_free_requests:
+                free_requests.append(self)
+            else:
+                self.c_reference = None
 
     def cancel(self):
         """
@@ -551,10 +801,16 @@ def request_callback(callback_type):
             user_request = base_request.user_request
             if user_request:
                 user_request.clear_pending()
+                metrics = user_request.loop.metrics_collector
+                if metrics is not None:
+                    start = lib.uv_hrtime()
                 try:
                     callback(user_request, *arguments)
                 except Exception:
                     user_request.loop.handle_exception()
+                if metrics is not None:
+                    metrics.record_callback(user_request.__class__.__name__,
+                                            lib.uv_hrtime() - start)
         return ffi.callback(callback_type, wrapper)
     return decorator
 
@@ -0,0 +1,651 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2016, Maximilian Köhl <mail@koehlma.de>
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License version 3 as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along
+# with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Multi-process TCP servers built on top of inter process communication.
+
+A :class:`Master` binds a listening TCP socket and spawns worker
+processes which are connected to the master by inter process
+communication pipes. Each worker creates a :class:`Worker` which
+receives either the listening socket itself or the connections accepted
+by the master and hands the connections to user code.
+"""
+
+from __future__ import print_function, unicode_literals, division, absolute_import
+
+import os
+import signal as std_signal
+
+from . import common, error, misc
+from .loop import Loop
+
+from .handles import pipe, process, tcp, timer
+
+
+ENVIRONMENT_VARIABLE = 'UV_CLUSTER_WORKER'
+"""
+Environment variable containing the worker id of a worker process.
+"""
+
+IPC_FD = 3
+"""
+File descriptor of the inter process communication pipe in worker
+processes.
+"""
+
+MESSAGE_LISTENER = b'L'
+MESSAGE_DISTRIBUTED = b'D'
+MESSAGE_CONNECTION = b'C'
+MESSAGE_READY = b'R'
+
+
+def worker_id():
+    """
+    Get the worker id of the current process.
+
+    :return:
+        worker id or `None` if the process is not a worker
+    :rtype:
+        int | None
+    """
+    try:
+        return int(os.environ[ENVIRONMENT_VARIABLE])
+    except (KeyError, ValueError):
+        return None
+
+
+def is_worker():
+    """
+    :return:
+        `True` if and only if the current process has been spawned as a
+        worker by a :class:`Master`
+    :rtype:
+        bool
+    """
+    return worker_id() is not None
+
+
+class Modes(common.Enumeration):
+    """
+    Connection distribution modes enumeration.
+    """
+
+    SHARED = 0
+    """
+    The listening socket is sent to every worker and all workers accept
+    connections on their own. The kernel distributes the connections.
+
+    :type: uv.cluster.Modes
+    """
+
+    ROUND_ROBIN = 1
+    """
+    The master accepts all connections and sends them to the workers in
+    a round-robin fashion.
+
+    :type: uv.cluster.Modes
+    """
+
+
+class WorkerProcess(object):
+    """
+    Master side representation of a worker process.
+
+    :param master:
+        master the worker belongs to
+    :param identifier:
+        worker id
+
+    :type master:
+        uv.cluster.Master
+    :type identifier:
+        int
+    """
+
+    __slots__ = ['master', 'identifier', 'process', 'channel', 'ready', 'restarts',
+                 'timer']
+
+    def __init__(self, master, identifier):
+        self.master = master
+        """
+        Master the worker belongs to.
+
+        :readonly:
+            True
+        :type:
+            uv.cluster.Master
+        """
+        self.identifier = identifier
+        """
+        Worker id, the same id is kept if the worker gets restarted.
+
+        :readonly:
+            True
+        :type:
+            int
+        """
+        self.process = None
+        """
+        Process handle of the worker or `None` if the worker is not
+        running.
+
+        :readonly:
+            True
+        :type:
+            uv.Process | None
+        """
+        self.channel = None
+        """
+        Inter process communication pipe connected to the worker.
+
+        :readonly:
+            True
+        :type:
+            uv.Pipe | None
+        """
+        self.ready = False
+        """
+        `True` if and only if the worker is ready to handle connections.
+
+        :readonly:
+            True
+        :type:
+            bool
+        """
+        self.restarts = 0
+        """
+        Number of times the worker has been restarted.
+
+        :readonly:
+            True
+        :type:
+            int
+        """
+        self.timer = None
+
+    @property
+    def alive(self):
+        """
+        `True` if and only if the worker process is running.
+
+        :readonly:
+            True
+        :rtype:
+            bool
+        """
+        return self.process is not None and not self.process.closing
+
+    @property
+    def pid(self):
+        """
+        Process id of the worker or `None` if it is not running.
+
+        :readonly:
+            True
+        :rtype:
+            int | None
+        """
+        return self.process.pid if self.alive else None
+
+    def spawn(self):
+        """
+        Spawn the worker process.
+
+        .. warning::
+            This method is only for internal purposes and is not part
+            of the official API. You should never call it directly!
+        """
+        self.timer = None
+        self.ready = False
+        master = self.master
+        environment = dict(os.environ if master.env is None else master.env)
+        environment[ENVIRONMENT_VARIABLE] = str(self.identifier)
+        master.loop.make_current()
+        self.process = process.Process(master.arguments, cwd=master.cwd, env=environment,
+                                       stdout=process.STDOUT, stderr=process.STDERR,
+                                       stdio=[process.PIPE], loop=master.loop,
+                                       on_exit=self.on_exit)
+        self.channel = self.process.stdio[0]
+        self.channel.read_start(on_read=self.on_read)
+        if master.mode == Modes.SHARED:
+            self.channel.write(MESSAGE_LISTENER, send_stream=master.listener)
+        else:
+            self.channel.write(MESSAGE_DISTRIBUTED)
+
+    def send(self, connection):
+        """
+        Send a connection to the worker, the master's copy of the
+        connection is closed afterwards.
+
+        .. warning::
+            This method is only for internal purposes and is not part
+            of the official API. You should never call it directly!
+
+        :type connection:
+            uv.TCP
+        """
+        self.channel.write(MESSAGE_CONNECTION, send_stream=connection,
+                           on_write=lambda request, status: connection.close())
+
+    def kill(self, signum=std_signal.SIGTERM):
+        """
+        Send the specified signal to the worker process.
+
+        :param signum:
+            signal number
+
+        :type signum:
+            int
+        """
+        if self.alive:
+            self.process.kill(signum)
+
+    def on_read(self, channel, status, data):
+        if status != error.StatusCodes.SUCCESS:
+            channel.close()
+        elif MESSAGE_READY in data and not self.ready:
+            self.ready = True
+            self.master.on_worker_ready(self.master, self)
+
+    def on_exit(self, process_handle, returncode, signum):
+        self.ready = False
+        process_handle.close()
+        if not self.channel.closing:
+            self.channel.close()
+        master = self.master
+        try:
+            master.on_worker_exit(master, self, returncode, signum)
+        except Exception:
+            master.loop.handle_exception()
+        if master.running and master.restart:
+            self.restarts += 1
+            self.timer = timer.Timer(loop=master.loop,
+                                     on_timeout=self.on_restart_timeout)
+            self.timer.start(master.restart_delay)
+
+    def on_restart_timeout(self, timer_handle):
+        timer_handle.close()
+        if self.master.running:
+            self.spawn()
+
+
+class Master(object):
+    """
+    Master of a multi-process TCP server. Binds a TCP socket to the
+    given address and spawns worker processes running the specified
+    program. The workers have to create a :class:`uv.cluster.Worker`
+    in order to receive connections. Workers which exit while the
+    master is running are restarted.
+
+    :raises uv.UVError:
+        error while binding the socket
+
+    :param arguments:
+        program path and command line arguments of the workers, e.g.
+        `[sys.executable, 'worker.py']`
+    :param address:
+        address the server should listen on
+    :param workers:
+        number of worker processes (defaults to the number of CPUs)
+    :param mode:
+        connection distribution mode
+    :param backlog:
+        number of connections the kernel might queue
+    :param restart:
+        restart workers after they exited
+    :param restart_delay:
+        delay in milliseconds before a worker gets restarted
+    :param cwd:
+        working directory of the workers
+    :param env:
+        environment variables of the workers (defaults to the master's
+        environment)
+    :param loop:
+        event loop the master should run on
+    :param on_worker_ready:
+        callback which should run after a worker is ready to handle
+        connections
+    :param on_worker_exit:
+        callback which should run after a worker exited
+
+    :type arguments:
+        list[unicode]
+    :type address:
+        tuple | uv.Address
+    :type workers:
+        int | None
+    :type mode:
+        uv.cluster.Modes
+    :type backlog:
+        int
+    :type restart:
+        bool
+    :type restart_delay:
+        int
+    :type cwd:
+        unicode | None
+    :type env:
+        dict[unicode, unicode] | None
+    :type loop:
+        uv.Loop
+    :type on_worker_ready:
+        ((uv.cluster.Master, uv.cluster.WorkerProcess) -> None) |
+        ((Any, uv.cluster.Master, uv.cluster.WorkerProcess) -> None)
+    :type on_worker_exit:
+        ((uv.cluster.Master, uv.cluster.WorkerProcess, int, int) -> None) |
+        ((Any, uv.cluster.Master, uv.cluster.WorkerProcess, int, int) -> None)
+    """
+
+    def __init__(self, arguments, address, workers=None, mode=Modes.SHARED, backlog=128,
+                 restart=True, restart_delay=1000, cwd=None, env=None, loop=None,
+                 on_worker_ready=None, on_worker_exit=None):
+        self.loop = loop or Loop.get_current()
+        self.arguments = arguments
+        self.address = address
+        self.mode = mode
+        self.backlog = backlog
+        self.restart = restart
+        """
+        Restart workers after they exited.
+
+        :readonly:
+            False
+        :type:
+            bool
+        """
+        self.restart_delay = restart_delay
+        self.cwd = cwd
+        self.env = env
+        self.on_worker_ready = on_worker_ready or common.dummy_callback
+        """
+        Callback which should run after a worker is ready to handle
+        connections. In shared mode connections are refused until the
+        first worker is ready.
+
+
+        .. function:: on_worker_ready(master, worker)
+
+            :param master:
+                master the worker belongs to
+            :param worker:
+                worker which is ready
+
+            :type master:
+                uv.cluster.Master
+            :type worker:
+                uv.cluster.WorkerProcess
+
+
+        :readonly:
+            False
+        :type:
+            ((uv.cluster.Master, uv.cluster.WorkerProcess) -> None) |
+            ((Any, uv.cluster.Master, uv.cluster.WorkerProcess) -> None)
+        """
+        self.on_worker_exit = on_worker_exit or common.dummy_callback
+        """
+        Callback which should run after a worker exited.
+
+
+        .. function:: on_worker_exit(master, worker, returncode, signum)
+
+            :param master:
+                master the worker belongs to
+            :param worker:
+                worker which exited
+            :param returncode:
+                status code returned by the worker process
+            :param signum:
+                signal number caused the worker to exit
+
+            :type master:
+                uv.cluster.Master
+            :type worker:
+                uv.cluster.WorkerProcess
+            :type returncode:
+                int
+            :type signum:
+                int
+
+
+        :readonly:
+            False
+        :type:
+            ((uv.cluster.Master, uv.cluster.WorkerProcess, int, int) -> None) |
+            ((Any, uv.cluster.Master, uv.cluster.WorkerProcess, int, int) -> None)
+        """
+        if workers is None:
+            workers = len(misc.cpu_info()) or 1
+        self.workers = [WorkerProcess(self, identifier) for identifier in range(workers)]
+        """
+        Worker processes of the master.
+
+        :readonly:
+            True
+        :type:
+            list[uv.cluster.WorkerProcess]
+        """
+        self.running = False
+        """
+        `True` if and only if the master has been started and has not
+        been stopped yet.
+
+        :readonly:
+            True
+        :type:
+            bool
+        """
+        self.next_worker = 0
+
+        self.listener = tcp.TCP(loop=self.loop)
+        try:
+            self.listener.bind(address)
+        except error.UVError:
+            self.listener.close()
+            raise
+
+    @property
+    def sockname(self):
+        """
+        Address the server is listening on.
+
+        :readonly:
+            True
+        :rtype:
+            uv.Address
+        """
+        return self.listener.sockname
+
+    def start(self):
+        """
+        Spawn the worker processes and start accepting connections.
+
+        :raises uv.UVError:
+            error while spawning the workers or listening
+        :raises uv.ClosedHandleError:
+            master has already been stopped
+        """
+        if self.listener.closing:
+            raise error.ClosedHandleError()
+        if self.running:
+            return
+        self.running = True
+        if self.mode == Modes.ROUND_ROBIN:
+            self.listener.listen(self.backlog, on_connection=self.on_connection)
+        for worker in self.workers:
+            worker.spawn()
+
+    def stop(self, signum=std_signal.SIGTERM):
+        """
+        Stop accepting connections and terminate all worker processes
+        by sending them the specified signal.
+
+        :param signum:
+            signal number
+
+        :type signum:
+            int
+        """
+        self.running = False
+        if not self.listener.closing:
+            self.listener.close()
+        for worker in self.workers:
+            if worker.timer is not None:
+                worker.timer.close()
+                worker.timer = None
+            worker.kill(signum)
+
+    def on_connection(self, listener, status):
+        if status != error.StatusCodes.SUCCESS:
+            return
+        connection = listener.accept(loop=self.loop)
+        for _ in range(len(self.workers)):
+            worker = self.workers[self.next_worker]
+            self.next_worker = (self.next_worker + 1) % len(self.workers)
+            if worker.alive:
+                worker.send(connection)
+                return
+        connection.close()
+
+
+class Worker(object):
+    """
+    Worker side of a multi-process TCP server. Receives connections from
+    the master over the inter process communication pipe and passes them
+    to the connection callback.
+
+    :raises uv.UVError:
+        error while opening the inter process communication pipe
+    :raises RuntimeError:
+        process has not been spawned by a master
+
+    :param backlog:
+        number of connections the kernel might queue (shared mode)
+    :param loop:
+        event loop the worker should run on
+    :param on_connection:
+        callback which should run after a new connection has been
+        received
+
+    :type backlog:
+        int
+    :type loop:
+        uv.Loop
+    :type on_connection:
+        ((uv.cluster.Worker, uv.TCP) -> None) |
+        ((Any, uv.cluster.Worker, uv.TCP) -> None)
+    """
+
+    def __init__(self, backlog=128, loop=None, on_connection=None):
+        self.identifier = worker_id()
+        """
+        Worker id assigned by the master.
+
+        :readonly:
+            True
+        :type:
+            int
+        """
+        if self.identifier is None:
+            raise RuntimeError('process has not been spawned by a master')
+        self.loop = loop or Loop.get_current()
+        self.backlog = backlog
+        self.on_connection = on_connection or common.dummy_callback
+        """
+        Callback which should run after a new connection has been
+        received.
+
+
+        .. function:: on_connection(worker, connection)
+
+            :param worker:
+                worker which received the connection
+            :param connection:
+                new connection
+
+            :type worker:
+                uv.cluster.Worker
+            :type connection:
+                uv.TCP
+
+
+        :readonly:
+            False
+        :type:
+            ((uv.cluster.Worker, uv.TCP) -> None) |
+            ((Any, uv.cluster.Worker, uv.TCP) -> None)
+        """
+        self.listener = None
+        """
+        Listening socket received from the master (shared mode only).
+
+        :readonly:
+            True
+        :type:
+            uv.TCP | None
+        """
+        self.channel = pipe.Pipe(ipc=True, loop=self.loop)
+        self.channel.open(IPC_FD)
+        self.channel.read_start(on_read=self.on_read)
+
+    def close(self):
+        """
+        Stop receiving connections.
+        """
+        if not self.channel.closing:
+            self.channel.close()
+        if self.listener is not None and not self.listener.closing:
+            self.listener.close()
+
+    def on_read(self, channel, status, data):
+        if status != error.StatusCodes.SUCCESS:
+            self.close()
+            return
+        for index in range(len(data)):
+            message = data[index:index + 1]
+            if message == MESSAGE_DISTRIBUTED:
+                channel.write(MESSAGE_READY)
+            elif channel.pending_count:
+                received = channel.pending_accept(loop=self.loop)
+                if message == MESSAGE_LISTENER:
+                    self.listener = received
+                    self.listener.listen(self.backlog,
+                                         on_connection=self.on_listener_connection)
+                    channel.write(MESSAGE_READY)
+                else:
+                    self.dispatch(received)
+
+    def on_listener_connection(self, listener, status):
+        if status != error.StatusCodes.SUCCESS:
+            return
+        try:
+            connection = listener.accept(loop=self.loop)
+        except error.TemporaryUnavailableError:
+            # another worker has been faster
+            return
+        self.dispatch(connection)
+
+    def dispatch(self, connection):
+        """
+        Pass a new connection to the connection callback.
+
+        .. warning::
+            This method is only for internal purposes and is not part
+            of the official API. You should never call it directly!
+
+        :type connection:
+            uv.TCP
+        """
+        self.on_connection(self, connection)
@@ -36,7 +36,7 @@ def with_metaclass(meta, *bases):
 
 class _EnumerationMeta(type):
     _members = []
-    _value_member_map = {}
+    _value2member_map_ = {}
 
     def __prepare__(mcs, *args, **kwargs):
         return OrderedDict()
@@ -49,7 +49,7 @@ class _EnumerationMeta(type):
             attributes[name] = None
         value_member_map = {}
         attributes['_members'] = members
-        attributes['_value_member_map'] = value_member_map
+        attributes['_value2member_map_'] = value_member_map
         cls = type.__new__(mcs, cls_name, cls_bases, attributes)
         for name, value in members:
             instance = super(_EnumerationMeta, mcs).__call__(cls, value)
@@ -61,12 +61,12 @@ class _EnumerationMeta(type):
 
     def __call__(cls, value):
         try:
-            return cls._value_member_map[value]
+            return cls._value2member_map_[value]
         except KeyError:
             raise ValueError(value)
 
     def __iter__(cls):
-        return iter(cls._value_member_map.values())
+        return iter(cls._value2member_map_.values())
 
 try:
     from enum import IntEnum
@@ -79,10 +79,18 @@ except ImportError:
 class Enumeration(IntEnum):
     @classmethod
     def get(cls, integer):
-        try:
-            return cls(integer)
-        except ValueError:
-            return integer
+        """
+        Look up the member with the given value or return the original
+        integer if there is no such member. Unlike calling the class this
+        is a plain dictionary lookup, it is used on hot callback paths.
+
+        :type integer:
+            int
+
+        :rtype:
+            uv.common.Enumeration | int
+        """
+        return cls._value2member_map_.get(integer, integer)
 
 
 try:
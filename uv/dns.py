@@ -15,10 +15,12 @@
 
 from __future__ import absolute_import, division, print_function, unicode_literals
 
+import collections
 import socket
 import warnings
 
 from . import base, common, error, library, request
+from .handles.idle import Idle
 from .library import ffi, lib
 
 
@@ -355,32 +357,60 @@ def unpack_addrinfo(c_addrinfo):
     return items
 
 
-def unpack_sockaddr(c_sockaddr):
-    """
-    :type c_sockaddr:
-        ffi.CData[struct sockaddr*]
-    """
-    if c_sockaddr.sa_family == socket.AF_INET:
-        c_sockaddr_in4 = ffi.cast('struct sockaddr_in*', c_sockaddr)
+SOCKADDR_CACHE_SIZE = 1024
+"""
+Maximal number of unpacked socket addresses kept in the sockaddr cache.
 
-        c_host = ffi.new('char[16]')
+:type: int
+"""
 
-        port = socket.ntohs(c_sockaddr_in4.sin_port)
-        lib.uv_ip4_name(c_sockaddr_in4, c_host, 16)
+# family, port and address of IPv4 sockaddrs precede the unused padding
+_sockaddr_key_sizes = {socket.AF_INET: 8,
+                       socket.AF_INET6: ffi.sizeof('struct sockaddr_in6')}
+_sockaddr_cache = collections.OrderedDict()
 
-        return Address4(ffi.string(c_host).decode(), port)
-    elif c_sockaddr.sa_family == socket.AF_INET6:
-        c_sockaddr_in6 = ffi.cast('struct sockaddr_in6*', c_sockaddr)
 
-        c_additional = lib.cross_get_ipv6_additional(c_sockaddr_in6)
-        c_host = ffi.new('char[40]')
+def clear_sockaddr_cache():
+    """
+    Clear the cache of unpacked socket addresses.
+    """
+    _sockaddr_cache.clear()
 
-        flowinfo = c_additional.flowinfo
-        scope_id = c_additional.scope_id
-        port = socket.ntohs(c_sockaddr_in6.sin6_port)
-        lib.uv_ip6_name(c_sockaddr_in6, c_host, 40)
 
-        return Address6(ffi.string(c_host).decode(), port, flowinfo, scope_id)
+def unpack_sockaddr(c_sockaddr):
+    """
+    Unpack a socket address into an :class:`uv.Address4` or
+    :class:`uv.Address6`. The most recently unpacked addresses are
+    cached keyed on their raw bytes, so addresses of peers which are
+    seen repeatedly are unpacked only once.
+
+    :type c_sockaddr:
+        ffi.CData[struct sockaddr*]
+
+    :rtype: uv.Address4 | uv.Address6 | None
+    """
+    key_size = _sockaddr_key_sizes.get(c_sockaddr.sa_family)
+    if key_size is None:
+        return None
+    key = ffi.buffer(c_sockaddr, key_size)[:]
+    try:
+        address = _sockaddr_cache.pop(key)
+    except KeyError:
+        c_info = ffi.new('cross_sockaddr_info*')
+        if lib.cross_unpack_sockaddr(c_sockaddr, c_info) != error.StatusCodes.SUCCESS:
+            return None
+        host = ffi.string(c_info.host).decode()
+        if c_info.family == socket.AF_INET:
+            address = Address4(host, c_info.port)
+        else:
+            address = Address6(host, c_info.port, c_info.flowinfo, c_info.scope_id)
+        if len(_sockaddr_cache) >= SOCKADDR_CACHE_SIZE:
+            try:
+                _sockaddr_cache.popitem(last=False)
+            except KeyError:
+                pass
+    _sockaddr_cache[key] = address
+    return address
 
 
 @base.request_callback('uv_getaddrinfo_cb')
@@ -783,6 +813,337 @@ def getnameinfo(ip, port, flags=0, callback=None, loop=None):
     return nameinfo
 
 
+class Resolver(object):
+    """
+    Caching resolver for address and name information. Results of
+    successful lookups are kept for `ttl` milliseconds, failures for
+    `negative_ttl` milliseconds. If more than `size` results are
+    cached the least recently used ones are evicted. Concurrent
+    lookups with the same arguments share a single request.
+
+    Callbacks are always called from within the event loop, even if
+    the result has been taken from the cache. If no callback is
+    provided the lookup is executed synchronously on a cache miss.
+
+    :raises uv.LoopClosedError:
+        loop has already been closed
+
+    :param ttl:
+        time to live of successful lookups (in milliseconds)
+    :param negative_ttl:
+        time to live of failed lookups (in milliseconds)
+    :param size:
+        maximal number of cached results per lookup type
+    :param loop:
+        event loop the resolver should run on
+
+    :type ttl:
+        int
+    :type negative_ttl:
+        int
+    :type size:
+        int
+    :type loop:
+        uv.Loop
+    """
+
+    __slots__ = ['loop', 'ttl', 'negative_ttl', 'size', 'addrinfo_cache',
+                 'nameinfo_cache', 'pending_addrinfo', 'pending_nameinfo',
+                 'ready', 'idle']
+
+    def __init__(self, ttl=60000, negative_ttl=5000, size=1024, loop=None):
+        self.idle = Idle(loop=loop, on_idle=self.on_idle)
+        self.loop = self.idle.loop
+        """
+        Loop the resolver is running on.
+
+        :readonly:
+            True
+        :type:
+            uv.Loop
+        """
+        self.ttl = ttl
+        """
+        Time to live of successful lookups (in milliseconds).
+
+        :readonly:
+            False
+        :type:
+            int
+        """
+        self.negative_ttl = negative_ttl
+        """
+        Time to live of failed lookups (in milliseconds).
+
+        :readonly:
+            False
+        :type:
+            int
+        """
+        self.size = size
+        """
+        Maximal number of cached results per lookup type.
+
+        :readonly:
+            False
+        :type:
+            int
+        """
+        self.addrinfo_cache = collections.OrderedDict()
+        self.nameinfo_cache = collections.OrderedDict()
+        self.pending_addrinfo = {}
+        self.pending_nameinfo = {}
+        self.ready = collections.deque()
+
+    @property
+    def closed(self):
+        """
+        Resolver has been closed.
+
+        :readonly:
+            True
+        :rtype:
+            bool
+        """
+        return self.idle.closing
+
+    def close(self):
+        """
+        Close the resolver and clear its caches. Results of lookups
+        which are still running are nevertheless passed to their
+        callbacks.
+        """
+        self.clear()
+        self.ready.clear()
+        self.idle.close()
+
+    def clear(self):
+        """
+        Clear all cached results.
+        """
+        self.addrinfo_cache.clear()
+        self.nameinfo_cache.clear()
+
+    def getaddrinfo(self, host, port, family=0, socktype=0, protocol=0, flags=0,
+                    callback=None):
+        """
+        Get address information for specified host and port (service).
+
+        See :class:`uv.dns.GetAddrInfo` for parameter descriptions.
+
+        :raises uv.UVError:
+            error while getting address information (synchronous only)
+
+        :type host:
+            unicode
+        :type port:
+            int
+        :type family:
+            uv.AddressFamilies | int
+        :type socktype:
+            uv.SocketTypes | int
+        :type protocol:
+            uv.SocketProtocols | int
+        :type flags:
+            int
+        :type callback:
+            ((uv.dns.Resolver, uv.StatusCodes, list[uv.AddrInfo])
+             -> None) |
+            ((Any, uv.dns.Resolver, uv.StatusCodes, list[uv.AddrInfo])
+             -> None) | None
+
+        :rtype:
+            list[uv.AddrInfo] | None
+        """
+        key = host, port, family, socktype, protocol, flags
+        entry = self.lookup(self.addrinfo_cache, key)
+        if callback is None:
+            if entry is None:
+                try:
+                    addrinfo = getaddrinfo(host, port, family, socktype, protocol,
+                                           flags, loop=self.loop)
+                except error.UVError as exception:
+                    self.store(self.addrinfo_cache, key, exception.code, None)
+                    raise
+                self.store(self.addrinfo_cache, key, error.StatusCodes.SUCCESS,
+                           list(addrinfo))
+                return addrinfo
+            code, addrinfo = entry
+            if code != error.StatusCodes.SUCCESS:
+                raise error.UVError(code)
+            return list(addrinfo)
+        if entry is not None:
+            code, addrinfo = entry
+            self.schedule(callback, (self, code, list(addrinfo or ())))
+        elif key in self.pending_addrinfo:
+            self.pending_addrinfo[key].append(callback)
+        else:
+            GetAddrInfo(host, port, family, socktype, protocol, flags,
+                        callback=self.on_addrinfo, loop=self.loop)
+            self.pending_addrinfo[key] = [callback]
+
+    def getnameinfo(self, ip, port, flags=0, callback=None):
+        """
+        Get name information for specified IP and port.
+
+        See :class:`uv.dns.GetNameInfo` for parameter descriptions.
+
+        :raises uv.UVError:
+            error while getting name information (synchronous only)
+
+        :type ip:
+            unicode
+        :type port:
+            int
+        :type flags:
+            int
+        :type callback:
+            ((uv.dns.Resolver, uv.StatusCodes, unicode, unicode)
+             -> None) |
+            ((Any, uv.dns.Resolver, uv.StatusCodes, unicode, unicode)
+             -> None) | None
+
+        :rtype:
+            uv.NameInfo | None
+        """
+        key = ip, port, flags
+        entry = self.lookup(self.nameinfo_cache, key)
+        if callback is None:
+            if entry is None:
+                try:
+                    nameinfo = getnameinfo(ip, port, flags, loop=self.loop)
+                except error.UVError as exception:
+                    self.store(self.nameinfo_cache, key, exception.code, None)
+                    raise
+                self.store(self.nameinfo_cache, key, error.StatusCodes.SUCCESS, nameinfo)
+                return nameinfo
+            code, nameinfo = entry
+            if code != error.StatusCodes.SUCCESS:
+                raise error.UVError(code)
+            return nameinfo
+        if entry is not None:
+            code, nameinfo = entry
+            hostname, service = nameinfo or (None, None)
+            self.schedule(callback, (self, code, hostname, service))
+        elif key in self.pending_nameinfo:
+            self.pending_nameinfo[key].append(callback)
+        else:
+            GetNameInfo(ip, port, flags, callback=self.on_nameinfo, loop=self.loop)
+            self.pending_nameinfo[key] = [callback]
+
+    def lookup(self, cache, key):
+        """
+        Look up a cached result and mark it as recently used.
+
+        .. warning::
+            This method is only for internal purposes and is not part
+            of the official API. You should never call it directly!
+
+        :rtype:
+            (uv.StatusCodes, Any) | None
+        """
+        try:
+            expires, code, result = cache.pop(key)
+        except KeyError:
+            return None
+        if expires <= self.loop.now:
+            return None
+        cache[key] = expires, code, result
+        return code, result
+
+    def store(self, cache, key, code, result):
+        """
+        Cache the result of a lookup and evict the least recently used
+        results if the cache is full.
+
+        .. warning::
+            This method is only for internal purposes and is not part
+            of the official API. You should never call it directly!
+        """
+        if code in (error.StatusCodes.ECANCELED, error.StatusCodes.EAI_CANCELED):
+            return
+        ttl = self.ttl if code == error.StatusCodes.SUCCESS else self.negative_ttl
+        if ttl <= 0 or self.size <= 0:
+            return
+        cache.pop(key, None)
+        while len(cache) >= self.size:
+            cache.popitem(last=False)
+        cache[key] = self.loop.now + ttl, code, result
+
+    def schedule(self, callback, arguments):
+        """
+        Schedule a callback to run on the next loop iteration.
+
+        .. warning::
+            This method is only for internal purposes and is not part
+            of the official API. You should never call it directly!
+        """
+        if self.closed:
+            raise error.ClosedHandleError()
+        self.ready.append((callback, arguments))
+        self.idle.start()
+
+    def dispatch(self, callbacks, arguments):
+        """
+        Pass the result of a lookup to all waiting callbacks.
+
+        .. warning::
+            This method is only for internal purposes and is not part
+            of the official API. You should never call it directly!
+        """
+        for callback in callbacks:
+            try:
+                callback(*arguments)
+            except Exception:
+                self.loop.handle_exception()
+
+    def on_addrinfo(self, addrinfo_request, code, addrinfo):
+        """
+        Called after address information has been fetched.
+
+        .. warning::
+            This method is only for internal purposes and is not part
+            of the official API. You should never call it directly!
+        """
+        hints = addrinfo_request.hints
+        key = (addrinfo_request.host, addrinfo_request.port, hints.family,
+               hints.socktype, hints.protocol, addrinfo_request.flags)
+        if not self.closed:
+            self.store(self.addrinfo_cache, key, code,
+                       list(addrinfo) if code == error.StatusCodes.SUCCESS else None)
+        self.dispatch(self.pending_addrinfo.pop(key), (self, code, addrinfo))
+
+    def on_nameinfo(self, nameinfo_request, code, hostname, service):
+        """
+        Called after name information has been fetched.
+
+        .. warning::
+            This method is only for internal purposes and is not part
+            of the official API. You should never call it directly!
+        """
+        key = nameinfo_request.ip, nameinfo_request.port, nameinfo_request.flags
+        if not self.closed:
+            nameinfo = NameInfo(hostname, service)
+            self.store(self.nameinfo_cache, key, code,
+                       nameinfo if code == error.StatusCodes.SUCCESS else None)
+        self.dispatch(self.pending_nameinfo.pop(key), (self, code, hostname, service))
+
+    def on_idle(self, idle):
+        """
+        Called once per loop iteration while cached results are waiting
+        to be passed to their callbacks.
+
+        .. warning::
+            This method is only for internal purposes and is not part
+            of the official API. You should never call it directly!
+        """
+        for _ in range(len(self.ready)):
+            callback, arguments = self.ready.popleft()
+            self.dispatch((callback,), arguments)
+        if not self.ready:
+            self.idle.stop()
+
+
 def make_c_sockaddr(ip, port, flowinfo=0, scope_id=0):
     """
     Create a C sockaddr struct form the given information.
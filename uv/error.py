@@ -619,10 +619,7 @@ class StatusCodes(common.Enumeration):
         if not code:
             # for performance
             return StatusCodes.SUCCESS
-        try:
-            return StatusCodes(code)
-        except ValueError:
-            return code
+        return cls._value2member_map_.get(code, code)
 
     @classmethod
     def from_error_number(cls, error_number):
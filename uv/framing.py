@@ -0,0 +1,379 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2016, Maximilian Köhl <mail@koehlma.de>
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License version 3 as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along
+# with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Splitting of stream data into frames.
+
+A :class:`FrameReader` reads from a stream into a receive buffer and
+uses a splitter to find complete frames within it. Data is appended to
+the buffer and only scanned once, frames are delivered as memoryviews
+into the buffer without copying them.
+"""
+
+from __future__ import print_function, unicode_literals, division, absolute_import
+
+import struct
+
+from . import common, error
+
+__all__ = ['DelimiterSplitter', 'FixedLengthSplitter', 'LengthPrefixSplitter',
+           'FrameReader']
+
+
+class Splitter(object):
+    """
+    Base class of all splitters. Splitters are stateless and might be
+    shared between multiple frame readers.
+    """
+
+    def split(self, buffer, start, scanned):
+        """
+        Find the next complete frame in the buffer.
+
+        :param buffer:
+            receive buffer
+        :param start:
+            position in the buffer where the next frame starts
+        :param scanned:
+            position up to which the buffer has already been scanned
+            without finding a complete frame
+
+        :type buffer:
+            bytearray
+        :type start:
+            int
+        :type scanned:
+            int
+
+        :returns:
+            start and end of the frame's payload and start of the next
+            frame or `None` if there is no complete frame
+        :rtype:
+            (int, int, int) | None
+        """
+        raise NotImplementedError()
+
+    def frame_length(self, buffer, start):
+        """
+        Get the length of the incomplete frame starting at the given
+        position as far as it is known by now.
+
+        :type buffer:
+            bytearray
+        :type start:
+            int
+
+        :rtype:
+            int
+        """
+        return len(buffer) - start
+
+
+class DelimiterSplitter(Splitter):
+    """
+    Splits data at a delimiter, e.g. at line breaks.
+
+    :param delimiter:
+        delimiter between frames
+    :param include_delimiter:
+        include the delimiter into the frames
+
+    :type delimiter:
+        bytes
+    :type include_delimiter:
+        bool
+    """
+
+    def __init__(self, delimiter=b'\n', include_delimiter=False):
+        if not delimiter:
+            raise ValueError('delimiter must not be empty')
+        self.delimiter = delimiter
+        self.include_delimiter = include_delimiter
+
+    def split(self, buffer, start, scanned):
+        # a delimiter might have been split between the last two reads
+        offset = max(start, scanned - len(self.delimiter) + 1)
+        index = buffer.find(self.delimiter, offset)
+        if index < 0:
+            return None
+        end = index + len(self.delimiter)
+        return start, end if self.include_delimiter else index, end
+
+
+class FixedLengthSplitter(Splitter):
+    """
+    Splits data into frames of a fixed length.
+
+    :param length:
+        length of the frames
+
+    :type length:
+        int
+    """
+
+    def __init__(self, length):
+        if length < 1:
+            raise ValueError('frame length must be positive')
+        self.length = length
+
+    def split(self, buffer, start, scanned):
+        end = start + self.length
+        if len(buffer) < end:
+            return None
+        return start, end, end
+
+    def frame_length(self, buffer, start):
+        return self.length
+
+
+class LengthPrefixSplitter(Splitter):
+    """
+    Splits data into frames which are prefixed with the length of their
+    payload. The prefix is not part of the delivered frames.
+
+    :param size:
+        size of the length prefix in bytes (1, 2, 4 or 8)
+    :param byteorder:
+        byte order of the length prefix (`'big'` or `'little'`)
+
+    :type size:
+        int
+    :type byteorder:
+        unicode
+    """
+
+    formats = {1: 'B', 2: 'H', 4: 'I', 8: 'Q'}
+    byteorders = {'big': '>', 'little': '<'}
+
+    def __init__(self, size=4, byteorder='big'):
+        if size not in self.formats:
+            raise ValueError('invalid length prefix size: %r' % size)
+        if byteorder not in self.byteorders:
+            raise ValueError('invalid byte order: %r' % byteorder)
+        self.size = size
+        self.byteorder = byteorder
+        self.prefix = struct.Struct(str(self.byteorders[byteorder] + self.formats[size]))
+
+    def split(self, buffer, start, scanned):
+        payload = start + self.size
+        if len(buffer) < payload:
+            return None
+        end = payload + self.prefix.unpack_from(buffer, start)[0]
+        if len(buffer) < end:
+            return None
+        return payload, end, end
+
+    def frame_length(self, buffer, start):
+        if len(buffer) - start < self.size:
+            return len(buffer) - start
+        return self.size + self.prefix.unpack_from(buffer, start)[0]
+
+    def encode(self, payload):
+        """
+        Prefix the payload with its length. The payload is not copied,
+        the returned buffers may directly be passed to
+        :func:`uv.UVStream.write`.
+
+        :type payload:
+            bytes | bytearray | memoryview
+
+        :rtype:
+            list[bytes | bytearray | memoryview]
+        """
+        return [self.prefix.pack(len(payload)), payload]
+
+
+class FrameReader(object):
+    """
+    Reads frames from a stream. The reader starts reading from the
+    stream immediately.
+
+    Frames are delivered as memoryviews into the receive buffer. After
+    frames have been consumed the remaining data is moved into a fresh
+    buffer, therefore delivered frames stay valid and are never copied.
+
+    If the incomplete frame at the start of the buffer gets larger than
+    `max_frame` bytes, reading is paused and the frame callback is called
+    with :attr:`uv.StatusCodes.ENOBUFS`. Reading is resumed with
+    :func:`uv.framing.FrameReader.resume`, for example after raising the
+    limit, otherwise the stream should be closed.
+
+    :raises uv.ClosedHandleError:
+        stream has already been closed or is closing
+
+    :param stream:
+        stream to read frames from
+    :param splitter:
+        splitter which finds the frames
+    :param on_frame:
+        callback which should run after a frame has been received or on
+        error
+    :param max_frame:
+        maximal length of a frame (in bytes, including prefixes and
+        delimiters)
+
+    :type stream:
+        uv.UVStream
+    :type splitter:
+        uv.framing.Splitter
+    :type on_frame:
+        ((uv.framing.FrameReader, uv.StatusCodes, memoryview | None) -> None) |
+        ((Any, uv.framing.FrameReader, uv.StatusCodes, memoryview | None) -> None)
+    :type max_frame:
+        int
+    """
+
+    def __init__(self, stream, splitter, on_frame=None, max_frame=2**20):
+        self.stream = stream
+        """
+        Stream frames are read from.
+
+        :readonly:
+            True
+        :type:
+            uv.UVStream
+        """
+        self.splitter = splitter
+        """
+        Splitter which finds the frames. It may be replaced from within
+        the frame callback, e.g. to switch from a header to a body
+        splitter, and applies to the next frame.
+
+        :readonly:
+            False
+        :type:
+            uv.framing.Splitter
+        """
+        self.on_frame = on_frame or common.dummy_callback
+        """
+        Callback which should run after a frame has been received or on
+        error.
+
+
+        .. function:: on_frame(frame_reader, status, frame)
+
+            :param frame_reader:
+                reader the call originates from
+            :param status:
+                status of the stream or :attr:`uv.StatusCodes.ENOBUFS`
+                if the frame is too large
+            :param frame:
+                frame or `None` if the status is not successful
+
+            :type frame_reader:
+                uv.framing.FrameReader
+            :type status:
+                uv.StatusCodes
+            :type frame:
+                memoryview | None
+
+
+        :readonly:
+            False
+        :type:
+            ((uv.framing.FrameReader, uv.StatusCodes, memoryview | None) -> None) |
+            ((Any, uv.framing.FrameReader, uv.StatusCodes, memoryview | None)
+             -> None)
+        """
+        self.max_frame = max_frame
+        """
+        Maximal length of a frame.
+
+        :readonly:
+            False
+        :type:
+            int
+        """
+        self.buffer = bytearray()
+        self.start = 0
+        self.scanned = 0
+        self.paused = False
+        self.stream.read_start(on_read=self._on_read)
+
+    @property
+    def pending(self):
+        """
+        Copy of the incomplete frame's data which has been received so
+        far, e.g. after the end of the stream has been reached.
+
+        :readonly:
+            True
+        :rtype:
+            bytes
+        """
+        return bytes(self.buffer[self.start:])
+
+    def pause(self):
+        """
+        Stop reading from the stream. Frames which are already in the
+        buffer are still delivered.
+        """
+        if not self.paused:
+            self.paused = True
+            self.stream.read_stop()
+
+    def resume(self):
+        """
+        Resume reading from the stream and deliver complete frames from
+        the buffer.
+
+        :raises uv.ClosedHandleError:
+            stream has already been closed or is closing
+        """
+        if self.paused:
+            self.paused = False
+            self.stream.read_start(on_read=self._on_read)
+            self._deliver()
+
+    def _on_read(self, stream, status, data):
+        if status != error.StatusCodes.SUCCESS:
+            self.on_frame(self, status, None)
+            return
+        if data:
+            self.buffer += data
+            self._deliver()
+
+    def _deliver(self):
+        buffer = self.buffer
+        try:
+            while not self.stream.closing:
+                frame = self.splitter.split(buffer, self.start, self.scanned)
+                if frame is None:
+                    self.scanned = len(buffer)
+                    break
+                payload, end, next_start = frame
+                if next_start - self.start > self.max_frame:
+                    self._overflow()
+                    return
+                self.start = self.scanned = next_start
+                self.on_frame(self, error.StatusCodes.SUCCESS,
+                              memoryview(buffer)[payload:end])
+                if self.buffer is not buffer:
+                    # frames have been delivered by a nested call to resume
+                    return
+        finally:
+            # move the incomplete frame into a fresh buffer, frames handed out
+            # as views into the old buffer would prevent it from growing
+            if self.start and self.buffer is buffer:
+                self.buffer = buffer[self.start:]
+                self.scanned -= self.start
+                self.start = 0
+        if self.splitter.frame_length(self.buffer, self.start) > self.max_frame:
+            self._overflow()
+
+    def _overflow(self):
+        if not self.paused and not self.stream.closing:
+            self.pause()
+            self.on_frame(self, error.StatusCodes.ENOBUFS, None)
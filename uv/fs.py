@@ -13,12 +13,23 @@
 # You should have received a copy of the GNU Lesser General Public License along
 # with this program. If not, see <http://www.gnu.org/licenses/>.
 
+"""
+Asynchronous file system operations. All operations run on libuv's
+thread pool and call the given callback with the request, a status code
+and the operation specific results. If no callback is provided the
+operation is executed synchronously, it then raises an exception on
+error and returns the operation specific result directly.
+"""
+
 from __future__ import print_function, unicode_literals, division, absolute_import
 
+import os
+
 from collections import namedtuple
 
-from . import common, error, handle, library, request
+from . import base, common, error, handle, library, request
 from .library import ffi, lib
+from .loop import Loop
 
 Timespec = namedtuple('Timespec', ['sec', 'nsec'])
 
@@ -28,8 +39,6 @@ Stat = namedtuple('Stat', ['dev', 'mode', 'nlink', 'uid', 'gid', 'rdev',
 
 Dirent = namedtuple('Dirent', ['name', 'type'])
 
-requests = set()
-
 
 def unpack_timespec(uv_timespec):
     return Timespec(uv_timespec.tv_sec, uv_timespec.tv_nsec)
@@ -94,115 +103,1133 @@ class DirentType(common.Enumeration):
     BLOCK = lib.UV_DIRENT_BLOCK
 
 
+@base.request_callback('uv_fs_cb')
+def uv_fs_cb(fs_request):
+    """
+    :type fs_request:
+        uv.fs.FSRequest
+    """
+    fs_request.callback(fs_request, *fs_request.postprocess())
+
+
 @request.RequestType.FS
 class FSRequest(request.UVRequest):
-    __slots__ = ['uv_fs', 'data', 'callback']
+    """
+    Request for a file system operation. If no callback is provided the
+    request is executed synchronously.
+
+    .. note::
+        There should be no need to instantiate this class directly,
+        please use the functions of this module instead.
 
-    def __init__(self, data=None, callback=None, loop=None):
-        self.uv_fs = ffi.new('uv_fs_t*')
-        super(FSRequest, self).__init__(self.uv_fs, loop)
+    :raises uv.UVError:
+        error while initializing the request or error of the
+        synchronously executed operation
+
+    :param fs_function:
+        libuv file system function
+    :param arguments:
+        arguments passed to the file system function
+    :param data:
+        data which has to be kept alive while the request is running
+    :param callback:
+        callback which should be called after the operation has been
+        finished or on error
+    :param loop:
+        event loop the request should run on
+
+    :type fs_function:
+        callable
+    :type arguments:
+        tuple
+    :type data:
+        Any
+    :type callback:
+        ((uv.fs.FSRequest, uv.StatusCodes, ...) -> None) |
+        ((Any, uv.fs.FSRequest, uv.StatusCodes, ...) -> None) | None
+    :type loop:
+        uv.Loop
+    """
+
+    __slots__ = ['uv_fs', 'data', 'callback', 'value']
+
+    uv_request_type = 'uv_fs_t*'
+
+    def __init__(self, fs_function, arguments, data=None, callback=None, loop=None):
         self.data = data
         self.callback = callback or common.dummy_callback
-        requests.add(self)
+        """
+        Callback which should be called after the operation has been
+        finished or on error.
+
+
+        .. function:: callback(fs_request, status, *results)
+
+            :param fs_request:
+                request the call originates from
+            :param status:
+                status of the operation
+            :param results:
+                operation specific results
+
+            :type fs_request:
+                uv.fs.FSRequest
+            :type status:
+                uv.StatusCodes
+
+
+        :readonly:
+            False
+        :type:
+            ((uv.fs.FSRequest, uv.StatusCodes, ...) -> None) |
+            ((Any, uv.fs.FSRequest, uv.StatusCodes, ...) -> None)
+        """
+        self.value = None
+        """
+        Result of the synchronously executed operation.
+
+        :readonly:
+            True
+        :type:
+            Any
+        """
+
+        def fs_request_init(uv_loop, uv_fs, *fs_arguments):
+            code = fs_function(uv_loop, uv_fs, *fs_arguments)
+            if code < 0:
+                lib.uv_fs_req_cleanup(uv_fs)
+                return code
+            return error.StatusCodes.SUCCESS
+
+        uv_callback = ffi.NULL if callback is None else uv_fs_cb
+        super(FSRequest, self).__init__(loop, arguments + (uv_callback, ),
+                                        request_init=fs_request_init)
+        self.uv_fs = self.base_request.uv_object
+        if callback is None:
+            results = self.postprocess()
+            base.finalize_request(self)
+            if len(results) > 1:
+                self.value = results[1]
 
     @property
     def result(self):
+        """
+        Raw result of the operation, negative on error.
+
+        :readonly:
+            True
+        :rtype:
+            int
+        """
         return self.uv_fs.result
 
     @property
-    def ptr(self):
-        return self.uv_fs.ptr
+    def status(self):
+        """
+        Status of the operation.
 
-    @property
-    def path(self):
-        return ffi.string(self.uv_fs.path).decode()
+        :readonly:
+            True
+        :rtype:
+            uv.StatusCodes
+        """
+        if self.uv_fs.result < 0:
+            return error.StatusCodes.get(self.uv_fs.result)
+        return error.StatusCodes.SUCCESS
 
     @property
     def fs_type(self):
+        """
+        Type of the file system operation.
+
+        :readonly:
+            True
+        :rtype:
+            uv.fs.FSType
+        """
         return FSType(self.uv_fs.fs_type)
 
-    @property
-    def stat(self):
-        return unpack_stat(self.uv_fs.statbuf)
+    def postprocess(self):
+        """
+        Extract the operation specific results and release the
+        resources allocated by libuv.
+
+        .. warning::
+            This method is only for internal purposes and is not part
+            of the official API. You should never call it directly!
+
+        :return:
+            status followed by the operation specific results
+        :rtype:
+            list
+        """
+        try:
+            return self.fs_type.postprocessor(self)
+        finally:
+            lib.uv_fs_req_cleanup(self.uv_fs)
+            self.data = None
 
 
+@FSType.UNKNOWN
+@FSType.CUSTOM
 @FSType.CLOSE
-def post_close(request):
-    status = error.StatusCodes.get(request.result)
-    return [status]
+@FSType.FTRUNCATE
+@FSType.UTIME
+@FSType.FUTIME
+@FSType.ACCESS
+@FSType.CHMOD
+@FSType.FCHMOD
+@FSType.FSYNC
+@FSType.FDATASYNC
+@FSType.UNLINK
+@FSType.RMDIR
+@FSType.MKDIR
+@FSType.RENAME
+@FSType.LINK
+@FSType.SYMLINK
+@FSType.CHOWN
+@FSType.FCHOWN
+def post_status(fs_request):
+    return [fs_request.status]
+
+
+@FSType.OPEN
+def post_open(fs_request):
+    status = fs_request.status
+    return [status, fs_request.result if status == error.StatusCodes.SUCCESS else None]
+
 
+@FSType.READ
+def post_read(fs_request):
+    status = fs_request.status
+    if status != error.StatusCodes.SUCCESS:
+        return [status, b'']
+    c_buffer, _ = fs_request.data
+    return [status, ffi.buffer(c_buffer, fs_request.result)[:]]
 
 
+@FSType.WRITE
+@FSType.SENDFILE
+def post_transfer(fs_request):
+    status = fs_request.status
+    return [status, fs_request.result if status == error.StatusCodes.SUCCESS else 0]
 
 
 @FSType.STAT
-def post_stat(request):
-    status = error.StatusCodes.get(request.result)
-    return [status, request.stat]
+@FSType.LSTAT
+@FSType.FSTAT
+def post_stat(fs_request):
+    status = fs_request.status
+    if status != error.StatusCodes.SUCCESS:
+        return [status, None]
+    return [status, unpack_stat(fs_request.uv_fs.statbuf)]
 
 
-@ffi.callback('uv_fs_cb')
-def fs_callback(uv_request):
-    fs_request = library.detach(uv_request)
-    """ :type: uv.FSRequest """
-    try:
-        fs_request.callback(fs_request, *fs_request.fs_type.postprocessor(fs_request))
-    except:
-        fs_request.loop.handle_exception()
-    lib.uv_fs_req_cleanup(uv_request)
-    fs_request.set_closed()
+@FSType.MKDTEMP
+def post_mkdtemp(fs_request):
+    status = fs_request.status
+    if status != error.StatusCodes.SUCCESS:
+        return [status, None]
+    return [status, ffi.string(fs_request.uv_fs.path).decode()]
 
 
-def close(fd, callback=None, loop=None):
-    request = FSRequest(None, callback, loop)
-    code = lib.cross_uv_fs_close(request.loop.uv_loop, request.uv_fs, fd, fs_callback)
-    if code != error.StatusCodes.SUCCESS:
-        raise error.UVError(code)
-    return request
+@FSType.SCANDIR
+def post_scandir(fs_request):
+    status = fs_request.status
+    if status != error.StatusCodes.SUCCESS:
+        return [status, []]
+    entries = []
+    uv_dirent = ffi.new('uv_dirent_t*')
+    while lib.uv_fs_scandir_next(fs_request.uv_fs, uv_dirent) == error.StatusCodes.SUCCESS:
+        entries.append(unpack_dirent(uv_dirent))
+    return [status, entries]
 
 
-@FSType.OPEN
-def post_open(request):
-    if request.result < 0: status, fd = error.StatusCodes.get(request.result), None
-    else: status, fd = error.StatusCodes.SUCCESS, request.result
-    return [status, fd]
+@FSType.READLINK
+def post_readlink(fs_request):
+    status = fs_request.status
+    if status != error.StatusCodes.SUCCESS:
+        return [status, None]
+    return [status, ffi.string(ffi.cast('char*', fs_request.uv_fs.ptr)).decode()]
+
+
+def _execute(fs_function, arguments, data=None, callback=None, loop=None):
+    fs_request = FSRequest(fs_function, arguments, data, callback, loop)
+    return fs_request.value if callback is None else fs_request
 
 
 def open(path, flags, mode=0o777, callback=None, loop=None):
     """
+    Open a file and return a file descriptor.
 
     :param path:
+        path of the file
     :param flags:
+        flags to open the file with (see :func:`os.open`)
     :param mode:
-    :param callback: callback signature: `(request, status, fd)`
+        mode to create the file with
+    :param callback:
+        callback with signature `(request, status, fd)`
     :param loop:
+        event loop the request should run on
+
+    :type path:
+        unicode
+    :type flags:
+        int
+    :type mode:
+        int
+    :type callback:
+        ((uv.fs.FSRequest, uv.StatusCodes, int | None) -> None) | None
+    :type loop:
+        uv.Loop
+
+    :rtype:
+        uv.fs.FSRequest | int
+    """
+    return _execute(lib.uv_fs_open, (path.encode(), flags, mode), None, callback, loop)
+
+
+def close(fd, callback=None, loop=None):
+    """
+    Close a file descriptor.
+
+    :param callback:
+        callback with signature `(request, status)`
+
+    :type fd:
+        int
+    :type callback:
+        ((uv.fs.FSRequest, uv.StatusCodes) -> None) | None
+    :type loop:
+        uv.Loop
+
+    :rtype:
+        uv.fs.FSRequest | None
+    """
+    return _execute(lib.cross_uv_fs_close, (fd, ), None, callback, loop)
+
+
+def read(fd, size, offset=-1, callback=None, loop=None):
+    """
+    Read up to `size` bytes from a file descriptor. If `offset` is
+    negative the current file position is used and updated.
+
+    :param callback:
+        callback with signature `(request, status, data)`
+
+    :type fd:
+        int
+    :type size:
+        int
+    :type offset:
+        int
+    :type callback:
+        ((uv.fs.FSRequest, uv.StatusCodes, bytes) -> None) | None
+    :type loop:
+        uv.Loop
+
+    :rtype:
+        uv.fs.FSRequest | bytes
+    """
+    c_buffer = ffi.new('char[]', size)
+    uv_buffer = ffi.new('uv_buf_t*')
+    library.uv_buffer_set(uv_buffer, c_buffer, size)
+    arguments = (fd, uv_buffer, 1, offset)
+    return _execute(lib.cross_uv_fs_read, arguments, (c_buffer, uv_buffer), callback, loop)
+
+
+def write(fd, buffers, offset=-1, callback=None, loop=None, copy=True):
+    """
+    Write data to a file descriptor. If `offset` is negative the
+    current file position is used and updated. See
+    :func:`uv.UVStream.write` for a description of `copy`.
+
+    :param callback:
+        callback with signature `(request, status, written)`
+
+    :type fd:
+        int
+    :type buffers:
+        tuple[bytes] | list[bytes] | bytes | bytearray | memoryview
+    :type offset:
+        int
+    :type callback:
+        ((uv.fs.FSRequest, uv.StatusCodes, int) -> None) | None
+    :type loop:
+        uv.Loop
+    :type copy:
+        bool
+
+    :rtype:
+        uv.fs.FSRequest | int
+    """
+    uv_buffers = library.make_uv_buffers(buffers, copy)
+    arguments = (fd, uv_buffers, len(uv_buffers), offset)
+    return _execute(lib.cross_uv_fs_write, arguments, uv_buffers, callback, loop)
+
+
+def sendfile(out_fd, in_fd, offset, length, callback=None, loop=None):
+    """
+    Copy up to `length` bytes starting at `offset` from one file
+    descriptor to another within the kernel, i.e. without copying the
+    data through user space. The file position of `in_fd` is not
+    modified. Where the platform does not support this, it is emulated
+    with reads and writes on the thread pool.
+
+    .. note::
+        For non-blocking output file descriptors, e.g. sockets managed
+        by libuv, fewer bytes than requested might be transferred and
+        the operation might fail with :class:`uv.StatusCodes.EAGAIN`
+        if the output file descriptor is not writable. Use
+        :func:`uv.UVStream.sendfile` to transfer files to streams.
+
+    :param callback:
+        callback with signature `(request, status, sent)`
 
-    :type path: str
-    :type flags: int
-    :type mode: int
-    :type callback: (FSRequest, int, int) -> None
+    :type out_fd:
+        int
+    :type in_fd:
+        int
+    :type offset:
+        int
+    :type length:
+        int
+    :type callback:
+        ((uv.fs.FSRequest, uv.StatusCodes, int) -> None) | None
+    :type loop:
+        uv.Loop
 
-    :return:
+    :rtype:
+        uv.fs.FSRequest | int
     """
-    fs_request = FSRequest(None, callback, loop)
-    uv_fs = request.uv_fs
-    c_path = path.encode()
-    code = lib.uv_fs_open(fs_request.loop.uv_loop, uv_fs, c_path, flags, mode,
-                          fs_callback)
-    if code != error.StatusCodes.SUCCESS:
-        raise error.UVError(code)
-    return request
+    arguments = (out_fd, in_fd, offset, length)
+    return _execute(lib.cross_uv_fs_sendfile, arguments, None, callback, loop)
+
+
+def unlink(path, callback=None, loop=None):
+    """
+    Remove a file.
+
+    :param callback:
+        callback with signature `(request, status)`
+
+    :type path:
+        unicode
+    :type callback:
+        ((uv.fs.FSRequest, uv.StatusCodes) -> None) | None
+    :type loop:
+        uv.Loop
+
+    :rtype:
+        uv.fs.FSRequest | None
+    """
+    return _execute(lib.uv_fs_unlink, (path.encode(), ), None, callback, loop)
+
+
+def mkdir(path, mode=0o777, callback=None, loop=None):
+    """
+    Create a directory.
+
+    :param callback:
+        callback with signature `(request, status)`
+
+    :type path:
+        unicode
+    :type mode:
+        int
+    :type callback:
+        ((uv.fs.FSRequest, uv.StatusCodes) -> None) | None
+    :type loop:
+        uv.Loop
+
+    :rtype:
+        uv.fs.FSRequest | None
+    """
+    return _execute(lib.uv_fs_mkdir, (path.encode(), mode), None, callback, loop)
+
+
+def mkdtemp(template, callback=None, loop=None):
+    """
+    Create a unique temporary directory. The template has to end with
+    `XXXXXX` which is replaced to make the path unique.
+
+    :param callback:
+        callback with signature `(request, status, path)`
+
+    :type template:
+        unicode
+    :type callback:
+        ((uv.fs.FSRequest, uv.StatusCodes, unicode | None) -> None) | None
+    :type loop:
+        uv.Loop
+
+    :rtype:
+        uv.fs.FSRequest | unicode
+    """
+    return _execute(lib.uv_fs_mkdtemp, (template.encode(), ), None, callback, loop)
+
+
+def rmdir(path, callback=None, loop=None):
+    """
+    Remove an empty directory.
+
+    :param callback:
+        callback with signature `(request, status)`
+
+    :type path:
+        unicode
+    :type callback:
+        ((uv.fs.FSRequest, uv.StatusCodes) -> None) | None
+    :type loop:
+        uv.Loop
+
+    :rtype:
+        uv.fs.FSRequest | None
+    """
+    return _execute(lib.uv_fs_rmdir, (path.encode(), ), None, callback, loop)
+
+
+def scandir(path, callback=None, loop=None):
+    """
+    List the entries of a directory.
+
+    :param callback:
+        callback with signature `(request, status, entries)`
+
+    :type path:
+        unicode
+    :type callback:
+        ((uv.fs.FSRequest, uv.StatusCodes, list[uv.fs.Dirent]) -> None) | None
+    :type loop:
+        uv.Loop
+
+    :rtype:
+        uv.fs.FSRequest | list[uv.fs.Dirent]
+    """
+    return _execute(lib.uv_fs_scandir, (path.encode(), 0), None, callback, loop)
 
 
 def stat(path, callback=None, loop=None):
-    fs_request = FSRequest(callback=callback, loop=loop)
-    code = lib.uv_fs_stat(fs_request.loop.uv_loop, fs_request.uv_fs, path.encode(),
-                          fs_callback)
-    if code != error.StatusCodes.SUCCESS:
-        raise error.UVError(code)
-    return request
+    """
+    Get information about a file.
+
+    :param callback:
+        callback with signature `(request, status, stat)`
+
+    :type path:
+        unicode
+    :type callback:
+        ((uv.fs.FSRequest, uv.StatusCodes, uv.fs.Stat | None) -> None) | None
+    :type loop:
+        uv.Loop
+
+    :rtype:
+        uv.fs.FSRequest | uv.fs.Stat
+    """
+    return _execute(lib.uv_fs_stat, (path.encode(), ), None, callback, loop)
+
+
+def lstat(path, callback=None, loop=None):
+    """
+    Get information about a file without following symbolic links.
+
+    :param callback:
+        callback with signature `(request, status, stat)`
+
+    :type path:
+        unicode
+    :type callback:
+        ((uv.fs.FSRequest, uv.StatusCodes, uv.fs.Stat | None) -> None) | None
+    :type loop:
+        uv.Loop
+
+    :rtype:
+        uv.fs.FSRequest | uv.fs.Stat
+    """
+    return _execute(lib.uv_fs_lstat, (path.encode(), ), None, callback, loop)
+
+
+def fstat(fd, callback=None, loop=None):
+    """
+    Get information about a file descriptor.
+
+    :param callback:
+        callback with signature `(request, status, stat)`
+
+    :type fd:
+        int
+    :type callback:
+        ((uv.fs.FSRequest, uv.StatusCodes, uv.fs.Stat | None) -> None) | None
+    :type loop:
+        uv.Loop
+
+    :rtype:
+        uv.fs.FSRequest | uv.fs.Stat
+    """
+    return _execute(lib.cross_uv_fs_fstat, (fd, ), None, callback, loop)
+
+
+def rename(path, new_path, callback=None, loop=None):
+    """
+    Rename a file or directory.
+
+    :param callback:
+        callback with signature `(request, status)`
+
+    :type path:
+        unicode
+    :type new_path:
+        unicode
+    :type callback:
+        ((uv.fs.FSRequest, uv.StatusCodes) -> None) | None
+    :type loop:
+        uv.Loop
+
+    :rtype:
+        uv.fs.FSRequest | None
+    """
+    arguments = (path.encode(), new_path.encode())
+    return _execute(lib.uv_fs_rename, arguments, None, callback, loop)
+
+
+def fsync(fd, callback=None, loop=None):
+    """
+    Flush all data and metadata of a file descriptor to disk.
+
+    :param callback:
+        callback with signature `(request, status)`
+
+    :type fd:
+        int
+    :type callback:
+        ((uv.fs.FSRequest, uv.StatusCodes) -> None) | None
+    :type loop:
+        uv.Loop
+
+    :rtype:
+        uv.fs.FSRequest | None
+    """
+    return _execute(lib.cross_uv_fs_fsync, (fd, ), None, callback, loop)
+
+
+def fdatasync(fd, callback=None, loop=None):
+    """
+    Flush all data of a file descriptor to disk.
+
+    :param callback:
+        callback with signature `(request, status)`
+
+    :type fd:
+        int
+    :type callback:
+        ((uv.fs.FSRequest, uv.StatusCodes) -> None) | None
+    :type loop:
+        uv.Loop
+
+    :rtype:
+        uv.fs.FSRequest | None
+    """
+    return _execute(lib.cross_uv_fs_fdatasync, (fd, ), None, callback, loop)
+
+
+def ftruncate(fd, length=0, callback=None, loop=None):
+    """
+    Truncate a file descriptor to the given length.
+
+    :param callback:
+        callback with signature `(request, status)`
+
+    :type fd:
+        int
+    :type length:
+        int
+    :type callback:
+        ((uv.fs.FSRequest, uv.StatusCodes) -> None) | None
+    :type loop:
+        uv.Loop
+
+    :rtype:
+        uv.fs.FSRequest | None
+    """
+    return _execute(lib.cross_uv_fs_ftruncate, (fd, length), None, callback, loop)
+
+
+def access(path, mode, callback=None, loop=None):
+    """
+    Check the access permissions of a file (see :func:`os.access`).
+
+    :param callback:
+        callback with signature `(request, status)`
+
+    :type path:
+        unicode
+    :type mode:
+        int
+    :type callback:
+        ((uv.fs.FSRequest, uv.StatusCodes) -> None) | None
+    :type loop:
+        uv.Loop
+
+    :rtype:
+        uv.fs.FSRequest | None
+    """
+    return _execute(lib.uv_fs_access, (path.encode(), mode), None, callback, loop)
+
+
+def chmod(path, mode, callback=None, loop=None):
+    """
+    Change the permissions of a file.
+
+    :param callback:
+        callback with signature `(request, status)`
+
+    :type path:
+        unicode
+    :type mode:
+        int
+    :type callback:
+        ((uv.fs.FSRequest, uv.StatusCodes) -> None) | None
+    :type loop:
+        uv.Loop
+
+    :rtype:
+        uv.fs.FSRequest | None
+    """
+    return _execute(lib.uv_fs_chmod, (path.encode(), mode), None, callback, loop)
+
+
+def fchmod(fd, mode, callback=None, loop=None):
+    """
+    Change the permissions of a file descriptor.
+
+    :param callback:
+        callback with signature `(request, status)`
+
+    :type fd:
+        int
+    :type mode:
+        int
+    :type callback:
+        ((uv.fs.FSRequest, uv.StatusCodes) -> None) | None
+    :type loop:
+        uv.Loop
+
+    :rtype:
+        uv.fs.FSRequest | None
+    """
+    return _execute(lib.cross_uv_fs_fchmod, (fd, mode), None, callback, loop)
+
+
+def utime(path, atime, mtime, callback=None, loop=None):
+    """
+    Change the access and modification time of a file.
+
+    :param callback:
+        callback with signature `(request, status)`
+
+    :type path:
+        unicode
+    :type atime:
+        float
+    :type mtime:
+        float
+    :type callback:
+        ((uv.fs.FSRequest, uv.StatusCodes) -> None) | None
+    :type loop:
+        uv.Loop
+
+    :rtype:
+        uv.fs.FSRequest | None
+    """
+    return _execute(lib.uv_fs_utime, (path.encode(), atime, mtime), None, callback, loop)
+
+
+def futime(fd, atime, mtime, callback=None, loop=None):
+    """
+    Change the access and modification time of a file descriptor.
+
+    :param callback:
+        callback with signature `(request, status)`
+
+    :type fd:
+        int
+    :type atime:
+        float
+    :type mtime:
+        float
+    :type callback:
+        ((uv.fs.FSRequest, uv.StatusCodes) -> None) | None
+    :type loop:
+        uv.Loop
+
+    :rtype:
+        uv.fs.FSRequest | None
+    """
+    return _execute(lib.cross_uv_fs_futime, (fd, atime, mtime), None, callback, loop)
+
+
+def link(path, new_path, callback=None, loop=None):
+    """
+    Create a hard link.
+
+    :param callback:
+        callback with signature `(request, status)`
+
+    :type path:
+        unicode
+    :type new_path:
+        unicode
+    :type callback:
+        ((uv.fs.FSRequest, uv.StatusCodes) -> None) | None
+    :type loop:
+        uv.Loop
+
+    :rtype:
+        uv.fs.FSRequest | None
+    """
+    arguments = (path.encode(), new_path.encode())
+    return _execute(lib.uv_fs_link, arguments, None, callback, loop)
+
+
+def symlink(path, new_path, flags=0, callback=None, loop=None):
+    """
+    Create a symbolic link.
+
+    :param callback:
+        callback with signature `(request, status)`
+
+    :type path:
+        unicode
+    :type new_path:
+        unicode
+    :type flags:
+        int
+    :type callback:
+        ((uv.fs.FSRequest, uv.StatusCodes) -> None) | None
+    :type loop:
+        uv.Loop
+
+    :rtype:
+        uv.fs.FSRequest | None
+    """
+    arguments = (path.encode(), new_path.encode(), flags)
+    return _execute(lib.uv_fs_symlink, arguments, None, callback, loop)
+
+
+def readlink(path, callback=None, loop=None):
+    """
+    Read the target of a symbolic link.
+
+    :param callback:
+        callback with signature `(request, status, target)`
+
+    :type path:
+        unicode
+    :type callback:
+        ((uv.fs.FSRequest, uv.StatusCodes, unicode | None) -> None) | None
+    :type loop:
+        uv.Loop
+
+    :rtype:
+        uv.fs.FSRequest | unicode
+    """
+    return _execute(lib.uv_fs_readlink, (path.encode(), ), None, callback, loop)
+
+
+def chown(path, uid, gid, callback=None, loop=None):
+    """
+    Change the owner and group of a file.
+
+    :param callback:
+        callback with signature `(request, status)`
+
+    :type path:
+        unicode
+    :type uid:
+        int
+    :type gid:
+        int
+    :type callback:
+        ((uv.fs.FSRequest, uv.StatusCodes) -> None) | None
+    :type loop:
+        uv.Loop
+
+    :rtype:
+        uv.fs.FSRequest | None
+    """
+    return _execute(lib.cross_uv_fs_chown, (path.encode(), uid, gid), None, callback, loop)
+
+
+def fchown(fd, uid, gid, callback=None, loop=None):
+    """
+    Change the owner and group of a file descriptor.
+
+    :param callback:
+        callback with signature `(request, status)`
+
+    :type fd:
+        int
+    :type uid:
+        int
+    :type gid:
+        int
+    :type callback:
+        ((uv.fs.FSRequest, uv.StatusCodes) -> None) | None
+    :type loop:
+        uv.Loop
+
+    :rtype:
+        uv.fs.FSRequest | None
+    """
+    return _execute(lib.cross_uv_fs_fchown, (fd, uid, gid), None, callback, loop)
 
 
 @handle.HandleTypes.FILE
 class File(object):
-    pass
+    """
+    File object wrapping a file descriptor. All operations run on
+    libuv's thread pool and follow the conventions of the functions
+    of this module, i.e. they are executed synchronously if no callback
+    is provided.
+
+    :param fd:
+        file descriptor
+    :param loop:
+        event loop the operations should run on
+
+    :type fd:
+        int
+    :type loop:
+        uv.Loop
+    """
+
+    __slots__ = ['__weakref__', 'fd', 'loop', 'closed']
+
+    def __init__(self, fd, loop=None):
+        self.fd = fd
+        """
+        Underlying file descriptor.
+
+        :readonly:
+            True
+        :type:
+            int
+        """
+        self.loop = loop or Loop.get_current()
+        """
+        Loop the operations are running on.
+
+        :readonly:
+            True
+        :type:
+            uv.Loop
+        """
+        self.closed = False
+        """
+        File has been closed or is closing.
+
+        :readonly:
+            True
+        :type:
+            bool
+        """
+
+    def __repr__(self):
+        return '<File fd={} closed={}>'.format(self.fd, self.closed)
+
+    @classmethod
+    def open(cls, path, flags=os.O_RDONLY, mode=0o666, callback=None, loop=None):
+        """
+        Open a file.
+
+        :raises uv.UVError:
+            error while opening the file (only if executed synchronously)
+
+        :param path:
+            path of the file
+        :param flags:
+            flags to open the file with (see :func:`os.open`)
+        :param mode:
+            mode to create the file with
+        :param callback:
+            callback with signature `(request, status, file)`
+        :param loop:
+            event loop the file should use
+
+        :type path:
+            unicode
+        :type flags:
+            int
+        :type mode:
+            int
+        :type callback:
+            ((uv.fs.FSRequest, uv.StatusCodes, uv.fs.File | None) -> None) | None
+        :type loop:
+            uv.Loop
+
+        :rtype:
+            uv.fs.FSRequest | uv.fs.File
+        """
+        loop = loop or Loop.get_current()
+        if callback is None:
+            return cls(open(path, flags, mode, loop=loop), loop)
+
+        def on_open(fs_request, status, fd):
+            callback(fs_request, status, None if fd is None else cls(fd, loop))
+
+        return open(path, flags, mode, on_open, loop)
+
+    def fileno(self):
+        """
+        Underlying file descriptor.
+
+        :raises uv.ClosedStructureError:
+            file has already been closed or is closing
+
+        :rtype:
+            int
+        """
+        if self.closed:
+            raise error.ClosedStructureError()
+        return self.fd
+
+    def read(self, size, offset=-1, callback=None):
+        """
+        Read up to `size` bytes. If `offset` is negative the current
+        file position is used and updated.
+
+        :raises uv.ClosedStructureError:
+            file has already been closed or is closing
+
+        :param callback:
+            callback with signature `(request, status, data)`
+
+        :type size:
+            int
+        :type offset:
+            int
+        :type callback:
+            ((uv.fs.FSRequest, uv.StatusCodes, bytes) -> None) | None
+
+        :rtype:
+            uv.fs.FSRequest | bytes
+        """
+        return read(self.fileno(), size, offset, callback, self.loop)
+
+    def write(self, buffers, offset=-1, callback=None, copy=True):
+        """
+        Write data. If `offset` is negative the current file position
+        is used and updated.
+
+        :raises uv.ClosedStructureError:
+            file has already been closed or is closing
+
+        :param callback:
+            callback with signature `(request, status, written)`
+
+        :type buffers:
+            tuple[bytes] | list[bytes] | bytes | bytearray | memoryview
+        :type offset:
+            int
+        :type callback:
+            ((uv.fs.FSRequest, uv.StatusCodes, int) -> None) | None
+        :type copy:
+            bool
+
+        :rtype:
+            uv.fs.FSRequest | int
+        """
+        return write(self.fileno(), buffers, offset, callback, self.loop, copy)
+
+    def stat(self, callback=None):
+        """
+        Get information about the file.
+
+        :raises uv.ClosedStructureError:
+            file has already been closed or is closing
+
+        :param callback:
+            callback with signature `(request, status, stat)`
+
+        :type callback:
+            ((uv.fs.FSRequest, uv.StatusCodes, uv.fs.Stat | None) -> None) | None
+
+        :rtype:
+            uv.fs.FSRequest | uv.fs.Stat
+        """
+        return fstat(self.fileno(), callback, self.loop)
+
+    def fsync(self, callback=None):
+        """
+        Flush all data and metadata of the file to disk.
+
+        :raises uv.ClosedStructureError:
+            file has already been closed or is closing
+
+        :param callback:
+            callback with signature `(request, status)`
+
+        :type callback:
+            ((uv.fs.FSRequest, uv.StatusCodes) -> None) | None
+
+        :rtype:
+            uv.fs.FSRequest | None
+        """
+        return fsync(self.fileno(), callback, self.loop)
+
+    def fdatasync(self, callback=None):
+        """
+        Flush all data of the file to disk.
+
+        :raises uv.ClosedStructureError:
+            file has already been closed or is closing
+
+        :param callback:
+            callback with signature `(request, status)`
+
+        :type callback:
+            ((uv.fs.FSRequest, uv.StatusCodes) -> None) | None
+
+        :rtype:
+            uv.fs.FSRequest | None
+        """
+        return fdatasync(self.fileno(), callback, self.loop)
+
+    def truncate(self, length=0, callback=None):
+        """
+        Truncate the file to the given length.
+
+        :raises uv.ClosedStructureError:
+            file has already been closed or is closing
+
+        :param callback:
+            callback with signature `(request, status)`
+
+        :type length:
+            int
+        :type callback:
+            ((uv.fs.FSRequest, uv.StatusCodes) -> None) | None
+
+        :rtype:
+            uv.fs.FSRequest | None
+        """
+        return ftruncate(self.fileno(), length, callback, self.loop)
+
+    def close(self, callback=None):
+        """
+        Close the file. Closing an already closed file does nothing.
+
+        :param callback:
+            callback with signature `(request, status)`
+
+        :type callback:
+            ((uv.fs.FSRequest, uv.StatusCodes) -> None) | None
+
+        :rtype:
+            uv.fs.FSRequest | None
+        """
+        if self.closed:
+            return None
+        self.closed = True
+        return close(self.fd, callback, self.loop)
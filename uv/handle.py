@@ -86,11 +86,17 @@ class UVHandle(object):
         loop where the handle should run on
     :param arguments:
         arguments passed to the libuv handle init function
+    :param lightweight:
+        use a single combined object for the internal low level handle
+        and the weak reference to this handle (see
+        :class:`uv.base.HandleReference`)
 
     :type loop:
         uv.Loop
     :type arguments:
         tuple
+    :type lightweight:
+        bool
     """
 
     __slots__ = ['__weakref__', 'loop', 'base_handle', 'uv_handle',
@@ -99,14 +105,15 @@ class UVHandle(object):
     uv_handle_type = None
     uv_handle_init = None
 
-    def __init__(self, loop, arguments=()):
+    def __init__(self, loop, arguments=(), lightweight=False):
         self.loop = loop or Loop.get_current()
         if self.loop.closed:
             raise error.ClosedLoopError()
 
-        self.base_handle = base.BaseHandle(self, self.loop.base_loop,
-                                           self.__class__.uv_handle_type,
-                                           self.__class__.uv_handle_init, arguments)
+        base_class = base.HandleReference if lightweight else base.BaseHandle
+        self.base_handle = base_class(self, self.loop.base_loop,
+                                      self.__class__.uv_handle_type,
+                                      self.__class__.uv_handle_init, arguments)
 
         self.uv_handle = self.base_handle.uv_handle
 
@@ -15,9 +15,13 @@
 
 from __future__ import absolute_import, division, print_function, unicode_literals
 
-from .. import abstract, base, common, error, handle, library, request
+import os
+
+from .. import abstract, base, common, error, fs, handle, library, request
 from ..library import ffi, lib
 
+from . import poll
+
 
 @base.request_callback('uv_shutdown_cb')
 def uv_shutdown_cb(shutdown_request, status):
@@ -57,6 +61,7 @@ class ShutdownRequest(request.UVRequest):
 
     uv_request_type = 'uv_shutdown_t*'
     uv_request_init = lib.uv_shutdown
+    uv_request_recycle = True
 
     def __init__(self, stream, on_shutdown=None):
         if stream.closing:
@@ -106,6 +111,8 @@ def uv_write_cb(write_request, status):
     :type status:
         int
     """
+    write_request.stream.check_write_queue()
+    write_request.stream.check_drained()
     write_request.on_write(write_request, error.StatusCodes.get(status))
 
 
@@ -129,26 +136,32 @@ class WriteRequest(request.UVRequest):
         stream handle which should be send
     :param on_write:
         callback which should run after all data has been written
+    :param copy:
+        copy the data or write directly from the given buffers (see
+        :func:`uv.UVStream.write`)
 
     :type stream:
         uv.UVStream
     :type buffers:
-        tuple[bytes] | list[bytes] | bytes
+        tuple[bytes] | list[bytes] | bytes | bytearray | memoryview
     :type send_stream:
         uv.TCP | uv.Pipe | None
     :type on_write:
         ((uv.WriteRequest, uv.StatusCodes) -> None) |
         ((Any, uv.WriteRequest, uv.StatusCodes) -> None)
+    :type copy:
+        bool
     """
 
     __slots__ = ['uv_buffers', 'stream', 'send_stream', 'on_write']
 
     uv_request_type = 'uv_write_t*'
+    uv_request_recycle = True
 
-    def __init__(self, stream, buffers, send_stream=None, on_write=None):
+    def __init__(self, stream, buffers, send_stream=None, on_write=None, copy=True):
         if stream.closing:
             raise error.ClosedHandleError()
-        self.uv_buffers = library.make_uv_buffers(buffers)
+        self.uv_buffers = library.make_uv_buffers(buffers, copy)
         self.stream = stream
         """
         Stream to write data to.
@@ -199,6 +212,7 @@ class WriteRequest(request.UVRequest):
             arguments = self.uv_buffers, amount, self.send_stream.uv_stream, uv_write_cb
             init = lib.uv_write2
         super(WriteRequest, self).__init__(stream.loop, arguments, stream.uv_stream, init)
+        stream.check_write_queue()
 
 
 @base.request_callback('uv_connect_cb')
@@ -300,7 +314,7 @@ def uv_read_cb(stream_handle, length, uv_buffer):
     :type uv_buffer:
         ffi.CData[uv_buf_t*]
     """
-    data = stream_handle.loop.allocator.finalize(stream_handle, length, uv_buffer)
+    data = stream_handle.allocator.finalize(stream_handle, length, uv_buffer)
     if length < 0:  # pragma: no cover
         status = error.StatusCodes.get(length)
         data = b''
@@ -309,6 +323,329 @@ def uv_read_cb(stream_handle, length, uv_buffer):
     stream_handle.on_read(stream_handle, status, data)
 
 
+class FileTransfer(object):
+    """
+    Transfer of a file to a stream with :func:`uv.fs.sendfile`, i.e.
+    the data is copied within the kernel and never passes through user
+    space. Large transfers are split into chunks and the progress is
+    reported after each chunk. Data written to the stream during the
+    transfer is queued like on a corked stream and written after the
+    transfer has finished, data written before is written first.
+
+    Nothing else is written to the stream while the file is sent.
+    Flushes, writes which send a stream, shutdowns and further
+    transfers are deferred until the transfer has finished, closing
+    the stream cancels the transfer after the current chunk.
+
+    .. note::
+        There should be no need to instantiate this class directly,
+        please use :func:`uv.UVStream.sendfile` instead.
+
+    :param stream:
+        stream the file should be sent to
+    :param fd:
+        file descriptor of the file which should be sent
+    :param offset:
+        offset of the first byte which should be sent
+    :param count:
+        amount of bytes which should be sent
+    :param chunk_size:
+        maximal amount of bytes sent at once
+    :param on_progress:
+        callback which should run after each transferred chunk
+    :param on_sendfile:
+        callback which should run after the transfer has finished or
+        on error
+
+    :type stream:
+        uv.UVStream
+    :type fd:
+        int
+    :type offset:
+        int
+    :type count:
+        int
+    :type chunk_size:
+        int
+    :type on_progress:
+        ((uv.FileTransfer, int, int) -> None) |
+        ((Any, uv.FileTransfer, int, int) -> None)
+    :type on_sendfile:
+        ((uv.FileTransfer, uv.StatusCodes) -> None) |
+        ((Any, uv.FileTransfer, uv.StatusCodes) -> None)
+    """
+
+    __slots__ = ['stream', 'fd', 'offset', 'count', 'sent', 'chunk_size', 'on_progress',
+                 'on_sendfile', 'finished', 'was_corked', 'was_auto_flush', 'sending',
+                 'deferred', 'poll', 'poll_fd']
+
+    def __init__(self, stream, fd, offset, count, chunk_size=2**20, on_progress=None,
+                 on_sendfile=None):
+        if stream.closing:
+            raise error.ClosedHandleError()
+        self.stream = stream
+        """
+        Stream the file is sent to.
+
+        :readonly:
+            True
+        :type:
+            uv.UVStream
+        """
+        self.fd = fd
+        """
+        File descriptor of the file which is sent.
+
+        :readonly:
+            True
+        :type:
+            int
+        """
+        self.offset = offset
+        """
+        Offset of the first byte which is sent.
+
+        :readonly:
+            True
+        :type:
+            int
+        """
+        self.count = count
+        """
+        Amount of bytes which should be sent.
+
+        :readonly:
+            True
+        :type:
+            int
+        """
+        self.sent = 0
+        """
+        Amount of bytes which have already been sent.
+
+        :readonly:
+            True
+        :type:
+            int
+        """
+        self.chunk_size = chunk_size
+        self.on_progress = on_progress or common.dummy_callback
+        """
+        Callback which should run after each transferred chunk.
+
+
+        .. function:: on_progress(file_transfer, sent, count)
+
+            :param file_transfer:
+                transfer the call originates from
+            :param sent:
+                amount of bytes which have already been sent
+            :param count:
+                amount of bytes which should be sent
+
+            :type file_transfer:
+                uv.FileTransfer
+            :type sent:
+                int
+            :type count:
+                int
+
+
+        :readonly:
+            False
+        :type:
+            ((uv.FileTransfer, int, int) -> None) |
+            ((Any, uv.FileTransfer, int, int) -> None)
+        """
+        self.on_sendfile = on_sendfile or common.dummy_callback
+        """
+        Callback which should run after the transfer has finished or on
+        error. The status is :class:`uv.StatusCodes.EOF` if the file
+        ended before all bytes have been sent.
+
+
+        .. function:: on_sendfile(file_transfer, status)
+
+            :param file_transfer:
+                transfer the call originates from
+            :param status:
+                status of the transfer
+
+            :type file_transfer:
+                uv.FileTransfer
+            :type status:
+                uv.StatusCodes
+
+
+        :readonly:
+            False
+        :type:
+            ((uv.FileTransfer, uv.StatusCodes) -> None) |
+            ((Any, uv.FileTransfer, uv.StatusCodes) -> None)
+        """
+        self.finished = False
+        """
+        Transfer has finished.
+
+        :readonly:
+            True
+        :type:
+            bool
+        """
+        self.was_corked = False
+        self.was_auto_flush = False
+        self.sending = False
+        self.deferred = []
+        self.poll = None
+        self.poll_fd = None
+        self.start()
+
+    def start(self):
+        """
+        Start the transfer or defer it until the stream's current
+        transfer has finished.
+
+        .. warning::
+            This method is only for internal purposes and is not part
+            of the official API. You should never call it directly!
+        """
+        stream = self.stream
+        if stream.file_transfer is not None:
+            stream.file_transfer.defer(self.start)
+            return
+        if stream.corked_buffers and not stream.closing:
+            stream.flush()
+        self.was_corked, self.was_auto_flush = stream.corked, stream.auto_flush
+        # an auto flush in the prepare phase would interleave with the file
+        stream.corked, stream.auto_flush = True, False
+        stream.file_transfer = self
+        stream.wait_drained(self._send_chunk)
+
+    def defer(self, operation, *arguments):
+        """
+        Call the operation after the transfer has finished. Data queued
+        on the stream so far is written before.
+
+        .. warning::
+            This method is only for internal purposes and is not part
+            of the official API. You should never call it directly!
+
+        :type operation:
+            callable | None
+        :type arguments:
+            tuple
+        """
+        stream = self.stream
+        buffers, callbacks = stream.corked_buffers, stream.corked_callbacks
+        stream.corked_buffers, stream.corked_callbacks = (), ()
+        self.deferred.append((buffers, callbacks, operation, arguments))
+
+    def cancel(self):
+        """
+        Cancel the transfer and close the stream. If a chunk is being
+        sent the stream is closed after the chunk has returned.
+
+        .. warning::
+            This method is only for internal purposes and is not part
+            of the official API. You should never call it directly!
+        """
+        self.stream.close_deferred = True
+        if not self.sending:
+            self._finish(error.StatusCodes.ECANCELED)
+
+    def _send_chunk(self, _=None):
+        if self.stream.closing:
+            self._finish(error.StatusCodes.ECANCELED)
+        elif self.sent >= self.count:
+            self._finish(error.StatusCodes.SUCCESS)
+        else:
+            length = min(self.chunk_size, self.count - self.sent)
+            try:
+                fs.sendfile(self.stream.fileno(), self.fd, self.offset + self.sent, length,
+                            callback=self._on_chunk, loop=self.stream.loop)
+            except error.UVError as exception:
+                self._finish(exception.code)
+            else:
+                self.sending = True
+
+    def _on_chunk(self, fs_request, status, sent):
+        self.sending = False
+        if self.stream.closing:
+            self._finish(error.StatusCodes.ECANCELED)
+            return
+        if status == error.StatusCodes.EAGAIN:
+            self._wait_writable()
+        elif status != error.StatusCodes.SUCCESS:
+            self._finish(status)
+        elif not sent:
+            self._finish(error.StatusCodes.EOF)
+        else:
+            self.sent += sent
+            self.on_progress(self, self.sent, self.count)
+            self._send_chunk()
+
+    def _wait_writable(self):
+        if self.stream.closing:
+            self._finish(error.StatusCodes.ECANCELED)
+            return
+        if self.poll is None:
+            # libuv already polls the stream's file descriptor, a duplicate
+            # can be polled independently without interfering with it
+            self.poll_fd = os.dup(self.stream.fileno())
+            self.poll = poll.Poll(self.poll_fd, self.stream.loop)
+        self.poll.start(poll.PollEvent.WRITABLE, self._on_writable)
+
+    def _on_writable(self, poll_handle, status, events):
+        poll_handle.stop()
+        if status != error.StatusCodes.SUCCESS:
+            self._finish(status)
+        else:
+            self._send_chunk()
+
+    def _finish(self, status):
+        if self.finished:
+            return
+        self.finished = True
+        if self.poll is not None:
+            self.poll.stop()
+            os.close(self.poll_fd)
+            self.poll.close()
+            self.poll, self.poll_fd = None, None
+        stream = self.stream
+        stream.file_transfer = None
+        stream.corked, stream.auto_flush = self.was_corked, self.was_auto_flush
+        close_deferred, stream.close_deferred = stream.close_deferred, False
+        self._run_deferred()
+        if close_deferred:
+            stream.close()
+        self.on_sendfile(self, status)
+
+    def _run_deferred(self):
+        # data written during the transfer is written after the deferred
+        # operations, it has been queued after them
+        self.defer(None)
+        deferred, self.deferred = self.deferred, []
+        while deferred:
+            if self.stream.file_transfer is not None:
+                # a deferred transfer has been started, it runs the rest
+                self.stream.file_transfer.deferred[:0] = deferred
+                return
+            buffers, callbacks, operation, arguments = deferred.pop(0)
+            if self.stream.closing:
+                # the stream has been closed, only deferred transfers have
+                # to be finished to report the cancellation
+                if isinstance(getattr(operation, '__self__', None), FileTransfer):
+                    operation()
+                continue
+            try:
+                if buffers:
+                    self.stream.write_queued(buffers, callbacks)
+                if operation is not None:
+                    operation(*arguments)
+            except Exception:
+                self.stream.loop.handle_exception()
+
+
 @handle.HandleTypes.STREAM
 class UVStream(handle.UVHandle):
     """
@@ -329,6 +666,8 @@ class UVStream(handle.UVHandle):
     :param on_connection:
         callback which should run after a new connection has been made
         or on error (if stream is in listen mode)
+    :param lightweight:
+        use the lightweight internal handle representation
 
     :type loop:
         uv.Loop
@@ -342,12 +681,29 @@ class UVStream(handle.UVHandle):
     :type on_connection:
         ((uv.UVStream, uv.StatusCodes, bytes) -> None) |
         ((Any, uv.UVStream, uv.StatusCodes, bytes) -> None)
+    :type lightweight:
+        bool
     """
 
-    __slots__ = ['uv_stream', 'on_read', 'on_connection', 'ipc']
+    __slots__ = ['uv_stream', 'on_read', 'on_connection', 'ipc', 'corked',
+                 'auto_flush', 'corked_buffers', 'corked_callbacks',
+                 'on_pause_writing', 'on_resume_writing', 'writing_paused',
+                 'write_high_watermark', 'write_low_watermark', 'drain_callbacks',
+                 'try_write_enabled', 'try_write_deferred', 'file_transfer',
+                 'close_deferred']
+
+    def __init__(self, loop, ipc, arguments, on_read, on_connection, lightweight=False):
+        self.file_transfer = None
+        """
+        File transfer which is currently in progress.
 
-    def __init__(self, loop, ipc, arguments, on_read, on_connection):
-        super(UVStream, self).__init__(loop, arguments)
+        :readonly:
+            True
+        :type:
+            uv.FileTransfer | None
+        """
+        self.close_deferred = False
+        super(UVStream, self).__init__(loop, arguments, lightweight)
         self.uv_stream = ffi.cast('uv_stream_t*', self.base_handle.uv_object)
         self.on_read = on_read or common.dummy_callback
         """
@@ -416,6 +772,113 @@ class UVStream(handle.UVHandle):
         :type:
             bool
         """
+        self.corked = False
+        """
+        Stream is corked or not. Data written to a corked stream is
+        queued until the stream is flushed.
+
+        :readonly:
+            True
+        :type:
+            bool
+        """
+        self.auto_flush = False
+        """
+        Data written to the corked stream is flushed automatically
+        right before the event loop polls for IO.
+
+        :readonly:
+            True
+        :type:
+            bool
+        """
+        # allocated on demand to keep idle streams small
+        self.corked_buffers = ()
+        self.corked_callbacks = ()
+        self.on_pause_writing = common.dummy_callback
+        """
+        Callback which should run after the size of the write queue
+        exceeded the high watermark.
+
+
+        .. function:: on_pause_writing(stream_handle)
+
+            :param stream_handle:
+                handle the call originates from
+
+            :type stream_handle:
+                uv.UVStream
+
+
+        :readonly:
+            False
+        :type:
+            ((uv.UVStream) -> None) | ((Any, uv.UVStream) -> None)
+        """
+        self.on_resume_writing = common.dummy_callback
+        """
+        Callback which should run after the size of the write queue
+        dropped to or below the low watermark after writing has been
+        paused.
+
+
+        .. function:: on_resume_writing(stream_handle)
+
+            :param stream_handle:
+                handle the call originates from
+
+            :type stream_handle:
+                uv.UVStream
+
+
+        :readonly:
+            False
+        :type:
+            ((uv.UVStream) -> None) | ((Any, uv.UVStream) -> None)
+        """
+        self.writing_paused = False
+        """
+        Size of the write queue exceeded the high watermark and has not
+        yet dropped to or below the low watermark.
+
+        :readonly:
+            True
+        :type:
+            bool
+        """
+        self.write_high_watermark = None
+        self.write_low_watermark = None
+        self.drain_callbacks = ()
+        self.try_write_enabled = False
+        """
+        Writes try to write the data immediately before issuing a write
+        request (see :func:`uv.UVStream.set_try_write`).
+
+        :readonly:
+            True
+        :type:
+            bool
+        """
+        self.try_write_deferred = True
+        """
+        Write callbacks of immediately written data run at some later
+        point in time instead of synchronously.
+
+        :readonly:
+            True
+        :type:
+            bool
+        """
+
+    @property
+    def closing(self):
+        """
+        :readonly:
+            True
+        :type:
+            bool
+        """
+        return self.close_deferred or self.base_handle.closing
 
     @property
     def readable(self):
@@ -441,6 +904,134 @@ class UVStream(handle.UVHandle):
             return False
         return bool(lib.uv_is_writable(self.uv_stream))
 
+    @property
+    def write_queue_size(self):
+        """
+        Amount of queued bytes waiting to be written. Data queued on a
+        corked stream is not included.
+
+        :readonly:
+            True
+        :rtype:
+            int
+        """
+        return self.uv_stream.write_queue_size
+
+    def set_write_watermarks(self, high=None, low=None, on_pause_writing=None,
+                             on_resume_writing=None):
+        """
+        Set the high and low watermarks of the write queue. After the
+        size of the write queue exceeded the high watermark the pause
+        writing callback is called. After it dropped to or below the
+        low watermark again the resume writing callback is called.
+        Producers should stop writing data in between to prevent the
+        write queue from growing without limit. Closing the stream ends
+        the pause without calling the resume writing callback, the close
+        callback notifies producers instead. If `low` is not
+        specified it defaults to a quarter of `high`. If `high` is
+        `None` the watermarks are disabled.
+
+        :param high:
+            high watermark in bytes
+        :param low:
+            low watermark in bytes
+        :param on_pause_writing:
+            callback which should run after the write queue exceeded
+            the high watermark (overrides the current callback if
+            specified)
+        :param on_resume_writing:
+            callback which should run after the write queue dropped to
+            or below the low watermark (overrides the current callback
+            if specified)
+
+        :type high:
+            int | None
+        :type low:
+            int | None
+        :type on_pause_writing:
+            ((uv.UVStream) -> None) | ((Any, uv.UVStream) -> None)
+        :type on_resume_writing:
+            ((uv.UVStream) -> None) | ((Any, uv.UVStream) -> None)
+        """
+        if high is not None and low is None:
+            low = high // 4
+        if high is not None and not 0 <= low <= high:
+            raise ValueError('low watermark must be between 0 and high watermark')
+        self.write_high_watermark = high
+        self.write_low_watermark = low
+        self.on_pause_writing = on_pause_writing or self.on_pause_writing
+        self.on_resume_writing = on_resume_writing or self.on_resume_writing
+        self.check_write_queue()
+
+    def check_write_queue(self):
+        """
+        Compare the size of the write queue with the watermarks and
+        call the pause or resume writing callback if necessary.
+
+        .. warning::
+            This method is only for internal purposes and is not part
+            of the official API. You should never call it directly!
+        """
+        callback = None
+        if self.closing:
+            # closing ends a pause, the close callback notifies producers
+            self.writing_paused = False
+        elif self.write_high_watermark is None:
+            if self.writing_paused:
+                self.writing_paused = False
+                callback = self.on_resume_writing
+        elif self.writing_paused:
+            if self.uv_stream.write_queue_size <= self.write_low_watermark:
+                self.writing_paused = False
+                callback = self.on_resume_writing
+        elif self.uv_stream.write_queue_size > self.write_high_watermark:
+            self.writing_paused = True
+            callback = self.on_pause_writing
+        if callback is not None:
+            try:
+                callback(self)
+            except Exception:
+                self.loop.handle_exception()
+
+    def wait_drained(self, callback):
+        """
+        Call the callback with the stream after all queued data has
+        been handed over to the operating system or the stream has been
+        closed. If the write queue is already empty the callback is
+        called immediately.
+
+        .. warning::
+            This method is only for internal purposes and is not part
+            of the official API. You should never call it directly!
+
+        :type callback:
+            ((uv.UVStream) -> None) | ((Any, uv.UVStream) -> None)
+        """
+        if self.closing or not self.uv_stream.write_queue_size:
+            callback(self)
+        else:
+            if not self.drain_callbacks:
+                self.drain_callbacks = []
+            self.drain_callbacks.append(callback)
+
+    def check_drained(self):
+        """
+        Call the drain callbacks if the write queue has been drained.
+
+        .. warning::
+            This method is only for internal purposes and is not part
+            of the official API. You should never call it directly!
+        """
+        if not self.drain_callbacks:
+            return
+        if self.closing or not self.uv_stream.write_queue_size:
+            callbacks, self.drain_callbacks = self.drain_callbacks, ()
+            for callback in callbacks:
+                try:
+                    callback(self)
+                except Exception:
+                    self.loop.handle_exception()
+
     @property
     def family(self):
         """
@@ -452,13 +1043,27 @@ class UVStream(handle.UVHandle):
 
     def shutdown(self, on_shutdown=None):
         """
+        Shutdown the outgoing side of the stream after all pending
+        write requests have been completed. Data queued on a corked
+        stream is flushed before.
+
         :type on_shutdown:
             ((uv.ShutdownRequest, uv.StatusCodes) -> None) |
             ((Any, uv.ShutdownRequest, uv.StatusCodes) -> None)
 
+        :returns:
+            issued shutdown request or `None` if it has been deferred
+            until the current file transfer has finished
         :rtype:
-            uv.ShutdownRequest
+            uv.ShutdownRequest | None
         """
+        if self.file_transfer is not None:
+            if self.closing:
+                raise error.ClosedHandleError()
+            self.file_transfer.defer(self.shutdown, on_shutdown)
+            return None
+        if self.corked_buffers:
+            self.flush()
         return ShutdownRequest(self, on_shutdown)
 
     def listen(self, backlog=5, on_connection=None):
@@ -520,29 +1125,354 @@ class UVStream(handle.UVHandle):
             raise error.UVError(code)
         self.clear_pending()
 
-    def write(self, buffers, send_stream=None, on_write=None):
+    def write(self, buffers, send_stream=None, on_write=None, copy=True):
         """
+        Write data to the stream. Buffers are written in the given
+        order.
+
+        By default the data is copied before issuing the write request.
+        If `copy` is `False` the data is written directly from the
+        given objects which have to support the buffer protocol (e.g.
+        :class:`bytes`, :class:`bytearray`, :class:`memoryview` or
+        :class:`mmap.mmap`). They are kept alive until the request has
+        finished but must not be modified in the meantime.
+
+        If immediate writes are enabled with :func:`set_try_write` data
+        is written without a request if possible, in that case the write
+        callback is called with `None` instead of a write request.
+
+        :raises uv.UVError:
+            error while initializing the request
+        :raises uv.ClosedHandleError:
+            handle has already been closed or is closing
+
+        :param buffers:
+            data which should be written
+        :param send_stream:
+            stream handle which should be send
+        :param on_write:
+            callback which should run after all data has been written
+        :param copy:
+            copy the data or write directly from the given buffers
+
         :type buffers:
-            tuple[bytes] | list[bytes] | bytes
+            tuple[bytes] | list[bytes] | bytes | bytearray | memoryview
         :type send_stream:
             uv.TCP | uv.Pipe | None
         :type on_write:
             ((uv.WriteRequest, uv.StatusCodes) -> None) |
             ((Any, uv.WriteRequest, uv.StatusCodes) -> None)
+        :type copy:
+            bool
+
+        :returns:
+            issued write request or `None` if the stream is corked, all
+            data has been written immediately or the write has been
+            deferred until the current file transfer has finished
+        :rtype:
+            uv.WriteRequest | None
+        """
+        if send_stream is not None and self.file_transfer is not None:
+            if self.closing:
+                raise error.ClosedHandleError()
+            buffers = library.normalize_buffers(buffers, copy)
+            self.file_transfer.defer(self.write, buffers, send_stream, on_write, False)
+            return None
+        if self.try_write_enabled and send_stream is None and not self.corked:
+            if self.closing:
+                raise error.ClosedHandleError()
+            if not self.uv_stream.write_queue_size:
+                buffers = self._try_write(buffers)
+                if not buffers:
+                    if on_write is not None:
+                        self._call_write_callback(on_write)
+                    return None
+        if self.corked and send_stream is None:
+            if self.closing:
+                raise error.ClosedHandleError()
+            if not self.corked_buffers:
+                self.corked_buffers = []
+            self.corked_buffers.extend(library.normalize_buffers(buffers, copy))
+            if on_write is not None:
+                if not self.corked_callbacks:
+                    self.corked_callbacks = []
+                self.corked_callbacks.append(on_write)
+            if self.auto_flush:
+                self.loop.schedule_flush(self)
+            return None
+        if self.corked_buffers:
+            self.flush()
+        return WriteRequest(self, buffers, send_stream, on_write, copy)
+
+    def set_try_write(self, enabled=True, deferred=True):
+        """
+        Enable or disable immediate writes. If enabled :func:`write`
+        first tries to write the data with :func:`uv_try_write` if there
+        is no data waiting to be written. Only data which could not be
+        written immediately is written with a write request. Small
+        writes to an idle stream therefore do not allocate any request.
+
+        If all data has been written immediately the write callback is
+        called with `None` instead of a write request. This happens
+        synchronously from within :func:`write` or, if `deferred` is
+        `True`, right before the loop polls for IO the next time. The
+        loop is kept alive until deferred callbacks have been called.
+
+        :param enabled:
+            try to write data immediately
+        :param deferred:
+            defer write callbacks of immediately written data
+
+        :type enabled:
+            bool
+        :type deferred:
+            bool
+        """
+        self.try_write_enabled = enabled
+        self.try_write_deferred = deferred
+
+    def _try_write(self, buffers):
+        """
+        Write as much data as possible immediately and return the
+        remaining buffers.
+        """
+        buffers = library.normalize_buffers(buffers, copy=False)
+        uv_buffers = library.make_uv_buffers(buffers, copy=False)
+        written = lib.uv_try_write(self.uv_stream, uv_buffers, len(uv_buffers))
+        if written <= 0:
+            # nothing written or error, let the write request report errors
+            return buffers
+        for index, item in enumerate(buffers):
+            length = library.uv_buffer_get(uv_buffers + index).length
+            if written < length:
+                view = memoryview(item)
+                if view.itemsize != 1:  # pragma: no cover
+                    view = view.cast('B')
+                return [view[written:]] + list(buffers[index + 1:])
+            written -= length
+        return []
+
+    def _call_write_callback(self, on_write):
+        if self.try_write_deferred:
+            self.loop.schedule_write_callback(on_write)
+        else:
+            try:
+                on_write(None, error.StatusCodes.SUCCESS)
+            except Exception:
+                self.loop.handle_exception()
+
+    def cork(self, auto_flush=False):
+        """
+        Cork the stream. Data written to a corked stream is queued and
+        written at once with a single write request when the stream is
+        flushed or uncorked. This reduces the overhead of many small
+        writes. The write callbacks of all queued writes are called
+        with the write request which finally wrote the data.
+
+        If `auto_flush` is `True` the queued data is flushed right
+        before the event loop polls for IO, i.e. at the end of the
+        current event loop iteration.
+
+        :raises uv.ClosedHandleError:
+            handle has already been closed or is closing
+
+        :param auto_flush:
+            flush queued data automatically once per loop iteration
+
+        :type auto_flush:
+            bool
+        """
+        if self.closing:
+            raise error.ClosedHandleError()
+        if self.file_transfer is not None:
+            # the stream stays corked until the transfer has finished
+            self.file_transfer.was_corked = True
+            self.file_transfer.was_auto_flush = auto_flush
+            return
+        self.corked = True
+        self.auto_flush = auto_flush
+
+    def uncork(self):
+        """
+        Uncork the stream and flush all queued data.
+
+        :raises uv.UVError:
+            error while initializing the write request
+        :raises uv.ClosedHandleError:
+            handle has already been closed or is closing
 
         :returns:
-            issued write request
+            issued write request or `None` if there was no queued data
+        :rtype:
+            uv.WriteRequest | None
+        """
+        if self.file_transfer is not None:
+            self.file_transfer.was_corked = False
+            self.file_transfer.was_auto_flush = False
+            return None
+        self.corked = False
+        self.auto_flush = False
+        return self.flush()
+
+    def flush(self):
+        """
+        Write all data queued on the corked stream with a single write
+        request. The stream stays corked. During a file transfer the
+        data is written after the transfer has finished. If the write
+        request can not be issued the queued write callbacks are called
+        with the error.
+
+        :raises uv.UVError:
+            error while initializing the write request
+        :raises uv.ClosedHandleError:
+            handle has already been closed or is closing
+
+        :returns:
+            issued write request or `None` if there was no queued data
+            or a file transfer is in progress
+        :rtype:
+            uv.WriteRequest | None
+        """
+        if not self.corked_buffers or self.file_transfer is not None:
+            return None
+        buffers, callbacks = self.corked_buffers, self.corked_callbacks
+        self.corked_buffers, self.corked_callbacks = (), ()
+        return self.write_queued(buffers, callbacks)
+
+    def write_queued(self, buffers, callbacks):
+        """
+        Write queued buffers with a single write request and call all
+        of the queued write callbacks with it. If the write request can
+        not be issued the callbacks are called with the error and
+        without a request.
+
+        .. warning::
+            This method is only for internal purposes and is not part
+            of the official API. You should never call it directly!
+
+        :raises uv.UVError:
+            error while initializing the write request
+
+        :type buffers:
+            list[bytes | bytearray | memoryview]
+        :type callbacks:
+            list[callable] | tuple
+
         :rtype:
             uv.WriteRequest
         """
-        return WriteRequest(self, buffers, send_stream, on_write)
+        def on_write(write_request, status):
+            for callback in callbacks:
+                try:
+                    callback(write_request, status)
+                except Exception:
+                    self.loop.handle_exception()
+
+        try:
+            # queued buffers are either immutable or not supposed to be copied
+            return WriteRequest(self, buffers, None, on_write, copy=False)
+        except error.UVError as exception:
+            # the writes have already been accepted, report the lost data
+            on_write(None, exception.code)
+            raise
+
+    def sendfile(self, file, offset=0, count=None, chunk_size=2**20, on_progress=None,
+                 on_sendfile=None):
+        """
+        Send the content of a file with :func:`uv.fs.sendfile`, which
+        copies the data within the kernel without passing it through
+        user space. The transfer is split into chunks of `chunk_size`
+        bytes and `on_progress` is called after each chunk. It starts
+        after all data written before has been handed over to the
+        operating system, data written during the transfer is queued
+        and written afterwards. If another transfer is in progress the
+        transfer starts after it has finished. If `count` is not
+        specified the file is sent up to its end.
+
+        :raises uv.UVError:
+            error while determining the size of the file
+        :raises uv.ClosedHandleError:
+            handle has already been closed or is closing
+
+        :param file:
+            file or file descriptor which should be sent
+        :param offset:
+            offset of the first byte which should be sent
+        :param count:
+            amount of bytes which should be sent
+        :param chunk_size:
+            maximal amount of bytes sent at once
+        :param on_progress:
+            callback which should run after each transferred chunk
+        :param on_sendfile:
+            callback which should run after the transfer has finished
+            or on error
+
+        :type file:
+            uv.fs.File | int | file-like
+        :type offset:
+            int
+        :type count:
+            int | None
+        :type chunk_size:
+            int
+        :type on_progress:
+            ((uv.FileTransfer, int, int) -> None) |
+            ((Any, uv.FileTransfer, int, int) -> None)
+        :type on_sendfile:
+            ((uv.FileTransfer, uv.StatusCodes) -> None) |
+            ((Any, uv.FileTransfer, uv.StatusCodes) -> None)
+
+        :returns:
+            file transfer
+        :rtype:
+            uv.FileTransfer
+        """
+        if self.closing:
+            raise error.ClosedHandleError()
+        fd = file if isinstance(file, int) else file.fileno()
+        if count is None:
+            count = max(0, fs.fstat(fd, loop=self.loop).size - offset)
+        return FileTransfer(self, fd, offset, count, chunk_size, on_progress, on_sendfile)
+
+    def close(self, on_closed=None):
+        """
+        Close the stream. Data queued on a corked stream is flushed
+        before, the corresponding write callbacks are called with
+        :class:`uv.StatusCodes.ECANCELED` if the data could not be
+        written before the stream has been closed and with the error if
+        the data could not be flushed at all. A file transfer in
+        progress is canceled and the stream is closed after the chunk
+        which is currently sent, which may require the peer to read.
+
+        :param on_closed:
+            callback which should run after the handle has been closed
+            (overrides the current callback if specified)
+
+        :type on_closed:
+            ((uv.Handle) -> None) | ((Any, uv.Handle) -> None)
+        """
+        if self.file_transfer is not None and not self.closing:
+            # closing the file descriptor while a chunk is sent in the
+            # thread pool would truncate it, close after the chunk
+            self.on_closed = on_closed or self.on_closed
+            self.file_transfer.cancel()
+            return
+        if self.corked_buffers and not self.closing:
+            try:
+                self.flush()
+            except error.UVError:
+                pass
+        super(UVStream, self).close(on_closed)
 
     def try_write(self, buffers):
         """
         Immediately write data to the stream without issuing a write
         request. Throws :class:`uv.error.TemporaryUnavailableError` if
         data could not be written immediately, otherwise it returns the
-        number of written bytes.
+        number of written bytes. The data is never copied because the
+        buffers are no longer needed after this method returns. Nothing
+        is written immediately while a file transfer is in progress.
 
         :raises uv.UVError:
             error while writing data
@@ -554,7 +1484,7 @@ class UVStream(handle.UVHandle):
         :param buffers:
             data which should be written
         :type buffers:
-            tuple[bytes] | list[bytes] | bytes
+            tuple[bytes] | list[bytes] | bytes | bytearray | memoryview
 
         :return:
             number of bytes written
@@ -563,7 +1493,9 @@ class UVStream(handle.UVHandle):
         """
         if self.closing:
             raise error.ClosedHandleError()
-        uv_buffers = library.make_uv_buffers(buffers)
+        if self.file_transfer is not None:
+            raise error.UVError(error.StatusCodes.EAGAIN)
+        uv_buffers = library.make_uv_buffers(buffers, copy=False)
         code = lib.uv_try_write(self.uv_stream, uv_buffers, len(uv_buffers))
         if code < 0:  # pragma: no cover
             raise error.UVError(code)
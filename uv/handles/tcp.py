@@ -82,6 +82,11 @@ class TCP(stream.UVStream):
     :param on_connection:
         callback which should run after a new connection has been made
         or on error (if stream is in listen mode)
+    :param lightweight:
+        use the lightweight internal handle representation, which saves
+        about 100 bytes per handle (see `benchmarks/idle_connections.py`)
+        for large numbers of connections, for example by accepting
+        connections with `server.accept(lightweight=True)`
 
     :type flags:
         int
@@ -93,6 +98,8 @@ class TCP(stream.UVStream):
     :type on_connection:
         ((uv.TCP, uv.StatusCodes, bytes) -> None) |
         ((Any, uv.TCP, uv.StatusCodes, bytes) -> None)
+    :type lightweight:
+        bool
     """
 
     __slots__ = ['uv_tcp', '_family']
@@ -100,8 +107,10 @@ class TCP(stream.UVStream):
     uv_handle_type = 'uv_tcp_t*'
     uv_handle_init = lib.uv_tcp_init_ex
 
-    def __init__(self, flags=0, loop=None, on_read=None, on_connection=None):
-        super(TCP, self).__init__(loop, False, (flags, ), on_read, on_connection)
+    def __init__(self, flags=0, loop=None, on_read=None, on_connection=None,
+                 lightweight=False):
+        super(TCP, self).__init__(loop, False, (flags, ), on_read, on_connection,
+                                  lightweight)
         self.uv_tcp = self.base_handle.uv_object
 
     def open(self, fd):
@@ -193,3 +193,292 @@ class Timer(handle.UVHandle):
         if code != error.StatusCodes.SUCCESS:
             raise error.UVError(code)
         self.clear_pending()
+
+
+class TimerWheelEntry(object):
+    """
+    Timeout scheduled on a :class:`uv.TimerWheel`. Entries are plain
+    Python objects without any libuv resources.
+
+    :param wheel:
+        timer wheel the entry is scheduled on
+    :param timeout:
+        timeout to be used (in milliseconds)
+    :param on_timeout:
+        callback which should run on timeout
+
+    :type wheel:
+        uv.TimerWheel
+    :type timeout:
+        int
+    :type on_timeout:
+        ((uv.TimerWheelEntry) -> None) |
+        ((Any, uv.TimerWheelEntry) -> None)
+    """
+
+    __slots__ = ['wheel', 'timeout', 'on_timeout', 'expires', 'slot']
+
+    def __init__(self, wheel, timeout, on_timeout):
+        self.wheel = wheel
+        """
+        Timer wheel the entry is scheduled on.
+
+        :readonly:
+            True
+        :type:
+            uv.TimerWheel
+        """
+        self.timeout = timeout
+        """
+        Timeout used when the entry has been scheduled or reset the
+        last time (in milliseconds).
+
+        :readonly:
+            True
+        :type:
+            int
+        """
+        self.on_timeout = on_timeout
+        """
+        Callback which should run on timeout.
+
+
+        .. function:: on_timeout(entry)
+
+            :param entry:
+                entry which has timed out
+
+            :type entry:
+                uv.TimerWheelEntry
+
+
+        :readonly:
+            False
+        :type:
+            ((uv.TimerWheelEntry) -> None) |
+            ((Any, uv.TimerWheelEntry) -> None)
+        """
+        self.expires = 0
+        self.slot = None
+
+    @property
+    def active(self):
+        """
+        Entry is scheduled and has neither timed out nor been
+        cancelled.
+
+        :readonly:
+            True
+        :rtype:
+            bool
+        """
+        return self.slot is not None
+
+    def cancel(self):
+        """
+        Cancel the entry. The callback will no longer be called.
+        """
+        self.wheel.cancel(self)
+
+    def reset(self, timeout=None):
+        """
+        Reschedule the entry, even if it has already timed out or has
+        been cancelled.
+
+        :param timeout:
+            timeout to be used (in milliseconds), defaults to the
+            timeout used the last time
+
+        :type timeout:
+            int | None
+        """
+        self.wheel.reset(self, timeout)
+
+
+class TimerWheel(object):
+    """
+    Hashed timer wheel for large numbers of timeouts which rarely
+    expire, like read timeouts of idle connections. All entries are
+    driven by a single :class:`uv.Timer` which ticks every
+    `resolution` milliseconds while entries are scheduled. Scheduling,
+    cancelling and resetting entries takes constant time.
+
+    Entries fire on the first tick at or after their timeout, they
+    never fire early but up to `resolution` milliseconds late.
+
+    :raises uv.UVError:
+        error while initializing the timer handle
+
+    :param resolution:
+        duration of a tick (in milliseconds)
+    :param slots:
+        number of slots of the wheel
+    :param loop:
+        event loop the wheel should run on
+
+    :type resolution:
+        int
+    :type slots:
+        int
+    :type loop:
+        uv.Loop
+    """
+
+    __slots__ = ['timer', 'uv_loop', 'resolution', 'slots', 'tick', 'count']
+
+    def __init__(self, resolution=100, slots=512, loop=None):
+        self.timer = Timer(loop=loop, on_timeout=self.on_tick)
+        self.uv_loop = self.timer.loop.uv_loop
+        self.resolution = max(1, resolution)
+        """
+        Duration of a tick (in milliseconds).
+
+        :readonly:
+            True
+        :type:
+            int
+        """
+        self.slots = [set() for _ in range(slots)]
+        self.tick = 0
+        self.count = 0
+
+    @property
+    def loop(self):
+        """
+        Loop the wheel is running on.
+
+        :readonly:
+            True
+        :rtype:
+            uv.Loop
+        """
+        return self.timer.loop
+
+    @property
+    def closing(self):
+        """
+        Wheel has been closed.
+
+        :readonly:
+            True
+        :rtype:
+            bool
+        """
+        return self.timer.closing
+
+    def __len__(self):
+        return self.count
+
+    def schedule(self, timeout, on_timeout=None):
+        """
+        Schedule a new entry.
+
+        :raises uv.ClosedHandleError:
+            wheel has already been closed
+
+        :param timeout:
+            timeout to be used (in milliseconds)
+        :param on_timeout:
+            callback which should run on timeout
+
+        :type timeout:
+            int
+        :type on_timeout:
+            ((uv.TimerWheelEntry) -> None) |
+            ((Any, uv.TimerWheelEntry) -> None)
+
+        :rtype:
+            uv.TimerWheelEntry
+        """
+        entry = TimerWheelEntry(self, timeout, on_timeout or common.dummy_callback)
+        self.insert(entry)
+        return entry
+
+    def cancel(self, entry):
+        """
+        Cancel the given entry.
+
+        :type entry:
+            uv.TimerWheelEntry
+        """
+        if entry.slot is None:
+            return
+        entry.slot.discard(entry)
+        entry.slot = None
+        self.count -= 1
+        if not self.count:
+            self.timer.stop()
+
+    def reset(self, entry, timeout=None):
+        """
+        Reschedule the given entry.
+
+        :raises uv.ClosedHandleError:
+            wheel has already been closed
+
+        :type entry:
+            uv.TimerWheelEntry
+        :type timeout:
+            int | None
+        """
+        if entry.slot is not None:
+            entry.slot.discard(entry)
+            entry.slot = None
+            self.count -= 1
+        if timeout is not None:
+            entry.timeout = timeout
+        self.insert(entry)
+
+    def close(self):
+        """
+        Close the wheel. Scheduled entries will no longer time out.
+        """
+        for slot in self.slots:
+            for entry in slot:
+                entry.slot = None
+            slot.clear()
+        self.count = 0
+        self.timer.close()
+
+    def insert(self, entry):
+        """
+        .. warning::
+            This method is only for internal purposes and is not part
+            of the official API. You should never call it directly!
+        """
+        now = lib.uv_now(self.uv_loop)
+        if not self.count:
+            if self.timer.closing:
+                raise error.ClosedHandleError()
+            self.tick = now // self.resolution
+            self.timer.start(self.resolution, self.resolution)
+        expires = -(-(now + entry.timeout) // self.resolution)
+        entry.expires = max(self.tick + 1, expires)
+        entry.slot = self.slots[entry.expires % len(self.slots)]
+        entry.slot.add(entry)
+        self.count += 1
+
+    def on_tick(self, timer_handle):
+        """
+        .. warning::
+            This method is only for internal purposes and is not part
+            of the official API. You should never call it directly!
+        """
+        target = lib.uv_now(self.uv_loop) // self.resolution
+        ticks = min(target - self.tick, len(self.slots))
+        self.tick = max(self.tick, target)
+        for tick in range(target - ticks + 1, target + 1):
+            slot = self.slots[tick % len(self.slots)]
+            expired = [entry for entry in slot if entry.expires <= target]
+            for entry in expired:
+                if entry.slot is not slot:
+                    continue
+                slot.discard(entry)
+                entry.slot = None
+                self.count -= 1
+                try:
+                    entry.on_timeout(entry)
+                except Exception:
+                    self.loop.handle_exception()
+        if not self.count and not self.closing:
+            self.timer.stop()
@@ -52,6 +52,16 @@ class UDPFlags(common.Enumeration):
     :type: uv.UDPFlags
     """
 
+    RECVMMSG = lib.CROSS_UV_UDP_RECVMMSG
+    """
+    Use `recvmmsg` to receive multiple datagrams with a single system
+    call in batched receive mode (see :func:`uv.UDP.receive_batch_start`).
+    This flag is zero if it is not supported by libuv and is silently
+    ignored if it is not supported by the platform.
+
+    :type: uv.UDPFlags
+    """
+
 
 class UDPMembership(common.Enumeration):
     """
@@ -81,6 +91,7 @@ def uv_udp_send_cb(send_request, status):
     :type status:
         int
     """
+    send_request.udp.check_write_queue()
     send_request.on_send(send_request, status)
 
 
@@ -102,27 +113,33 @@ class UDPSendRequest(request.UVRequest):
         address of the remote peer `(ip, port, flowinfo=0, scope_id=0)`
     :param on_send:
         callback called after all data has been sent
+    :param copy:
+        copy the data or send directly from the given buffers (see
+        :func:`uv.UDP.send`)
 
     :type udp:
         uv.UDP
     :type buffers:
-        list[bytes] | bytes
+        list[bytes] | bytes | bytearray | memoryview
     :type address:
         tuple | uv.Address
     :type on_send:
         ((uv.SendRequest, uv.StatusCode) -> None) |
         ((Any, uv.SendRequest, uv.StatusCode) -> None)
+    :type copy:
+        bool
     """
 
     __slots__ = ['uv_send', 'uv_buffers', 'udp', 'on_send']
 
     uv_request_type = 'uv_udp_send_t*'
     uv_request_init = lib.uv_udp_send
+    uv_request_recycle = True
 
-    def __init__(self, udp, buffers, address, on_send=None):
+    def __init__(self, udp, buffers, address, on_send=None, copy=True):
         if udp.closing:
             raise error.ClosedHandleError()
-        self.uv_buffers = library.make_uv_buffers(buffers)
+        self.uv_buffers = library.make_uv_buffers(buffers, copy)
         self.udp = udp
         """
         UDP handle the request belongs to.
@@ -160,6 +177,7 @@ class UDPSendRequest(request.UVRequest):
         c_sockaddr = dns.make_c_sockaddr(*address)
         arguments = (self.uv_buffers, len(self.uv_buffers), c_sockaddr, uv_udp_send_cb)
         super(UDPSendRequest, self).__init__(udp.loop, arguments, uv_udp)
+        udp.check_write_queue()
 
 
 @base.handle_callback('uv_udp_recv_cb')
@@ -176,7 +194,7 @@ def uv_udp_recv_cb(udp_handle, length, uv_buffer, c_sockaddr, flags):
     :type flags:
         int
     """
-    data = udp_handle.loop.allocator.finalize(udp_handle, length, uv_buffer)
+    data = udp_handle.allocator.finalize(udp_handle, length, uv_buffer)
     if length < 0:  # pragma: no cover
         status = error.StatusCodes.get(length)
     else:
@@ -188,6 +206,104 @@ def uv_udp_recv_cb(udp_handle, length, uv_buffer, c_sockaddr, flags):
     udp_handle.on_receive(udp_handle, status, address, data, flags)
 
 
+class UDPReceiveBatch(object):
+    """
+    Ring of preallocated receive buffers and address structures used by
+    the batched receive mode of :class:`uv.UDP`. The datagrams are
+    collected in C and handed over to Python all at once.
+
+    .. warning::
+        This class is only for internal purposes and is not part of
+        the official API.
+
+    :param slots:
+        maximal number of datagrams per batch
+    :param slot_size:
+        size of the buffer for each datagram
+    :param recvmmsg:
+        libuv might use `recvmmsg` to receive datagrams
+
+    :type slots:
+        int
+    :type slot_size:
+        int
+    :type recvmmsg:
+        bool
+    """
+
+    __slots__ = ['c_batch', 'c_base', 'c_lengths', 'c_flags', 'c_addresses', 'c_buffer',
+                 'slot_size']
+
+    def __init__(self, slots, slot_size, recvmmsg):
+        if recvmmsg:
+            # libuv receives into chunks of fixed size when using recvmmsg
+            slot_size = lib.CROSS_UV_UDP_MMSG_CHUNK_SIZE
+        self.slot_size = slot_size
+        self.c_base = ffi.new('char[]', slots * slot_size)
+        self.c_lengths = ffi.new('ssize_t[]', slots)
+        self.c_flags = ffi.new('unsigned int[]', slots)
+        self.c_addresses = ffi.new('struct sockaddr_storage[]', slots)
+        self.c_buffer = ffi.buffer(self.c_base)
+        self.c_batch = ffi.new('cross_udp_batch_t*')
+        self.c_batch.base = self.c_base
+        self.c_batch.slot_size = slot_size
+        self.c_batch.slots = slots
+        self.c_batch.count = 0
+        self.c_batch.lengths = self.c_lengths
+        self.c_batch.flags = self.c_flags
+        self.c_batch.addresses = self.c_addresses
+        self.c_batch.callback = uv_udp_batch_cb
+
+    @property
+    def count(self):
+        """
+        Number of datagrams waiting to be delivered.
+
+        :readonly:
+            True
+        :rtype:
+            int
+        """
+        return self.c_batch.count
+
+    def take(self):
+        """
+        Unpack the collected datagrams and clear the batch.
+
+        :return:
+            list of address, datagram and flags triples
+        :rtype:
+            list[(uv.Address, memoryview, int)]
+        """
+        count = self.c_batch.count
+        self.c_batch.count = 0
+        buffer = memoryview(self.c_buffer)
+        datagrams = []
+        for index in range(count):
+            start = index * self.slot_size
+            c_sockaddr = ffi.cast('struct sockaddr*', self.c_addresses + index)
+            data = buffer[start:start + self.c_lengths[index]]
+            datagrams.append((dns.unpack_sockaddr(c_sockaddr), data, self.c_flags[index]))
+        return datagrams
+
+    def clear(self):
+        """
+        Discard the collected datagrams.
+        """
+        self.c_batch.count = 0
+
+
+@base.handle_callback('cross_udp_batch_cb')
+def uv_udp_batch_cb(udp_handle, status):
+    """
+    :type udp_handle:
+        uv.UDP
+    :type status:
+        int
+    """
+    udp_handle.flush_receive_batch(status)
+
+
 @handle.HandleTypes.UDP
 class UDP(handle.UVHandle):
     """
@@ -212,14 +328,18 @@ class UDP(handle.UVHandle):
         ((Any, uv.UDP, uv.StatusCode, uv.Address, bytes, int) -> None)
     """
 
-    __slots__ = ['uv_udp', 'on_receive']
+    __slots__ = ['uv_cross_udp', 'uv_udp', 'recvmmsg', 'on_receive', 'on_receive_batch',
+                 'receive_batch', 'on_pause_writing', 'on_resume_writing',
+                 'writing_paused', 'write_high_watermark', 'write_low_watermark']
 
-    uv_handle_type = 'uv_udp_t*'
-    uv_handle_init = lib.uv_udp_init_ex
+    uv_handle_type = 'cross_udp_t*'
+    uv_handle_init = lib.cross_uv_udp_init_ex
 
     def __init__(self, flags=0, loop=None, on_receive=None):
         super(UDP, self).__init__(loop, (flags, ))
-        self.uv_udp = self.base_handle.uv_object
+        self.uv_cross_udp = self.base_handle.uv_object
+        self.uv_udp = ffi.addressof(self.uv_cross_udp, 'udp')
+        self.recvmmsg = bool(flags & UDPFlags.RECVMMSG)
         self.on_receive = on_receive or common.dummy_callback
         """
         Callback called after package has been received.
@@ -256,6 +376,195 @@ class UDP(handle.UVHandle):
             ((Any, uv.UDP, uv.StatusCode, uv.Address, bytes,
               int) -> None)
         """
+        self.on_receive_batch = common.dummy_callback
+        """
+        Callback called with all datagrams received during a loop
+        iteration in batched receive mode.
+
+
+        .. function:: on_receive_batch(udp_handle, status, datagrams)
+
+            :param udp_handle:
+                handle the call originates from
+            :param status:
+                status of the handle (indicate any errors)
+            :param datagrams:
+                address, data and flags of the received datagrams
+
+            :type udp_handle:
+                uv.UDP
+            :type status:
+                uv.StatusCode
+            :type datagrams:
+                list[(uv.Address4 | uv.Address6, memoryview, int)]
+
+
+        :readonly:
+            False
+        :type:
+            ((uv.UDP, uv.StatusCode, list) -> None) |
+            ((Any, uv.UDP, uv.StatusCode, list) -> None)
+        """
+        self.receive_batch = None
+        """
+        Receive buffers of the batched receive mode.
+
+        :readonly:
+            True
+        :type:
+            uv.handles.udp.UDPReceiveBatch | None
+        """
+        self.on_pause_writing = common.dummy_callback
+        """
+        Callback which should run after the size of the send queue
+        exceeded the high watermark.
+
+
+        .. function:: on_pause_writing(udp_handle)
+
+            :param udp_handle:
+                handle the call originates from
+
+            :type udp_handle:
+                uv.UDP
+
+
+        :readonly:
+            False
+        :type:
+            ((uv.UDP) -> None) | ((Any, uv.UDP) -> None)
+        """
+        self.on_resume_writing = common.dummy_callback
+        """
+        Callback which should run after the size of the send queue
+        dropped to or below the low watermark after writing has been
+        paused.
+
+
+        .. function:: on_resume_writing(udp_handle)
+
+            :param udp_handle:
+                handle the call originates from
+
+            :type udp_handle:
+                uv.UDP
+
+
+        :readonly:
+            False
+        :type:
+            ((uv.UDP) -> None) | ((Any, uv.UDP) -> None)
+        """
+        self.writing_paused = False
+        """
+        Size of the send queue exceeded the high watermark and has not
+        yet dropped to or below the low watermark.
+
+        :readonly:
+            True
+        :type:
+            bool
+        """
+        self.write_high_watermark = None
+        self.write_low_watermark = None
+
+    @property
+    def send_queue_size(self):
+        """
+        Amount of queued bytes waiting to be sent.
+
+        :readonly:
+            True
+        :rtype:
+            int
+        """
+        return self.uv_udp.send_queue_size
+
+    @property
+    def send_queue_count(self):
+        """
+        Amount of queued send requests waiting to be processed.
+
+        :readonly:
+            True
+        :rtype:
+            int
+        """
+        return self.uv_udp.send_queue_count
+
+    def set_write_watermarks(self, high=None, low=None, on_pause_writing=None,
+                             on_resume_writing=None):
+        """
+        Set the high and low watermarks of the send queue. After the
+        size of the send queue exceeded the high watermark the pause
+        writing callback is called. After it dropped to or below the
+        low watermark again the resume writing callback is called.
+        Closing the handle ends the pause without calling the resume
+        writing callback, the close callback notifies producers instead.
+        If `low` is not specified it defaults to a quarter of `high`. If
+        `high` is `None` the watermarks are disabled.
+
+        :param high:
+            high watermark in bytes
+        :param low:
+            low watermark in bytes
+        :param on_pause_writing:
+            callback which should run after the send queue exceeded
+            the high watermark (overrides the current callback if
+            specified)
+        :param on_resume_writing:
+            callback which should run after the send queue dropped to
+            or below the low watermark (overrides the current callback
+            if specified)
+
+        :type high:
+            int | None
+        :type low:
+            int | None
+        :type on_pause_writing:
+            ((uv.UDP) -> None) | ((Any, uv.UDP) -> None)
+        :type on_resume_writing:
+            ((uv.UDP) -> None) | ((Any, uv.UDP) -> None)
+        """
+        if high is not None and low is None:
+            low = high // 4
+        if high is not None and not 0 <= low <= high:
+            raise ValueError('low watermark must be between 0 and high watermark')
+        self.write_high_watermark = high
+        self.write_low_watermark = low
+        self.on_pause_writing = on_pause_writing or self.on_pause_writing
+        self.on_resume_writing = on_resume_writing or self.on_resume_writing
+        self.check_write_queue()
+
+    def check_write_queue(self):
+        """
+        Compare the size of the send queue with the watermarks and call
+        the pause or resume writing callback if necessary.
+
+        .. warning::
+            This method is only for internal purposes and is not part
+            of the official API. You should never call it directly!
+        """
+        callback = None
+        if self.closing:
+            # closing ends a pause, the close callback notifies producers
+            self.writing_paused = False
+        elif self.write_high_watermark is None:
+            if self.writing_paused:
+                self.writing_paused = False
+                callback = self.on_resume_writing
+        elif self.writing_paused:
+            if self.uv_udp.send_queue_size <= self.write_low_watermark:
+                self.writing_paused = False
+                callback = self.on_resume_writing
+        elif self.uv_udp.send_queue_size > self.write_high_watermark:
+            self.writing_paused = True
+            callback = self.on_pause_writing
+        if callback is not None:
+            try:
+                callback(self)
+            except Exception:
+                self.loop.handle_exception()
 
     def open(self, fd):
         """
@@ -303,12 +612,17 @@ class UDP(handle.UVHandle):
         if code != error.StatusCodes.SUCCESS:
             raise error.UVError(code)
 
-    def send(self, buffers, address, on_send=None):
+    def send(self, buffers, address, on_send=None, copy=True):
         """
         Send data over the UDP socket. If the socket has not previously
         been bound with `bind()` it will be bound to 0.0.0.0 (the "all
         interfaces" IPv4 address) and a random port number.
 
+        If `copy` is `False` the data is sent directly from the given
+        objects which have to support the buffer protocol. They are
+        kept alive until the request has finished but must not be
+        modified in the meantime.
+
         :raises uv.UVError:
             error while initializing the request
         :raises uv.ClosedHandleError:
@@ -320,19 +634,23 @@ class UDP(handle.UVHandle):
             address tuple `(ip, port, flowinfo=0, scope_id=0)`
         :param on_send:
             callback called after all data has been sent
+        :param copy:
+            copy the data or send directly from the given buffers
 
         :type buffers:
-            tuple[bytes] | list[bytes] | bytes
+            tuple[bytes] | list[bytes] | bytes | bytearray | memoryview
         :type address:
             tuple | uv.Address4 | uv.Address6
         :type on_send:
             ((uv.UDPSendRequest, uv.StatusCode) -> None) |
             ((Any, uv.UDPSendRequest, uv.StatusCode) -> None)
+        :type copy:
+            bool
 
         :rtype:
             uv.UDPSendRequest
         """
-        return UDPSendRequest(self, buffers, address, on_send)
+        return UDPSendRequest(self, buffers, address, on_send, copy)
 
     def try_send(self, buffers, address):
         """
@@ -362,7 +680,7 @@ class UDP(handle.UVHandle):
         if self.closing:
             raise error.ClosedHandleError()
         c_sockaddr = dns.make_c_sockaddr(*address)
-        uv_buffers = library.make_uv_buffers(buffers)
+        uv_buffers = library.make_uv_buffers(buffers, copy=False)
         code = lib.uv_udp_try_send(self.uv_udp, uv_buffers, len(uv_buffers), c_sockaddr)
         if code < 0:  # pragma: no cover
             raise error.UVError(code)
@@ -396,6 +714,84 @@ class UDP(handle.UVHandle):
             raise error.UVError(code)
         self.set_pending()
 
+    def receive_batch_start(self, on_receive_batch=None, slots=64, slot_size=2048):
+        """
+        Start receiving datagrams in batched mode. Instead of calling
+        into Python for every single datagram, datagrams are collected
+        in a preallocated ring of buffers and delivered all at once
+        after the socket has been drained, the ring is full or at the
+        end of the loop iteration. If the handle has been created with
+        :attr:`uv.UDPFlags.RECVMMSG` and the platform supports it
+        multiple datagrams are received with a single system call, in
+        this case `slot_size` is fixed to 64 KiB by libuv.
+
+        Datagrams larger than `slot_size` are truncated and delivered
+        with the :attr:`uv.UDPFlags.PARTIAL` flag set. Datagrams not yet
+        delivered when receiving is stopped are discarded. On error the
+        datagrams received before are delivered first, the error itself
+        is reported with an empty list.
+
+        .. warning::
+            The datagrams are passed as :class:`memoryview` objects on
+            top of the ring buffers which get reused for subsequent
+            batches. Copy the data with :func:`bytes` if it has to be
+            kept after the callback returned.
+
+        :raises uv.UVError:
+            error while start receiving datagrams
+        :raises uv.ClosedHandleError:
+            handle has already been closed or is closing
+
+        :param on_receive_batch:
+            callback called with the received datagrams (overrides the
+            current callback if specified)
+        :param slots:
+            maximal number of datagrams per batch
+        :param slot_size:
+            maximal size of a single datagram
+
+        :type on_receive_batch:
+            ((uv.UDP, uv.StatusCode, list) -> None) |
+            ((Any, uv.UDP, uv.StatusCode, list) -> None)
+        :type slots:
+            int
+        :type slot_size:
+            int
+        """
+        if self.closing:
+            raise error.ClosedHandleError()
+        self.on_receive_batch = on_receive_batch or self.on_receive_batch
+        receive_batch = UDPReceiveBatch(slots, slot_size, self.recvmmsg)
+        self.uv_cross_udp.batch = receive_batch.c_batch
+        code = lib.cross_uv_udp_recv_batch_start(self.uv_cross_udp)
+        if code != error.StatusCodes.SUCCESS:
+            self.uv_cross_udp.batch = ffi.NULL
+            raise error.UVError(code)
+        self.receive_batch = receive_batch
+        self.loop.batch_receivers.add(self)
+        self.set_pending()
+
+    def flush_receive_batch(self, status=error.StatusCodes.SUCCESS):
+        """
+        Deliver the collected datagrams to the batch callback.
+
+        .. warning::
+            This method is only for internal purposes and is not part
+            of the official API. You should never call it directly!
+
+        :type status:
+            int
+        """
+        if self.receive_batch is None:
+            return
+        if status == error.StatusCodes.SUCCESS:
+            datagrams = self.receive_batch.take()
+        else:
+            # the datagrams received before have already been delivered
+            self.receive_batch.clear()
+            datagrams = []
+        self.on_receive_batch(self, error.StatusCodes.get(status), datagrams)
+
     def receive_stop(self):
         """
         Stop listening for incoming datagrams.
@@ -408,6 +804,10 @@ class UDP(handle.UVHandle):
         code = lib.uv_udp_recv_stop(self.uv_udp)
         if code != error.StatusCodes.SUCCESS:
             raise error.UVError(code)
+        if self.receive_batch is not None:
+            self.uv_cross_udp.batch = ffi.NULL
+            self.receive_batch = None
+            self.loop.batch_receivers.discard(self)
         self.clear_pending()
 
     def set_membership(self, multicast_address, membership, interface_address=None):
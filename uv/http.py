@@ -0,0 +1,533 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2016, Maximilian Köhl <mail@koehlma.de>
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License version 3 as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along
+# with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+HTTP/1.1 server.
+
+Requests are parsed incrementally with :mod:`uv.framing` as data arrives.
+Connections are kept alive and pipelined requests are answered in order,
+no matter in which order the handler responds to them. Request bodies may
+be sent with a content length or chunked. All responses which are ready
+to be sent are written to the stream at once with a single write.
+"""
+
+from __future__ import print_function, unicode_literals, division, absolute_import
+
+import collections
+
+try:
+    from http.client import responses
+except ImportError:  # pragma: no cover
+    from httplib import responses
+
+from . import common, error, framing
+from .loop import Loop
+
+from .handles import tcp
+
+__all__ = ['HTTPRequest', 'HTTPServer']
+
+
+CRLF = b'\r\n'
+
+HEAD_SPLITTER = framing.DelimiterSplitter(CRLF + CRLF)
+LINE_SPLITTER = framing.DelimiterSplitter(CRLF)
+
+
+class HTTPError(Exception):
+    """ Malformed or unsupported request, answered with the given status. """
+
+    def __init__(self, status):
+        super(HTTPError, self).__init__(status)
+        self.status = status
+
+
+class HTTPRequest(object):
+    """
+    Request received by a :class:`uv.http.HTTPServer`. Every request has
+    to be answered exactly once with :func:`uv.http.HTTPRequest.respond`.
+
+    Header names are stored in lower case.
+    """
+
+    def __init__(self, connection, method, target, version, headers):
+        self.connection = connection
+        """
+        Connection the request has been received on.
+
+        :readonly:
+            True
+        :type:
+            uv.http.HTTPConnection
+        """
+        self.method = method
+        """
+        Request method, e.g. `'GET'`.
+
+        :readonly:
+            True
+        :type:
+            unicode
+        """
+        self.target = target
+        """
+        Request target, usually the path and query.
+
+        :readonly:
+            True
+        :type:
+            unicode
+        """
+        self.version = version
+        """
+        HTTP version of the request, e.g. `'HTTP/1.1'`.
+
+        :readonly:
+            True
+        :type:
+            unicode
+        """
+        self.headers = headers
+        """
+        Headers in the order they have been received.
+
+        :readonly:
+            True
+        :type:
+            list[(unicode, unicode)]
+        """
+        self.body = b''
+        """
+        Body of the request.
+
+        :readonly:
+            True
+        :type:
+            bytes
+        """
+        connection_tokens = self.header('connection', '').lower()
+        if version == 'HTTP/1.0':
+            self.keep_alive = 'keep-alive' in connection_tokens
+        else:
+            self.keep_alive = 'close' not in connection_tokens
+        """
+        Keep the connection open after the response has been sent.
+
+        :readonly:
+            False
+        :type:
+            bool
+        """
+        self.response = None
+
+    def header(self, name, default=None):
+        """
+        Get the value of the first header with the given name.
+
+        :param name:
+            name of the header in lower case
+        :param default:
+            value which is returned if there is no such header
+
+        :type name:
+            unicode
+        :type default:
+            unicode | None
+
+        :rtype:
+            unicode | None
+        """
+        for header_name, value in self.headers:
+            if header_name == name:
+                return value
+        return default
+
+    def respond(self, status=200, headers=(), body=b''):
+        """
+        Answer the request. The response is sent as soon as all previous
+        requests on the same connection have been answered.
+
+        :raises RuntimeError:
+            request has already been answered
+
+        :param status:
+            status code of the response
+        :param headers:
+            additional response headers
+        :param body:
+            body of the response
+
+        :type status:
+            int
+        :type headers:
+            list[(unicode, unicode)] | tuple[(unicode, unicode)]
+        :type body:
+            bytes | bytearray | memoryview
+        """
+        if self.response is not None:
+            raise RuntimeError('request has already been answered')
+        lines = ['HTTP/1.1 %d %s' % (status, responses.get(status, 'Unknown'))]
+        lines.extend('%s: %s' % header for header in headers)
+        lines.append('Content-Length: %d' % len(body))
+        if not self.keep_alive:
+            lines.append('Connection: close')
+        elif self.version == 'HTTP/1.0':
+            lines.append('Connection: keep-alive')
+        head = ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+        if self.method == 'HEAD' or not body:
+            self.response = [head]
+        else:
+            self.response = [head, body]
+        self.connection.flush()
+
+
+class HTTPConnection(object):
+    """
+    Connection of a :class:`uv.http.HTTPServer`.
+
+    .. warning::
+        This class is only for internal purposes and is not part of
+        the official API.
+    """
+
+    def __init__(self, server, stream):
+        self.server = server
+        self.stream = stream
+        self.pending = collections.deque()
+        self.request = None
+        self.body_parts = []
+        self.body_size = 0
+        self.closing = False
+        self.eof = False
+        self.on_frame = self.on_head
+        self.reader = framing.FrameReader(stream, HEAD_SPLITTER, self.on_reader_frame,
+                                          server.max_header_size)
+
+    def on_reader_frame(self, reader, status, frame):
+        if self.closing:
+            return
+        if status == error.StatusCodes.ENOBUFS:
+            if self.on_frame == self.on_head:
+                self.fail(431)
+            else:
+                self.fail(413)
+        elif status != error.StatusCodes.SUCCESS:
+            self.eof = True
+            if not self.pending:
+                self.close()
+        else:
+            try:
+                self.on_frame(frame)
+            except HTTPError as http_error:
+                self.fail(http_error.status)
+
+    def expect(self, on_frame, splitter, max_frame):
+        self.on_frame = on_frame
+        self.reader.splitter = splitter
+        self.reader.max_frame = max_frame
+
+    def on_head(self, frame):
+        lines = bytes(frame).decode('latin-1').split('\r\n')
+        if not lines[0] and len(lines) > 1:
+            # tolerate empty lines between pipelined requests
+            lines = lines[1:]
+        try:
+            method, target, version = lines[0].split(' ')
+        except ValueError:
+            raise HTTPError(400)
+        if version not in ('HTTP/1.1', 'HTTP/1.0'):
+            raise HTTPError(505)
+        headers = []
+        for line in lines[1:]:
+            name, colon, value = line.partition(':')
+            if not colon or not name or name != name.strip():
+                raise HTTPError(400)
+            headers.append((name.lower(), value.strip()))
+        request = HTTPRequest(self, method, target, version, headers)
+        self.request = request
+
+        continue_expected = request.header('expect', '').lower() == '100-continue'
+        if continue_expected and not self.pending:
+            self.stream.write(b'HTTP/1.1 100 Continue\r\n\r\n')
+
+        transfer_encoding = request.header('transfer-encoding')
+        content_length = request.header('content-length')
+        if transfer_encoding is not None:
+            if content_length is not None:
+                raise HTTPError(400)
+            if transfer_encoding.lower() != 'chunked':
+                raise HTTPError(501)
+            self.body_parts = []
+            self.body_size = 0
+            self.expect(self.on_chunk_size, LINE_SPLITTER, 1024)
+        elif content_length is not None:
+            if not content_length.isdigit():
+                raise HTTPError(400)
+            length = int(content_length)
+            if length > self.server.max_body_size:
+                raise HTTPError(413)
+            if length:
+                self.expect(self.on_body, framing.FixedLengthSplitter(length), length)
+            else:
+                self.dispatch()
+        else:
+            self.dispatch()
+
+    def on_body(self, frame):
+        self.request.body = bytes(frame)
+        self.expect(self.on_head, HEAD_SPLITTER, self.server.max_header_size)
+        self.dispatch()
+
+    def on_chunk_size(self, frame):
+        size = bytes(frame).split(b';', 1)[0].strip()
+        try:
+            size = int(size, 16)
+        except ValueError:
+            raise HTTPError(400)
+        if size < 0:
+            raise HTTPError(400)
+        if size == 0:
+            self.expect(self.on_trailer, LINE_SPLITTER, self.server.max_header_size)
+            return
+        self.body_size += size
+        if self.body_size > self.server.max_body_size:
+            raise HTTPError(413)
+        self.expect(self.on_chunk_data, framing.FixedLengthSplitter(size + 2), size + 2)
+
+    def on_chunk_data(self, frame):
+        if frame[-2:].tobytes() != CRLF:
+            raise HTTPError(400)
+        self.body_parts.append(frame[:-2])
+        self.expect(self.on_chunk_size, LINE_SPLITTER, 1024)
+
+    def on_trailer(self, frame):
+        if len(frame):
+            # trailer fields are ignored
+            return
+        self.request.body = b''.join(self.body_parts)
+        self.body_parts = []
+        self.expect(self.on_head, HEAD_SPLITTER, self.server.max_header_size)
+        self.dispatch()
+
+    def dispatch(self):
+        request, self.request = self.request, None
+        self.pending.append(request)
+        if not request.keep_alive:
+            # no further requests are read from the connection
+            self.closing = True
+            self.reader.pause()
+        elif len(self.pending) >= self.server.max_pipeline:
+            self.reader.pause()
+        try:
+            self.server.on_request(self.server, request)
+        except Exception:
+            self.server.loop.handle_exception()
+
+    def fail(self, status):
+        request = HTTPRequest(self, 'GET', '', 'HTTP/1.1', [])
+        request.keep_alive = False
+        self.closing = True
+        self.reader.pause()
+        self.pending.append(request)
+        request.respond(status)
+
+    def flush(self):
+        if self.stream.closing:
+            return
+        buffers = []
+        close = False
+        while self.pending and self.pending[0].response is not None:
+            request = self.pending.popleft()
+            buffers.extend(request.response)
+            if not request.keep_alive:
+                close = True
+                break
+        if not buffers:
+            return
+        self.stream.write(buffers)
+        if close or (self.eof and not self.pending):
+            self.stream.shutdown(on_shutdown=self.on_shutdown)
+        elif not self.closing and len(self.pending) < self.server.max_pipeline:
+            self.reader.resume()
+
+    def on_shutdown(self, shutdown_request, status):
+        self.close()
+
+    def close(self):
+        self.closing = True
+        if not self.stream.closing:
+            self.stream.close()
+        self.server.connections.discard(self)
+
+
+class HTTPServer(object):
+    """
+    HTTP/1.1 server on a TCP handle.
+
+    Malformed requests are answered with the corresponding error status
+    and the connection is closed afterwards, e.g. `431` if the request
+    line and headers exceed `max_header_size` and `413` if the body
+    exceeds `max_body_size`. If `max_pipeline` requests of a connection
+    are waiting for their responses, no further requests are read from
+    it until the first response has been sent.
+
+    :raises uv.LoopClosedError:
+        loop has already been closed
+
+    :param on_request:
+        callback which should run after a request has been received
+    :param max_header_size:
+        maximal size of the request line and headers (in bytes)
+    :param max_body_size:
+        maximal size of request bodies (in bytes)
+    :param max_pipeline:
+        maximal number of requests per connection waiting for responses
+    :param loop:
+        event loop the server should run on
+
+    :type on_request:
+        ((uv.http.HTTPServer, uv.http.HTTPRequest) -> None) |
+        ((Any, uv.http.HTTPServer, uv.http.HTTPRequest) -> None)
+    :type max_header_size:
+        int
+    :type max_body_size:
+        int
+    :type max_pipeline:
+        int
+    :type loop:
+        uv.Loop
+    """
+
+    def __init__(self, on_request=None, max_header_size=2**16, max_body_size=2**20,
+                 max_pipeline=32, loop=None):
+        self.loop = loop or Loop.get_current()
+        """
+        Loop the server is running on.
+
+        :readonly:
+            True
+        :type:
+            uv.Loop
+        """
+        self.on_request = on_request or common.dummy_callback
+        """
+        Callback which should run after a request has been received.
+
+
+        .. function:: on_request(http_server, request)
+
+            :param http_server:
+                server the call originates from
+            :param request:
+                request which should be answered
+
+            :type http_server:
+                uv.http.HTTPServer
+            :type request:
+                uv.http.HTTPRequest
+
+
+        :readonly:
+            False
+        :type:
+            ((uv.http.HTTPServer, uv.http.HTTPRequest) -> None) |
+            ((Any, uv.http.HTTPServer, uv.http.HTTPRequest) -> None)
+        """
+        self.max_header_size = max_header_size
+        """
+        Maximal size of the request line and headers.
+
+        :readonly:
+            False
+        :type:
+            int
+        """
+        self.max_body_size = max_body_size
+        """
+        Maximal size of request bodies.
+
+        :readonly:
+            False
+        :type:
+            int
+        """
+        self.max_pipeline = max_pipeline
+        """
+        Maximal number of requests per connection waiting for responses.
+
+        :readonly:
+            False
+        :type:
+            int
+        """
+        self.tcp = tcp.TCP(loop=self.loop)
+        """
+        Listening TCP handle.
+
+        :readonly:
+            True
+        :type:
+            uv.TCP
+        """
+        self.connections = set()
+
+    @property
+    def sockname(self):
+        """
+        Address the server is bound to.
+
+        :readonly:
+            True
+        :rtype:
+            uv.Address4 | uv.Address6
+        """
+        return self.tcp.sockname
+
+    def listen(self, address, backlog=128):
+        """
+        Bind the server to the given address and start listening.
+
+        :raises uv.UVError:
+            error while binding or listening
+        :raises uv.ClosedHandleError:
+            server has already been closed
+
+        :param address:
+            address to listen on `(ip, port, flowinfo=0, scope_id=0)`
+        :param backlog:
+            number of connections the kernel might queue
+
+        :type address:
+            tuple | uv.Address
+        :type backlog:
+            int
+        """
+        self.tcp.bind(address)
+        self.tcp.listen(backlog, on_connection=self.on_connection)
+
+    def on_connection(self, server, status):
+        if status != error.StatusCodes.SUCCESS:
+            return
+        stream = server.accept()
+        stream.set_nodelay(True)
+        self.connections.add(HTTPConnection(self, stream))
+
+    def close(self):
+        """
+        Stop listening and close all connections.
+        """
+        self.tcp.close()
+        for connection in list(self.connections):
+            connection.close()
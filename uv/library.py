@@ -16,10 +16,16 @@
 from __future__ import print_function, unicode_literals, division, absolute_import
 
 import collections
+import mmap
 import os
 import sys
 import weakref
 
+try:
+    from collections.abc import Iterable
+except ImportError:  # pragma: no cover
+    from collections import Iterable
+
 from . import __version__
 
 
@@ -32,6 +38,7 @@ if os.environ.get('PYTHON_MOCK_LIBUV', None) == 'True':  # pragma: no cover
     uvcffi.__version__ = __version__
     uvcffi.ffi = Mock()
     uvcffi.lib = Mock()
+    uvcffi.precompiled = True
 
     sys.modules['uvcffi'] = uvcffi
 
@@ -42,6 +49,10 @@ else:
     c_library_version = uvcffi.ffi.string(uvcffi.lib.PYTHON_UV_CFFI_VERSION).decode()
 
 
+# the extension has been compiled at import time if it is missing
+precompiled = getattr(uvcffi, 'precompiled', True)
+
+
 if uvcffi.__version__ != __version__:  # pragma: no cover
     raise RuntimeError('incompatible cffi base library (%s)' % uvcffi.__version__)
 
@@ -123,18 +134,74 @@ def c_require(structure, *requirements):
         _c_dependencies[structure] = [requirements]
 
 
-def make_uv_buffers(iterable_or_bytes):
-    if isinstance(iterable_or_bytes, bytes):
-        buffers = (iterable_or_bytes, )
-    elif isinstance(iterable_or_bytes, (list, tuple)):
-        buffers = iterable_or_bytes
-    elif isinstance(iterable_or_bytes, collections.Iterable):
-        buffers = [bytes(item) for item in iterable_or_bytes]
-    else:
-        raise Exception('fix me')
-    c_buffers = [ffi.new('char[]', item) for item in buffers]
+buffer_types = (bytes, bytearray, memoryview, mmap.mmap)
+
+
+def normalize_buffers(buffers, copy=True):
+    """
+    Normalize the given buffer or iterable of buffers into a sequence
+    of buffers. If `copy` is `True` all buffers which are not already
+    immutable :class:`bytes` objects are converted to :class:`bytes`.
+
+    :param buffers:
+        buffer or iterable of buffers
+    :param copy:
+        convert mutable buffers to bytes
+
+    :type buffers:
+        tuple[bytes] | list[bytes] | bytes | bytearray | memoryview
+    :type copy:
+        bool
+
+    :rtype:
+        tuple | list
+    """
+    if isinstance(buffers, buffer_types):
+        buffers = (buffers, )
+    elif not isinstance(buffers, (list, tuple)):
+        if not isinstance(buffers, Iterable):
+            raise TypeError('buffers have to be a buffer or an iterable of buffers')
+        buffers = list(buffers)
+    if copy:
+        return [item if isinstance(item, bytes) else bytes(item) for item in buffers]
+    return buffers
+
+
+def make_uv_buffers(buffers, copy=True):
+    """
+    Create a libuv buffer array from the given buffers.
+
+    If `copy` is `True` the data is copied into newly allocated memory.
+    Otherwise the libuv buffers point directly to the memory of the
+    given objects which therefore must support the buffer protocol
+    (e.g. :class:`bytes`, :class:`bytearray`, :class:`memoryview` or
+    :class:`mmap.mmap`). In both cases the memory is kept alive as long
+    as the returned array is alive.
+
+    :param buffers:
+        buffer or sequence of buffers
+    :param copy:
+        copy the data or reference it directly
+
+    :type buffers:
+        tuple[bytes] | list[bytes] | bytes | bytearray | memoryview
+    :type copy:
+        bool
+
+    :return:
+        libuv buffer array
+    :rtype:
+        ffi.CData[uv_buf_t[]]
+    """
+    buffers = normalize_buffers(buffers, copy)
     uv_buffers = ffi.new('uv_buf_t[]', len(buffers))
+    if copy:
+        c_buffers = [ffi.new('char[]', item) for item in buffers]
+        for index, c_base in enumerate(c_buffers):
+            lib.py_uv_buf_set(uv_buffers + index, c_base, len(c_base) - 1)
+    else:
+        c_buffers = [ffi.from_buffer(item) for item in buffers]
+        for index, c_base in enumerate(c_buffers):
+            lib.py_uv_buf_set(uv_buffers + index, c_base, len(c_base))
     c_require(uv_buffers, c_buffers)
-    for index, c_base in enumerate(c_buffers):
-        lib.py_uv_buf_set(uv_buffers + index, c_base, len(c_base) - 1)
     return uv_buffers
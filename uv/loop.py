@@ -17,14 +17,27 @@ from __future__ import print_function, unicode_literals, division, absolute_impo
 
 import abc
 import collections
+import importlib
 import sys
 import threading
 import traceback
 
+from collections import namedtuple
+
+try:
+    import concurrent.futures
+except ImportError:  # pragma: no cover
+    concurrent = None
+
 from . import base, common, error, library
 from .library import ffi, lib
 
 
+def _require_futures():
+    if concurrent is None:  # pragma: no cover
+        raise RuntimeError('concurrent.futures is not available, install futures')
+
+
 class RunModes(common.Enumeration):
     """
     Run modes to control the behavior of :func:`uv.Loop.run`.
@@ -187,6 +200,238 @@ class DefaultAllocator(Allocator):
         return bytes(ffi.buffer(c_base, length)) if length > 0 else b''
 
 
+class PooledAllocator(Allocator):
+    """
+    Read buffer allocator which hands out fixed-size chunks of larger
+    preallocated slabs. The data is passed to the read callback as a
+    :class:`memoryview` directly on top of the chunk, no copy is made.
+
+    A chunk is returned to the pool as soon as the memoryview and all
+    slices derived from it are released, either explicitly by calling
+    :func:`memoryview.release` or by dropping all references to them.
+    If the pool runs out of free chunks a new slab is allocated unless
+    this would exceed `max_chunks`, in which case `ENOBUFS` is passed
+    to the read callback.
+
+    .. note::
+        On interpreters without reference counting (e.g. PyPy) chunks
+        are only returned after the memoryview has been garbage
+        collected. Release the memoryview explicitly to avoid
+        unnecessary pool growth.
+
+    .. warning::
+        Keeping references to the memoryviews keeps the chunks in use.
+        Copy the data with :func:`bytes` if it has to be stored for a
+        longer period of time.
+    """
+
+    def __init__(self, chunk_size=2**16, slab_chunks=16, max_chunks=None):
+        """
+        :param chunk_size:
+            size of a single chunk
+        :param slab_chunks:
+            number of chunks allocated at once
+        :param max_chunks:
+            maximal number of chunks (unlimited if `None`)
+
+        :type chunk_size:
+            int
+        :type slab_chunks:
+            int
+        :type max_chunks:
+            int | None
+        """
+        self.chunk_size = chunk_size
+        self.slab_chunks = slab_chunks
+        self.max_chunks = max_chunks
+
+        self.c_slabs = []
+        self.free_chunks = []
+
+        self._allocate_slab()
+
+    @property
+    def total_chunks(self):
+        """
+        Number of chunks allocated by the pool.
+
+        :readonly:
+            True
+        :rtype:
+            int
+        """
+        return len(self.c_slabs) * self.slab_chunks
+
+    @property
+    def chunks_in_use(self):
+        """
+        Number of chunks currently in use by libuv or user code.
+
+        :readonly:
+            True
+        :rtype:
+            int
+        """
+        return self.total_chunks - len(self.free_chunks)
+
+    def _allocate_slab(self):
+        c_slab = ffi.new('char[]', self.chunk_size * self.slab_chunks)
+        self.c_slabs.append(c_slab)
+        for index in range(self.slab_chunks):
+            self.free_chunks.append(c_slab + index * self.chunk_size)
+
+    def allocate(self, handle, suggested_size, uv_buffer):
+        if not self.free_chunks:
+            total_chunks = self.total_chunks + self.slab_chunks
+            if self.max_chunks is not None and total_chunks > self.max_chunks:
+                library.uv_buffer_set(uv_buffer, ffi.NULL, 0)
+                return
+            self._allocate_slab()
+        library.uv_buffer_set(uv_buffer, self.free_chunks.pop(), self.chunk_size)
+
+    def finalize(self, handle, length, uv_buffer):
+        c_base = library.uv_buffer_get(uv_buffer).base
+        if not c_base:
+            return b''
+        if length <= 0:
+            self.free_chunks.append(c_base)
+            return b''
+        c_chunk = ffi.gc(c_base, self.free_chunks.append)
+        return memoryview(ffi.buffer(c_chunk, length))
+
+
+CallbackMetrics = namedtuple('CallbackMetrics', ['count', 'time'])
+
+LoopMetrics = namedtuple('LoopMetrics', ['iterations', 'poll_time', 'callback_time',
+                                         'lag', 'mean_lag', 'max_lag', 'callbacks',
+                                         'work_queued', 'work_running',
+                                         'max_work_queued'])
+
+
+class MetricsCollector(object):
+    """
+    Collects the metrics of an event loop. All times are measured in
+    nanoseconds using :func:`uv.misc.hrtime`.
+
+    The time spent polling for IO is the time between the prepare and
+    the check phase minus the time spent in callbacks invoked during
+    this period. The lag of an iteration is the time between two polls
+    the loop has been busy with everything else, which is the maximal
+    delay an event occurring right after polling has to wait until the
+    loop is able to handle it.
+
+    .. warning::
+        This class is only for internal purposes and is not part of
+        the official API. Use :func:`uv.Loop.metrics` instead.
+    """
+
+    __slots__ = ['iterations', 'poll_time', 'callback_time', 'lag', 'max_lag',
+                 'lag_time', 'lag_samples', 'callbacks', 'last_check',
+                 'prepare_time', 'prepare_callback_time', 'max_work_queued']
+
+    def __init__(self):
+        self.iterations = 0
+        self.poll_time = 0
+        self.callback_time = 0
+        self.lag = 0
+        self.max_lag = 0
+        self.lag_time = 0
+        self.lag_samples = 0
+        self.callbacks = {}
+        self.last_check = None
+        self.prepare_time = None
+        self.prepare_callback_time = 0
+        self.max_work_queued = 0
+
+    def record_callback(self, name, duration):
+        """
+        Record the execution of a callback.
+
+        :param name:
+            name of the handle or request type the callback belongs to
+        :param duration:
+            execution time in nanoseconds
+
+        :type name:
+            unicode
+        :type duration:
+            int
+        """
+        self.callback_time += duration
+        try:
+            entry = self.callbacks[name]
+        except KeyError:
+            entry = self.callbacks[name] = [0, 0]
+        entry[0] += 1
+        entry[1] += duration
+
+    def record_work_queued(self, work_queued):
+        """
+        Record the number of work requests waiting for a thread of the
+        thread pool.
+
+        :type work_queued:
+            int
+        """
+        self.max_work_queued = max(self.max_work_queued, work_queued)
+
+    def on_run(self):
+        """
+        Called when the loop starts running. Time spent outside of the
+        loop does not count as lag.
+        """
+        self.last_check = lib.uv_hrtime()
+        self.prepare_time = None
+
+    def on_prepare(self):
+        """
+        Called right before the loop polls for IO.
+        """
+        self.prepare_time = lib.uv_hrtime()
+        self.prepare_callback_time = self.callback_time
+
+    def on_check(self):
+        """
+        Called right after the loop polled for IO.
+        """
+        now = lib.uv_hrtime()
+        if self.prepare_time is None:
+            return
+        window = now - self.prepare_time
+        poll_time = max(0, window - (self.callback_time - self.prepare_callback_time))
+        self.iterations += 1
+        self.poll_time += poll_time
+        if self.last_check is not None:
+            self.lag = max(0, now - self.last_check - poll_time)
+            self.max_lag = max(self.max_lag, self.lag)
+            self.lag_time += self.lag
+            self.lag_samples += 1
+        self.last_check = now
+        self.prepare_time = None
+
+    def snapshot(self, work_queued=0, work_running=0):
+        """
+        :param work_queued:
+            number of work requests currently waiting
+        :param work_running:
+            number of work requests currently running
+
+        :type work_queued:
+            int
+        :type work_running:
+            int
+        :rtype:
+            uv.loop.LoopMetrics
+        """
+        callbacks = {name: CallbackMetrics(count, duration / 1e9)
+                     for name, (count, duration) in self.callbacks.items()}
+        mean_lag = self.lag_time / self.lag_samples if self.lag_samples else 0
+        return LoopMetrics(self.iterations, self.poll_time / 1e9,
+                           self.callback_time / 1e9, self.lag / 1e9,
+                           mean_lag / 1e9, self.max_lag / 1e9, callbacks,
+                           work_queued, work_running, self.max_work_queued)
+
+
 @ffi.callback('uv_walk_cb')
 def uv_walk_cb(uv_handle, c_handles_set):
     handle = base.BaseHandle.detach(uv_handle)
@@ -211,6 +456,8 @@ class Loop(object):
         size of the default allocators read buffer
     :param default:
         instantiate the default loop
+    :param metrics:
+        collect metrics from the beginning (see :func:`uv.Loop.metrics`)
 
     :type allocator:
         uv.loop.Allocator
@@ -218,11 +465,14 @@ class Loop(object):
         int
     :type default:
         bool
+    :type metrics:
+        bool
     """
 
     _global_lock = threading.RLock()
     _thread_locals = threading.local()
     _default = None
+    _instantiated = False
 
     @classmethod
     def get_default(cls, instantiate=True, **keywords):
@@ -272,7 +522,7 @@ class Loop(object):
             return cls(**keywords)
         return loop
 
-    def __init__(self, allocator=None, buffer_size=2**16, default=False):
+    def __init__(self, allocator=None, buffer_size=2**16, default=False, metrics=False):
         if default:
             with Loop._global_lock:
                 if Loop._default:
@@ -280,6 +530,7 @@ class Loop(object):
                 Loop._default = self
 
         self.base_loop = base.BaseLoop(self, default)
+        Loop._instantiated = True
         self.uv_loop = self.base_loop.uv_loop
 
         self.allocator = allocator or DefaultAllocator(buffer_size)
@@ -358,6 +609,20 @@ class Loop(object):
         self.pending_structures = set()
         self.pending_callbacks = collections.deque()
         self.pending_callbacks_lock = threading.RLock()
+        self.executor_async = None
+        self.executor_results = collections.deque()
+        self.executor_pending = 0
+        self.work_lock = threading.Lock()
+        self.work_queued = 0
+        self.work_running = 0
+        self.streams_to_flush = set()
+        self.write_callbacks = []
+        self.batch_receivers = set()
+
+        self.metrics_collector = None
+        self.collected_metrics = None
+        if metrics:
+            self.enable_metrics()
 
     @property
     def closed(self):
@@ -498,6 +763,8 @@ class Loop(object):
         if self.closed:
             raise error.ClosedLoopError()
         self.make_current()
+        if self.metrics_collector is not None:
+            self.metrics_collector.on_run()
         return bool(lib.uv_run(self.uv_loop, mode))
 
     def stop(self):
@@ -570,8 +837,220 @@ class Loop(object):
             dict
         """
         with self.pending_callbacks_lock:
+            # the loop has already been woken up if there are pending callbacks
+            if not self.pending_callbacks:
+                self.base_loop.wakeup()
             self.pending_callbacks.append((callback, arguments, keywords))
-            self.base_loop.wakeup()
+
+    def submit_threadsafe(self, function, *arguments, **keywords):
+        """
+        Run a function in the event loop's thread and return a future
+        for its result. Like callbacks scheduled with
+        :func:`uv.Loop.call_later` the function does not keep the loop
+        alive.
+
+        This method is thread safe.
+
+        :raises uv.ClosedLoopError:
+            loop has already been closed
+        :raises RuntimeError:
+            :mod:`concurrent.futures` is not available, on Python 2 it is
+            provided by the `futures` backport
+
+        :param function:
+            function which should run in the event loop's thread
+        :param arguments:
+            arguments that should be passed to the function
+        :param keywords:
+            keyword arguments that should be passed to the function
+
+        :type function:
+            callable
+        :type arguments:
+            tuple
+        :type keywords:
+            dict
+
+        :returns:
+            future for the result of the function
+        :rtype:
+            concurrent.futures.Future
+        """
+        if self.closed:
+            raise error.ClosedLoopError()
+        _require_futures()
+        future = concurrent.futures.Future()
+
+        def run():
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                result = function(*arguments, **keywords)
+            except Exception as exception:
+                future.set_exception(exception)
+            else:
+                future.set_result(result)
+
+        self.call_later(run)
+        return future
+
+    def run_in_executor(self, executor, function, *arguments, **keywords):
+        """
+        Run a function in the given executor, e.g. a thread pool, and
+        return a future which is completed in the event loop's thread.
+        Callbacks added to the returned future therefore run in the
+        event loop's thread too. The loop is kept alive until the
+        function has finished.
+
+        :raises uv.ClosedLoopError:
+            loop has already been closed
+        :raises RuntimeError:
+            :mod:`concurrent.futures` is not available, on Python 2 it is
+            provided by the `futures` backport
+
+        :param executor:
+            executor the function should run on
+        :param function:
+            function which should run on the executor
+        :param arguments:
+            arguments that should be passed to the function
+        :param keywords:
+            keyword arguments that should be passed to the function
+
+        :type executor:
+            concurrent.futures.Executor
+        :type function:
+            callable
+        :type arguments:
+            tuple
+        :type keywords:
+            dict
+
+        :returns:
+            future for the result of the function
+        :rtype:
+            concurrent.futures.Future
+        """
+        if self.closed:
+            raise error.ClosedLoopError()
+        _require_futures()
+        if self.executor_async is None or self.executor_async.closing:
+            # async is a keyword since Python 3.7
+            Async = importlib.import_module('.handles.async', __package__).Async
+            self.executor_async = Async(self, on_wakeup=self.on_executor_results)
+            self.executor_async.dereference()
+            self.executor_results = collections.deque()
+            self.executor_pending = 0
+        result = concurrent.futures.Future()
+        executor_async = self.executor_async
+        executor_results = self.executor_results
+
+        def on_done(future):
+            executor_results.append((future, result))
+            try:
+                executor_async.send()
+            except error.ClosedHandleError:  # pragma: no cover
+                pass
+
+        def on_result_done(_):
+            if result.cancelled():
+                future.cancel()
+
+        future = executor.submit(function, *arguments, **keywords)
+        if not self.executor_pending:
+            self.executor_async.reference()
+        self.executor_pending += 1
+        future.add_done_callback(on_done)
+        result.add_done_callback(on_result_done)
+        return result
+
+    @property
+    def metrics_enabled(self):
+        """
+        `True` if and only if the loop is collecting metrics.
+
+        :readonly:
+            True
+        :rtype:
+            bool
+        """
+        return self.metrics_collector is not None
+
+    def enable_metrics(self, reset=False):
+        """
+        Start collecting metrics about the loop's iterations and the
+        callbacks it executes. Collecting metrics adds some overhead to
+        every callback, therefore it is disabled by default. While the
+        collection is disabled the overhead is a single attribute
+        lookup per callback.
+
+        :raises uv.ClosedLoopError:
+            loop has already been closed
+
+        :param reset:
+            discard previously collected metrics
+
+        :type reset:
+            bool
+        """
+        if self.closed:
+            raise error.ClosedLoopError()
+        if reset or self.collected_metrics is None:
+            self.collected_metrics = MetricsCollector()
+        self.metrics_collector = self.collected_metrics
+        self.base_loop.start_internal_check()
+
+    def disable_metrics(self):
+        """
+        Stop collecting metrics. Metrics collected so far are still
+        available through :func:`uv.Loop.metrics`.
+        """
+        if self.metrics_collector is None:
+            return
+        self.metrics_collector = None
+        if not self.closed:
+            self.base_loop.stop_internal_check()
+
+    def metrics(self):
+        """
+        Get a snapshot of the metrics collected so far. All times are
+        given in seconds.
+
+        The snapshot is a named tuple with the following fields:
+
+        `iterations`
+            number of loop iterations
+        `poll_time`
+            time spent waiting for IO
+        `callback_time`
+            time spent executing callbacks
+        `lag`
+            time the loop has been busy between the last two polls
+        `mean_lag`
+            average lag over all iterations
+        `max_lag`
+            maximal lag of a single iteration
+        `callbacks`
+            dictionary mapping handle and request type names, e.g.
+            `'TCP'` or `'WriteRequest'`, to named tuples with the
+            number of callbacks executed (`count`) and the time spent
+            executing them (`time`), callbacks scheduled with
+            :func:`uv.Loop.call_later` are listed under `'Loop'`
+        `work_queued`
+            number of work requests waiting for a thread of the thread
+            pool (see :class:`uv.WorkRequest`)
+        `work_running`
+            number of work requests currently running on the thread pool
+        `max_work_queued`
+            maximal number of waiting work requests
+
+        :return:
+            snapshot of the collected metrics
+        :rtype:
+            uv.loop.LoopMetrics
+        """
+        collector = self.collected_metrics or MetricsCollector()
+        return collector.snapshot(self.work_queued, self.work_running)
 
     def reset_exception(self):
         """
@@ -589,16 +1068,132 @@ class Loop(object):
             This method is only for internal purposes and is not part
             of the official API. You should never call it directly!
         """
+        with self.pending_callbacks_lock:
+            if not self.pending_callbacks:
+                return
+            callbacks, self.pending_callbacks = self.pending_callbacks, collections.deque()
+        # callbacks scheduled from within this batch wake the loop up again
+        metrics = self.metrics_collector
+        for callback, arguments, keywords in callbacks:
+            if metrics is not None:
+                start = lib.uv_hrtime()
+            try:
+                callback(*arguments, **keywords)
+            except Exception:
+                self.handle_exception()
+            if metrics is not None:
+                metrics.record_callback('Loop', lib.uv_hrtime() - start)
+
+    def on_executor_results(self, executor_async):
+        """
+        Called after functions passed to :func:`uv.Loop.run_in_executor`
+        have finished.
+
+         .. warning::
+            This method is only for internal purposes and is not part
+            of the official API. You should never call it directly!
+
+        :type executor_async:
+            uv.Async
+        """
         try:
             while True:
-                with self.pending_callbacks_lock:
-                    callback, arguments, keywords = self.pending_callbacks.popleft()
+                future, result = self.executor_results.popleft()
+                self.executor_pending -= 1
+                if result.cancelled():
+                    continue
+                if future.cancelled():
+                    result.cancel()
+                elif future.exception() is not None:
+                    result.set_exception(future.exception())
+                else:
+                    result.set_result(future.result())
+        except IndexError:
+            pass
+        if not self.executor_pending and not executor_async.closing:
+            executor_async.dereference()
+
+    def on_check(self):
+        """
+        Called right after the event loop polled for IO.
+
+         .. warning::
+            This method is only for internal purposes and is not part
+            of the official API. You should never call it directly!
+        """
+        if self.metrics_collector is not None:
+            self.metrics_collector.on_check()
+
+    def on_prepare(self):
+        """
+        Called right before the event loop polls for IO.
+
+         .. warning::
+            This method is only for internal purposes and is not part
+            of the official API. You should never call it directly!
+        """
+        if self.streams_to_flush or self.write_callbacks:
+            self.base_loop.dereference_internal_prepare()
+        if self.streams_to_flush:
+            streams, self.streams_to_flush = self.streams_to_flush, set()
+            for stream in streams:
                 try:
-                    callback(*arguments, **keywords)
+                    stream.flush()
                 except Exception:
                     self.handle_exception()
-        except IndexError:
-            pass
+        if self.write_callbacks:
+            callbacks, self.write_callbacks = self.write_callbacks, []
+            for on_write in callbacks:
+                try:
+                    on_write(None, error.StatusCodes.SUCCESS)
+                except Exception:
+                    self.handle_exception()
+        if self.batch_receivers:
+            for udp in list(self.batch_receivers):
+                if udp.closing:
+                    self.batch_receivers.discard(udp)
+                elif udp.receive_batch is not None and udp.receive_batch.count:
+                    try:
+                        udp.flush_receive_batch()
+                    except Exception:
+                        self.handle_exception()
+        if self.metrics_collector is not None:
+            # the work above runs user code, it is not part of polling
+            self.metrics_collector.on_prepare()
+
+    def schedule_flush(self, stream):
+        """
+        Flush the corked stream right before the event loop polls for
+        IO the next time.
+
+        .. warning::
+            This method is only for internal purposes and is not part
+            of the official API. You should never call it directly!
+
+        :type stream:
+            uv.UVStream
+        """
+        if not self.streams_to_flush and not self.write_callbacks:
+            self.base_loop.reference_internal_prepare()
+        self.streams_to_flush.add(stream)
+
+    def schedule_write_callback(self, on_write):
+        """
+        Call the write callback of immediately written data right before
+        the event loop polls for IO the next time. The loop is kept alive
+        until then.
+
+        .. warning::
+            This method is only for internal purposes and is not part
+            of the official API. You should never call it directly!
+
+        :type on_write:
+            ((None, uv.StatusCodes) -> None) |
+            ((Any, None, uv.StatusCodes) -> None)
+        """
+        if not self.streams_to_flush and not self.write_callbacks:
+            self.base_loop.reference_internal_prepare()
+        self.write_callbacks.append(on_write)
 
     def handle_exception(self):
         """
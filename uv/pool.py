@@ -0,0 +1,419 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2016, Maximilian Köhl <mail@koehlma.de>
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License version 3 as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along
+# with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Pooling of outbound TCP and pipe connections.
+
+A :class:`ConnectionPool` keeps connections which have been released by
+their users open for a limited amount of time and hands them out again
+to later users of the same endpoint, saving the costs of establishing a
+new connection.
+"""
+
+from __future__ import print_function, unicode_literals, division, absolute_import
+
+import collections
+
+from . import common, error
+from .loop import Loop
+
+from .handles import pipe, tcp, timer
+
+
+class ConnectionPool(object):
+    """
+    Pool of outbound connections. Endpoints given as address tuples are
+    connected to with :class:`uv.TCP` handles, all other endpoints are
+    considered paths and are connected to with :class:`uv.Pipe` handles.
+
+    Connections which are released to the pool are kept open for at
+    most `max_idle_time` milliseconds. While idle the pool reads from
+    them, if the peer closes an idle connection or sends unexpected
+    data it is closed and removed from the pool. Idle connections do
+    not keep the loop alive.
+
+    If opening another connection would exceed `max_connections` or
+    `max_per_endpoint`, users have to wait until a connection is
+    released or closed. Waiting users are served in order.
+
+    :raises uv.LoopClosedError:
+        loop has already been closed
+
+    :param max_connections:
+        maximal number of connections in total
+    :param max_per_endpoint:
+        maximal number of connections per endpoint
+    :param max_idle_time:
+        maximal time a connection stays idle (in milliseconds)
+    :param loop:
+        event loop the pool should run on
+
+    :type max_connections:
+        int
+    :type max_per_endpoint:
+        int
+    :type max_idle_time:
+        int
+    :type loop:
+        uv.Loop
+    """
+
+    def __init__(self, max_connections=64, max_per_endpoint=8, max_idle_time=30000,
+                 loop=None):
+        self.loop = loop or Loop.get_current()
+        """
+        Loop the pool is running on.
+
+        :readonly:
+            True
+        :type:
+            uv.Loop
+        """
+        self.max_connections = max_connections
+        """
+        Maximal number of connections in total.
+
+        :readonly:
+            False
+        :type:
+            int
+        """
+        self.max_per_endpoint = max_per_endpoint
+        """
+        Maximal number of connections per endpoint.
+
+        :readonly:
+            False
+        :type:
+            int
+        """
+        self.max_idle_time = max_idle_time
+        """
+        Maximal time a connection stays idle (in milliseconds).
+
+        :readonly:
+            False
+        :type:
+            int
+        """
+        self.closed = False
+        """
+        Pool has been closed.
+
+        :readonly:
+            True
+        :type:
+            bool
+        """
+        self.endpoints = {}
+        self.connections = collections.Counter()
+        self.idle = {}
+        self.waiting = collections.deque()
+        self.timer = timer.Timer(loop=self.loop, on_timeout=self.on_timeout)
+        self.timer.dereference()
+
+    @property
+    def connection_count(self):
+        """
+        Number of open and connecting connections.
+
+        :readonly:
+            True
+        :rtype:
+            int
+        """
+        return sum(self.connections.values())
+
+    @property
+    def idle_count(self):
+        """
+        Number of idle connections.
+
+        :readonly:
+            True
+        :rtype:
+            int
+        """
+        return sum(len(connections) for connections in self.idle.values())
+
+    @property
+    def waiting_count(self):
+        """
+        Number of users waiting for a connection.
+
+        :readonly:
+            True
+        :rtype:
+            int
+        """
+        return len(self.waiting)
+
+    def acquire(self, endpoint, callback):
+        """
+        Acquire a connection to the given endpoint. The callback is
+        called immediately if an idle connection is available,
+        otherwise after a new connection has been established, after a
+        connection has been released or on error. Every connection
+        has to be passed back to :func:`uv.pool.ConnectionPool.release`
+        after use.
+
+        :raises uv.error.ClosedStructureError:
+            pool has already been closed
+
+        :param endpoint:
+            address or path to connect to
+        :param callback:
+            callback which should run with the connection
+
+        :type endpoint:
+            uv.Address4 | uv.Address6 | tuple | unicode
+        :type callback:
+            ((uv.pool.ConnectionPool, uv.StatusCodes, uv.UVStream | None)
+             -> None) |
+            ((Any, uv.pool.ConnectionPool, uv.StatusCodes,
+              uv.UVStream | None) -> None)
+        """
+        if self.closed:
+            raise error.ClosedStructureError()
+        if isinstance(endpoint, list):
+            endpoint = tuple(endpoint)
+        self.waiting.append((endpoint, callback))
+        self.serve()
+
+    def release(self, stream, reuse=True):
+        """
+        Release a previously acquired connection. The connection is
+        closed instead of being kept if `reuse` is false, if it is no
+        longer readable and writable or if the pool has been closed.
+
+        :param stream:
+            connection to release
+        :param reuse:
+            keep the connection for later users
+
+        :type stream:
+            uv.UVStream
+        :type reuse:
+            bool
+        """
+        endpoint = self.endpoints.get(stream)
+        if endpoint is None:
+            return
+        usable = not stream.closing and stream.readable and stream.writable
+        if self.closed or not reuse or not usable:
+            self.discard(stream)
+            return
+        if self.hand_over(endpoint, stream):
+            return
+        try:
+            stream.read_start(on_read=self.on_idle_read)
+        except error.UVError:
+            self.discard(stream)
+            return
+        stream.dereference()
+        self.idle.setdefault(endpoint, collections.deque()).append((stream, self.loop.now))
+        self.schedule_timeout()
+        self.serve()
+
+    def close(self):
+        """
+        Close the pool and all of its idle connections. Connections
+        which are in use are closed as soon as they are released.
+        Waiting users and users whose connection is still being
+        established are notified with :class:`uv.StatusCodes.ECANCELED`.
+        """
+        if self.closed:
+            return
+        self.closed = True
+        self.timer.close()
+        for connections in list(self.idle.values()):
+            for stream, _ in list(connections):
+                self.discard(stream)
+        waiting, self.waiting = self.waiting, collections.deque()
+        for _, callback in waiting:
+            self.dispatch(callback, error.StatusCodes.ECANCELED, None)
+
+    def dispatch(self, callback, code, stream):
+        """
+        .. warning::
+            This method is only for internal purposes and is not part
+            of the official API. You should never call it directly!
+        """
+        try:
+            callback(self, code, stream)
+        except Exception:
+            self.loop.handle_exception()
+
+    def hand_over(self, endpoint, stream):
+        """
+        Pass the given connection to the first user waiting for the
+        endpoint of the connection.
+
+        .. warning::
+            This method is only for internal purposes and is not part
+            of the official API. You should never call it directly!
+        """
+        for index, (waiting_endpoint, callback) in enumerate(self.waiting):
+            if waiting_endpoint == endpoint:
+                del self.waiting[index]
+                self.dispatch(callback, error.StatusCodes.SUCCESS, stream)
+                return True
+        return False
+
+    def serve(self):
+        """
+        Serve waiting users with idle or new connections as far as the
+        limits of the pool allow.
+
+        .. warning::
+            This method is only for internal purposes and is not part
+            of the official API. You should never call it directly!
+        """
+        index = 0
+        while index < len(self.waiting):
+            endpoint, callback = self.waiting[index]
+            connections = self.idle.get(endpoint)
+            if connections:
+                del self.waiting[index]
+                stream, _ = connections.pop()
+                if not connections:
+                    del self.idle[endpoint]
+                stream.read_stop()
+                stream.on_read = common.dummy_callback
+                stream.reference()
+                self.dispatch(callback, error.StatusCodes.SUCCESS, stream)
+            elif self.connections[endpoint] < self.max_per_endpoint:
+                if self.connection_count >= self.max_connections and not self.evict(endpoint):
+                    index += 1
+                    continue
+                del self.waiting[index]
+                self.connect(endpoint, callback)
+            else:
+                index += 1
+
+    def evict(self, keep):
+        """
+        Close the longest idle connection of an endpoint other than
+        `keep` to make room for a new connection.
+
+        .. warning::
+            This method is only for internal purposes and is not part
+            of the official API. You should never call it directly!
+        """
+        oldest = None
+        for endpoint, connections in self.idle.items():
+            if endpoint != keep and (oldest is None or connections[0][1] < oldest[1]):
+                oldest = connections[0]
+        if oldest is None:
+            return False
+        self.discard(oldest[0], serve=False)
+        return True
+
+    def connect(self, endpoint, callback):
+        """
+        Establish a new connection to the given endpoint.
+
+        .. warning::
+            This method is only for internal purposes and is not part
+            of the official API. You should never call it directly!
+        """
+        if isinstance(endpoint, tuple):
+            stream = tcp.TCP(loop=self.loop)
+        else:
+            stream = pipe.Pipe(loop=self.loop)
+        self.endpoints[stream] = endpoint
+        self.connections[endpoint] += 1
+
+        def on_connect(request, status):
+            if self.closed:
+                self.discard(stream)
+                self.dispatch(callback, error.StatusCodes.ECANCELED, None)
+            elif status == error.StatusCodes.SUCCESS:
+                self.dispatch(callback, status, stream)
+            else:
+                self.discard(stream)
+                self.dispatch(callback, status, None)
+
+        try:
+            stream.connect(endpoint, on_connect=on_connect)
+        except error.UVError as exception:
+            self.discard(stream)
+            self.dispatch(callback, exception.code, None)
+
+    def discard(self, stream, serve=True):
+        """
+        Close the given connection and remove it from the pool.
+
+        .. warning::
+            This method is only for internal purposes and is not part
+            of the official API. You should never call it directly!
+        """
+        endpoint = self.endpoints.pop(stream, None)
+        if endpoint is None:
+            return
+        self.connections[endpoint] -= 1
+        if not self.connections[endpoint]:
+            del self.connections[endpoint]
+        connections = self.idle.get(endpoint)
+        if connections:
+            for index, (idle_stream, _) in enumerate(connections):
+                if idle_stream is stream:
+                    del connections[index]
+                    break
+            if not connections:
+                del self.idle[endpoint]
+        if not stream.closing:
+            stream.close()
+        if serve and not self.closed:
+            self.serve()
+
+    def schedule_timeout(self):
+        """
+        Start the timer for the connection which has been idle for the
+        longest time.
+
+        .. warning::
+            This method is only for internal purposes and is not part
+            of the official API. You should never call it directly!
+        """
+        if self.closed:
+            return
+        if not self.idle:
+            self.timer.stop()
+            return
+        oldest = min(connections[0][1] for connections in self.idle.values())
+        self.timer.start(max(0, oldest + self.max_idle_time - self.loop.now))
+
+    def on_timeout(self, timer_handle):
+        """
+        .. warning::
+            This method is only for internal purposes and is not part
+            of the official API. You should never call it directly!
+        """
+        deadline = self.loop.now - self.max_idle_time
+        for connections in list(self.idle.values()):
+            while connections and connections[0][1] <= deadline:
+                self.discard(connections[0][0], serve=False)
+        self.schedule_timeout()
+        self.serve()
+
+    def on_idle_read(self, stream, status, data):
+        """
+        .. warning::
+            This method is only for internal purposes and is not part
+            of the official API. You should never call it directly!
+        """
+        self.discard(stream)
+        self.schedule_timeout()
@@ -69,6 +69,7 @@ class UVRequest(object):
 
     uv_request_type = None
     uv_request_init = None
+    uv_request_recycle = False
 
     def __init__(self, loop, arguments, uv_handle=None, request_init=None):
         self.loop = loop or Loop.get_current()
@@ -88,12 +89,16 @@ class UVRequest(object):
         if self.loop.closed:
             self.finished = True
             raise error.ClosedLoopError()
-        self.base_request = base.BaseRequest(self, self.loop.base_loop,
-                                             self.__class__.uv_request_type,
-                                             request_init or
-                                             self.__class__.uv_request_init,
-                                             arguments,
-                                             uv_handle=uv_handle)
+        if self.__class__.uv_request_recycle:
+            create_base_request = base.BaseRequest.acquire
+        else:
+            create_base_request = base.BaseRequest
+        self.base_request = create_base_request(self, self.loop.base_loop,
+                                                self.__class__.uv_request_type,
+                                                request_init or
+                                                self.__class__.uv_request_init,
+                                                arguments,
+                                                uv_handle=uv_handle)
         self.set_pending()
 
     @property
@@ -103,7 +108,7 @@ class UVRequest(object):
 
         :type: type
         """
-        return RequestType(self.base_request.uv_request.type).cls
+        return RequestType.get(self.base_request.uv_request.type).cls
 
     def cancel(self):
         """
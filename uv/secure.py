@@ -16,12 +16,9 @@
 from __future__ import print_function, unicode_literals, division, absolute_import
 
 import collections
-import errno
-import socket
 import ssl
 
 from . import abstract, common, error
-from .handles import poll
 
 
 class CertRequirements(common.Enumeration):
@@ -85,57 +82,113 @@ class Protocols(common.Enumeration):
     """
 
 
-class SecureConnectRequest(object):
+class SecureWriteRequest(object):
     """
-    Request to connect to a secure stream.
+    Request to write data to a secure stream. The data is encrypted
+    right away if the handshake has already been completed and queued
+    otherwise. The callback runs after the resulting ciphertext has
+    been written to the underlying stream.
+
+    :param secure:
+        secure stream to write to
+    :param buffers:
+        data which should be written
+    :param on_write:
+        callback which should run after all data has been written
+
+    :type secure:
+        uv.secure.Secure
+    :type buffers:
+        tuple[bytes] | list[bytes] | bytes | bytearray | memoryview
+    :type on_write:
+        ((uv.secure.SecureWriteRequest, uv.StatusCodes) -> None) |
+        ((Any, uv.secure.SecureWriteRequest, uv.StatusCodes) -> None)
     """
 
-    def __init__(self, secure, address, on_connect):
-        """
-        :param secure:
-            secure stream to establish a connection on
-        :param address:
-            address to connect to
-        :param on_connect:
-            callback which should run after a connection has been
-            established
+    __slots__ = ['secure', 'buffers', 'on_write', 'index', 'offset']
+
+    def __init__(self, secure, buffers, on_write=None):
+        if isinstance(buffers, (bytes, bytearray, memoryview)):
+            buffers = [buffers]
+        self.secure = secure
+        self.buffers = [memoryview(buffer) for buffer in buffers]
+        self.on_write = on_write or common.dummy_callback
         """
-        self.stream = secure
-        self.address = address
-        self.on_connect = on_connect or common.dummy_callback
+        Callback which should run after all data has been written.
 
-        self.stream.do_connect(self)
 
-    def cancel(self):
-        raise error.ArgumentError(message='unable to cancel secure connect request')
+        .. function:: on_write(write_request, status)
 
+            :param write_request:
+                request the call originates from
+            :param status:
+                status of the request
 
-class SecureWriteRequest(object):
-    """
-    Request to write data to a secure stream.
-    """
+            :type write_request:
+                uv.secure.SecureWriteRequest
+            :type status:
+                uv.StatusCodes
 
-    def __init__(self, secure, buffers, on_write=None):
-        """
-        :param secure:
-            secure stream handle
-        :type secure:
-            uv.secure.Secure
+
+        :readonly:
+            False
+        :type:
+            ((uv.secure.SecureWriteRequest, uv.StatusCodes) -> None) |
+            ((Any, uv.secure.SecureWriteRequest, uv.StatusCodes) -> None)
         """
-        self.secure = secure
-        self.buffer = buffers if isinstance(buffers, bytes) else b''.join(buffers)
-        self.on_write = on_write or common.dummy_callback
-        self.length = len(self.buffer)
-        self.position = 0
+        self.index = 0
+        self.offset = 0
         self.secure.do_write(self)
 
+    def encrypt(self, ssl_object):
+        """
+        Pass the remaining data to the TLS layer. Partially written
+        buffers are continued from where they have been left off
+        without copying them.
+
+        .. warning::
+            This method is only for internal purposes and is not part
+            of the official API. You should never call it directly!
+
+        :raises ssl.SSLError:
+            error while encrypting the data
+        """
+        while self.index < len(self.buffers):
+            buffer = self.buffers[self.index]
+            while self.offset < len(buffer):
+                self.offset += ssl_object.write(buffer[self.offset:])
+            self.index += 1
+            self.offset = 0
+
+    def on_stream_write(self, write_request, status):
+        """
+        .. warning::
+            This method is only for internal purposes and is not part
+            of the official API. You should never call it directly!
+        """
+        self.on_write(self, status)
+
     def cancel(self):
-        raise error.ArgumentError(message='unable to cancel ssl write request')
+        raise error.ArgumentError(message='unable to cancel secure write request')
 
 
 class SecureHandshakeRequest(object):
     """
     Request to issue the handshake on a secure stream.
+
+    :param secure:
+        secure stream to issue the handshake on
+    :param on_handshake:
+        callback which should run after the handshake has been
+        completed or on error
+
+    :type secure:
+        uv.secure.Secure
+    :type on_handshake:
+        ((uv.secure.SecureHandshakeRequest, uv.StatusCodes,
+          ssl.SSLError | None) -> None) |
+        ((Any, uv.secure.SecureHandshakeRequest, uv.StatusCodes,
+          ssl.SSLError | None) -> None)
     """
 
     __slots__ = ['secure', 'on_handshake']
@@ -144,11 +197,34 @@ class SecureHandshakeRequest(object):
         self.secure = secure
         self.on_handshake = on_handshake or common.dummy_callback
         """
+        Callback which should run after the handshake has been
+        completed or on error.
+
+
+        .. function:: on_handshake(handshake_request, status, ssl_error)
+
+            :param handshake_request:
+                request the call originates from
+            :param status:
+                status of the handshake
+            :param ssl_error:
+                error raised by the TLS layer or `None`
+
+            :type handshake_request:
+                uv.secure.SecureHandshakeRequest
+            :type status:
+                uv.StatusCodes
+            :type ssl_error:
+                ssl.SSLError | None
+
+
+        :readonly:
+            False
         :type:
             ((uv.secure.SecureHandshakeRequest, uv.StatusCodes,
-              ssl.SSLError) -> None) |
+              ssl.SSLError | None) -> None) |
             ((Any, uv.secure.SecureHandshakeRequest, uv.StatusCodes,
-              ssl.SSLError) -> None)
+              ssl.SSLError | None) -> None)
         """
         self.secure.do_handshake(self)
 
@@ -156,317 +232,527 @@ class SecureHandshakeRequest(object):
         raise error.ArgumentError(message='unable to cancel ssl handshake')
 
 
-class Secure:
-    def __init__(self, keyfile=None, certfile=None, family=socket.AF_INET,
-                 cert_requirement=CertRequirements.NONE, server_side=False,
-                 ssl_version=Protocols.SSLv23, ca_certs=None, ciphers=None,
-                 server_hostname=None, context=None, connection=None):
-        """
-        :param keyfile:
-        :param certfile:
-        :param server_side:
-        :param cert_requirement:
-        :param ssl_version:
-        :param ca_certs:
-        :param ciphers:
-        :param server_hostname:
-        :param context:
-
-        :type stream:
-            uv.TCP | uv.Pipe
-        :return:
-        """
-
-        self.keyfile = keyfile
-        self.certfile = certfile
-        self.family = family
-        self.cert_requirement = cert_requirement
-        self.ssl_version = ssl_version
-        self.ca_certs = ca_certs
-        self.ciphers = ciphers
-        self.server_hostname = server_hostname
+class Secure(object):
+    """
+    Transport layer security on top of an established stream. The TLS
+    state machine runs on memory buffers, the encrypted data is read
+    from and written to the underlying stream with its regular read
+    and write methods. Therefore secure streams work with every kind
+    of stream and benefit from corking just like plain streams.
+
+    Data written before the handshake has been completed is queued
+    and encrypted afterwards. Data read from the underlying stream is
+    buffered while reading is stopped.
+
+    Secure streams require Python 3.5 or newer, older versions lack
+    :class:`ssl.MemoryBIO` which the TLS state machine runs on.
+
+    :raises RuntimeError:
+        TLS on memory buffers is not supported by the interpreter
+
+    :param stream:
+        connected stream to secure
+    :param context:
+        TLS context to use, defaults to :func:`ssl.create_default_context`
+    :param server_side:
+        act as the server side of the connection
+    :param server_hostname:
+        hostname of the server to connect to (client side only)
+    :param on_read:
+        callback which should run after decrypted data has been read
+
+    :type stream:
+        uv.UVStream
+    :type context:
+        ssl.SSLContext | None
+    :type server_side:
+        bool
+    :type server_hostname:
+        unicode | None
+    :type on_read:
+        ((uv.secure.Secure, uv.StatusCodes, bytes) -> None) |
+        ((Any, uv.secure.Secure, uv.StatusCodes, bytes) -> None)
+    """
+
+    __slots__ = ['stream', 'context', 'server_side', 'ssl_object', 'incoming',
+                 'outgoing', 'on_read', 'read_size', 'reading', 'handshaken',
+                 'handshake_requests', 'pending_writes', 'stream_status',
+                 'stream_reading', 'on_shutdown']
+
+    def __init__(self, stream, context=None, server_side=False, server_hostname=None,
+                 on_read=None):
+        if not hasattr(ssl, 'MemoryBIO'):
+            raise RuntimeError('TLS on memory buffers is not supported')
+        if context is None:
+            purpose = ssl.Purpose.CLIENT_AUTH if server_side else ssl.Purpose.SERVER_AUTH
+            context = ssl.create_default_context(purpose)
+        self.stream = stream
+        """
+        Underlying stream the encrypted data is transferred over.
+
+        :readonly:
+            True
+        :type:
+            uv.UVStream
+        """
         self.context = context
+        """
+        TLS context the secure stream has been created with.
+
+        :readonly:
+            True
+        :type:
+            ssl.SSLContext
+        """
         self.server_side = server_side
+        """
+        Secure stream acts as the server side of the connection.
+
+        :readonly:
+            True
+        :type:
+            bool
+        """
+        self.incoming = ssl.MemoryBIO()
+        self.outgoing = ssl.MemoryBIO()
+        self.ssl_object = context.wrap_bio(self.incoming, self.outgoing, server_side,
+                                           None if server_side else server_hostname)
+        self.on_read = on_read or common.dummy_callback
+        """
+        Callback which should run after decrypted data has been read.
+
 
-        self._socket = connection or socket.socket(family=family, type=socket.SOCK_STREAM)
-        self._socket.setblocking(False)
-        self._ssl = None
+        .. function:: on_read(secure, status, data)
 
-        self.connected = False
-        self.wrapped = False
+            :param secure:
+                secure stream the call originates from
+            :param status:
+                status of the read operation
+            :param data:
+                decrypted data which has been read
 
+            :type secure:
+                uv.secure.Secure
+            :type status:
+                uv.StatusCodes
+            :type data:
+                bytes
 
+
+        :readonly:
+            False
+        :type:
+            ((uv.secure.Secure, uv.StatusCodes, bytes) -> None) |
+            ((Any, uv.secure.Secure, uv.StatusCodes, bytes) -> None)
         """
-        self.ssl = ssl.SSLSocket(sock, keyfile=keyfile, certfile=certfile,
-                                 ca_certs=ca_certs,
-                                 cert_reqs=cert_requirement, ssl_version=ssl_version,
-                                 server_side=server_side, ciphers=ciphers,
-                                 do_handshake_on_connect=False,  _context=context,
-                                 server_hostname=server_hostname)
+        self.read_size = 2 ** 14
         """
+        Maximal number of bytes passed to a single read callback. The
+        default is the maximal payload of a TLS record.
 
-        self.poll = poll.Poll(self._socket.fileno())
+        :readonly:
+            False
+        :type:
+            int
+        """
+        self.reading = False
+        self.handshaken = False
+        self.handshake_requests = []
+        self.pending_writes = collections.deque()
+        self.stream_status = None
+        self.stream_reading = False
+        self.on_shutdown = None
+
+    @property
+    def loop(self):
+        """
+        Loop the underlying stream is running on.
 
+        :readonly:
+            True
+        :rtype:
+            uv.Loop
+        """
+        return self.stream.loop
 
-        self.on_read = common.dummy_callback
-        self.on_connection = common.dummy_callback
+    @property
+    def closing(self):
+        """
+        Underlying stream is closed or closing.
 
-        self.writable = True
-        self.readable = True
-        self.ipc = False
+        :readonly:
+            True
+        :rtype:
+            bool
+        """
+        return self.stream.closing
 
-        self._connect_request = None
-        self._handshake_request = None
-        self._pending_connections = collections.deque()
+    @property
+    def closed(self):
         """
-        :type: SecureHandshakeRequest | None
+        Underlying stream has been closed.
+
+        :readonly:
+            True
+        :rtype:
+            bool
         """
-        self._pending_writes = collections.deque()
-        self._reading = False
-        self._writing = False
+        return self.stream.closed
 
+    @property
+    def readable(self):
+        """
+        Secure stream is readable.
 
+        :readonly:
+            True
+        :rtype:
+            bool
+        """
+        return self.stream.readable
 
-    def _update_poll(self):
-        events = 0
-        if self._reading:
-            events |= poll.PollEvent.READABLE
-        if self._writing:
-            events |= poll.PollEvent.WRITABLE
-        if events:
-            self.poll.start(events, on_event=self._on_event)
-        else:
-            self.poll.stop()
+    @property
+    def writable(self):
+        """
+        Secure stream is writable.
 
-    def _on_event(self, poll_handle, status, events):
-        if status == error.StatusCodes.SUCCESS:
-            if events & poll.PollEvent.READABLE:
-                self._on_read()
-            elif events & poll.PollEvent.WRITABLE:
-                self._on_write()
-        else:
-            self._on_error()
+        :readonly:
+            True
+        :rtype:
+            bool
+        """
+        return self.stream.writable
 
-    def _on_read(self):
-        try:
-            data = self._ssl.recv(2 ** 16)
-            code = error.StatusCodes.SUCCESS if data else error.StatusCodes.EOF
-        except ssl.SSLError as ssl_error:
-            if ssl_error.args[0] == errno.EAGAIN:
-                data = b''
-                code = error.StatusCodes.SUCCESS
-            else:
-                data = ssl_error
-                code = error.StatusCodes.get(ssl_error.args[0])
-        self.on_read(self, code, data)
+    def getpeercert(self, binary_form=False):
+        """
+        Get the certificate of the peer.
 
-    def _on_write(self):
-        try:
-            while True:
-                request = self._pending_writes[0]
-                """ :type: SecureWriteRequest """
-                count = self._ssl.send(request.buffer[request.position:])
-                request.position += count
-                if request.position >= request.length:
-                    self._pending_writes.popleft()
-                    request.on_write(request, error.StatusCodes.SUCCESS)
-        except IndexError:
-            self._writing = False
-            self._update_poll()
-        except OSError as os_error:
-            if os_error.args[0] == errno.EAGAIN:
-                pass
+        See :func:`ssl.SSLSocket.getpeercert` for details.
+        """
+        return self.ssl_object.getpeercert(binary_form)
 
-    def _on_error(self):
-        pass
+    def cipher(self):
+        """
+        Get the cipher being used.
 
-    def read_start(self, on_read=None):
-        self.on_read = on_read or self.on_read
-        self._reading = True
-        self._update_poll()
+        See :func:`ssl.SSLSocket.cipher` for details.
+        """
+        return self.ssl_object.cipher()
 
-    def read_stop(self):
-        self._reading = False
-        self._update_poll()
+    def version(self):
+        """
+        Get the negotiated protocol version.
 
-    def write(self, buffers, on_write=None):
-        return SecureWriteRequest(self, buffers, on_write)
+        See :func:`ssl.SSLSocket.version` for details.
+        """
+        return self.ssl_object.version()
+
+    def handshake(self, on_handshake=None):
+        """
+        Issue the handshake. The handshake is also issued implicitly by
+        writing or reading.
 
+        :raises uv.ClosedHandleError:
+            underlying stream has already been closed or is closing
 
+        :param on_handshake:
+            callback which should run after the handshake has been
+            completed or on error
 
-    def do_write(self, request):
-        self._pending_writes.append(request)
-        self._writing = True
-        self._update_poll()
+        :type on_handshake:
+            ((uv.secure.SecureHandshakeRequest, uv.StatusCodes,
+              ssl.SSLError | None) -> None) |
+            ((Any, uv.secure.SecureHandshakeRequest, uv.StatusCodes,
+              ssl.SSLError | None) -> None)
 
-    def shutdown(self):
-        self._reading = False
-        self._writing = False
-        self._update_poll()
-        self.ssl.unwrap()
+        :rtype:
+            uv.secure.SecureHandshakeRequest
+        """
+        return SecureHandshakeRequest(self, on_handshake)
 
-    def connect(self, address, on_connect=None):
-        return SecureConnectRequest(self, address, on_connect)
+    def read_start(self, on_read=None):
+        """
+        Start reading decrypted data.
 
-    def bind(self, address):
-        try:
-            self._socket.bind(address)
-        except OSError as os_error:
-            status_code = error.StatusCodes.from_error_number(os_error.errno)
-        else:
-            status_code = 0
-        if status_code != error.StatusCodes.SUCCESS:
-            raise error.UVError(status_code)
-
-    def listen(self, backlog=5, on_connection=None):
-        if self._pending_connections is None:
-            self._pending_connections = collections.deque()
-        self.on_connection = on_connection or self.on_connection
-        self._socket.listen(backlog)
-        self.poll.start(poll.PollEvent.READABLE, self._do_listen)
-
-    def _do_listen(self, poll_handle, status, events):
-        try:
-            while True:
-                connection = self._socket.accept()
-                self._pending_connections.append(connection)
-                self.on_connection(self, error.StatusCodes.SUCCESS)
-        except socket.error as socket_error:
-            pass
-
-    def accept(self, cls=None, server_side=True, *arguments, **keywords):
-        keywords['server_side'] = server_side
-        if self._pending_connections:
-            connection, _ = self._pending_connections.popleft()
-            keywords['connection'] = connection
-            secure = Secure(*arguments, **keywords)
-            secure._setup_ssl()
-            return secure
-        else:
-            raise error.TemporaryUnavailableError()
-
-    def _setup_ssl(self):
-        self.connected = True
-        self._ssl = ssl.SSLSocket(self._socket,
-                                      keyfile=self.keyfile,
-                                      certfile=self.certfile,
-                                      server_side=self.server_side,
-                                      cert_reqs=self.cert_requirement,
-                                      ssl_version=self.ssl_version,
-                                      ca_certs=self.ca_certs,
-                                      do_handshake_on_connect=False,
-                                      ciphers=self.ciphers,
-                                      server_hostname=self.server_hostname,
-                                      _context=self.context)
-
-    def do_connect(self, request):
-        """
-        :type request:
-            SecureConnectRequest
+        :raises uv.UVError:
+            error while start reading from the underlying stream
+        :raises uv.ClosedHandleError:
+            underlying stream has already been closed or is closing
+
+        :type on_read:
+            ((uv.secure.Secure, uv.StatusCodes, bytes) -> None) |
+            ((Any, uv.secure.Secure, uv.StatusCodes, bytes) -> None)
         """
-        try:
-            error_number = self._socket.connect(request.address)
-        except socket.error as socket_error:
-            if socket_error.args[0] == errno.EINPROGRESS:
-                error_number = 0
-            else:
-                error_number = socket_error.args[0]
-        if error_number == 0:
-            self._connect_request = request
-            self.poll.start(poll.PollEvent.WRITABLE, self._do_connect)
+        if self.closing:
+            raise error.ClosedHandleError()
+        self.on_read = on_read or self.on_read
+        self.reading = True
+        if self.handshaken:
+            self.decrypt()
         else:
-            status_code = error.StatusCodes.from_error_number(error_number)
-            raise error.UVError(status_code)
+            self.do_handshake()
+        self.update_reading()
 
-    def _do_connect(self, poll_handle, status, events):
-        self.poll.stop()
-        error_number = self._socket.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
-        status_code = error.StatusCodes.from_error_number(error_number)
-        if status_code == error.StatusCodes.SUCCESS:
-            self._setup_ssl()
-        self._connect_request.on_connect(self._connect_request, status_code)
+    def read_stop(self):
+        """
+        Stop reading decrypted data.
 
-    def handshake(self, on_handshake=None):
-        return SecureHandshakeRequest(self, on_handshake)
+        :raises uv.UVError:
+            error while stop reading from the underlying stream
+        """
+        self.reading = False
+        self.update_reading()
 
-    def do_handshake(self, request):
-        self._handshake_request = request
-        events = poll.PollEvent.READABLE | poll.PollEvent.WRITABLE
-        self.poll.start(events, self._do_handshake)
+    def write(self, buffers, on_write=None):
+        """
+        Write data to the secure stream. Buffers are written in the
+        given order. They are not copied before they are encrypted and
+        must not be modified in the meantime.
+
+        :raises uv.ClosedHandleError:
+            underlying stream has already been closed or is closing
+
+        :param buffers:
+            data which should be written
+        :param on_write:
+            callback which should run after all data has been written
+
+        :type buffers:
+            tuple[bytes] | list[bytes] | bytes | bytearray | memoryview
+        :type on_write:
+            ((uv.secure.SecureWriteRequest, uv.StatusCodes) -> None) |
+            ((Any, uv.secure.SecureWriteRequest, uv.StatusCodes) -> None)
+
+        :rtype:
+            uv.secure.SecureWriteRequest
+        """
+        return SecureWriteRequest(self, buffers, on_write)
 
-    def _do_handshake(self, poll_handle, status, events):
-        if status != error.StatusCodes.SUCCESS:
-            code = error.StatusCodes.get(status)
-            self._handshake_request.on_handshake(self._handshake_request, code, None)
-        else:
+    def shutdown(self, on_shutdown=None):
+        """
+        Send the TLS close notification and shutdown the outgoing side
+        of the underlying stream afterwards. If the handshake is still
+        running the shutdown is deferred until it has been completed.
+
+        :raises uv.ClosedHandleError:
+            underlying stream has already been closed or is closing
+
+        :type on_shutdown:
+            ((uv.ShutdownRequest, uv.StatusCodes) -> None) |
+            ((Any, uv.ShutdownRequest, uv.StatusCodes) -> None)
+
+        :returns:
+            issued shutdown request or `None` if it has been deferred
+        :rtype:
+            uv.ShutdownRequest | None
+        """
+        if self.closing:
+            raise error.ClosedHandleError()
+        if not self.handshaken and (self.handshake_requests or self.pending_writes):
+            self.on_shutdown = on_shutdown or common.dummy_callback
+            return None
+        if self.handshaken:
             try:
-                self._ssl.do_handshake()
-            except ssl.SSLError as ssl_error:
-                if ssl_error.args[0] == ssl.SSL_ERROR_WANT_READ:
-                    self.poll.start(poll.PollEvent.READABLE, self._do_handshake)
-                elif ssl_error.args[0] == ssl.SSL_ERROR_WANT_WRITE:
-                    self.poll.start(poll.PollEvent.WRITABLE, self._do_handshake)
-                else:
-                    self.poll.stop()
-                    code = error.StatusCodes.get(-ssl_error.args[0])
-                    request = self._handshake_request
-                    request.on_handshake(request, code, ssl_error)
-            else:
-                request = self._handshake_request
-                request.on_handshake(request, error.StatusCodes.SUCCESS, None)
-                self._update_poll()
+                self.ssl_object.unwrap()
+            except ssl.SSLError:
+                pass
+            self.flush()
+        return self.stream.shutdown(on_shutdown)
 
+    def close(self, on_closed=None):
+        """
+        Close the underlying stream.
 
-    """
-    def handshake(self, callback=None):
-        self.poll.start(PollEvent.READABLE | PollEvent.WRITABLE, self._do_handshake)
-        self.on_handshake = callback or self.on_handshake
+        :param on_closed:
+            callback which should run after the underlying stream has
+            been closed
 
-    def _on_read(self):
-        print(self.ssl.recv(2 ** 16))
+        :type on_closed:
+            ((uv.Handle) -> None) | ((Any, uv.Handle) -> None)
+        """
+        self.reading = False
+        self.stream.close(on_closed)
 
-    def _on_write(self):
-        pass
+    def do_handshake(self, request=None):
+        """
+        .. warning::
+            This method is only for internal purposes and is not part
+            of the official API. You should never call it directly!
+        """
+        if self.closing:
+            raise error.ClosedHandleError()
+        if request is not None:
+            if self.handshaken:
+                request.on_handshake(request, error.StatusCodes.SUCCESS, None)
+                return
+            self.handshake_requests.append(request)
+        try:
+            self.ssl_object.do_handshake()
+        except ssl.SSLWantReadError:
+            self.flush()
+            self.update_reading()
+            if self.stream_status is not None:
+                self.finish_handshake(self.stream_status, None)
+            return
+        except ssl.SSLError as ssl_error:
+            self.flush()
+            self.finish_handshake(self.stream_status or error.StatusCodes.EPROTO, ssl_error)
+            return
+        self.handshaken = True
+        self.flush()
+        self.finish_handshake(error.StatusCodes.SUCCESS, None)
+        self.encrypt()
+        if self.on_shutdown is not None and not self.closing:
+            on_shutdown, self.on_shutdown = self.on_shutdown, None
+            self.shutdown(on_shutdown)
+        self.decrypt()
+        self.update_reading()
+
+    def finish_handshake(self, status, ssl_error):
+        """
+        .. warning::
+            This method is only for internal purposes and is not part
+            of the official API. You should never call it directly!
+        """
+        requests, self.handshake_requests = self.handshake_requests, []
+        for request in requests:
+            request.on_handshake(request, status, ssl_error)
+        if self.on_shutdown is not None and status != error.StatusCodes.SUCCESS:
+            on_shutdown, self.on_shutdown = self.on_shutdown, None
+            if not self.closing:
+                self.stream.shutdown(on_shutdown)
+        if status != error.StatusCodes.SUCCESS:
+            writes, self.pending_writes = self.pending_writes, collections.deque()
+            for request in writes:
+                request.on_write(request, status)
+            if self.reading:
+                self.reading = False
+                self.on_read(self, status, b'')
 
-    def _on_error(self):
-        pass
+    def do_write(self, request):
+        """
+        .. warning::
+            This method is only for internal purposes and is not part
+            of the official API. You should never call it directly!
+        """
+        if self.closing:
+            raise error.ClosedHandleError()
+        self.pending_writes.append(request)
+        if self.handshaken:
+            self.encrypt()
+        elif len(self.pending_writes) == 1:
+            self.do_handshake()
+
+    def encrypt(self):
+        """
+        Encrypt pending write requests and write the ciphertext to the
+        underlying stream.
 
-    def _on_event(self, poll, status, events):
-        if status == 0:
-            if events & PollEvent.READABLE:
-                self._on_read()
-            elif events & PollEvent.WRITABLE:
-                self._on_write()
-        else:
-            self._on_error()
-
-    def _update_events(self):
-        self.events = 0
-        if self.readable: self.events |= PollEvent.READABLE
-        if self.writable: self.events |= PollEvent.WRITABLE
-        if self.events == 0:
-            self.poll.stop()
-        else:
-            self.poll.start(self.events, self._on_event)
+        .. warning::
+            This method is only for internal purposes and is not part
+            of the official API. You should never call it directly!
+        """
+        while self.pending_writes:
+            request = self.pending_writes[0]
+            try:
+                request.encrypt(self.ssl_object)
+            except ssl.SSLWantReadError:
+                self.update_reading()
+                return
+            except ssl.SSLError:
+                self.pending_writes.popleft()
+                self.flush()
+                request.on_write(request, error.StatusCodes.EPROTO)
+                continue
+            self.pending_writes.popleft()
+            self.flush(request)
+
+    def decrypt(self):
+        """
+        Decrypt buffered data and pass it to the read callback.
 
-    def getpeercert(self, binary_form=False):
-        return self.ssl.getpeercert(binary_form)
+        .. warning::
+            This method is only for internal purposes and is not part
+            of the official API. You should never call it directly!
+        """
+        while self.reading:
+            try:
+                data = self.ssl_object.read(self.read_size)
+            except ssl.SSLWantReadError:
+                if self.stream_status is not None:
+                    self.reading = False
+                    self.on_read(self, self.stream_status, b'')
+                break
+            except ssl.SSLZeroReturnError:
+                data = b''
+            except ssl.SSLError:
+                self.reading = False
+                self.on_read(self, error.StatusCodes.EPROTO, b'')
+                break
+            if not data:
+                self.reading = False
+                self.stream_status = error.StatusCodes.EOF
+                self.on_read(self, error.StatusCodes.EOF, b'')
+                break
+            self.on_read(self, error.StatusCodes.SUCCESS, data)
+        self.flush()
+
+    def flush(self, request=None):
+        """
+        Write the pending ciphertext to the underlying stream.
 
-    def cipher(self):
-        return self.ssl.cipher()
+        .. warning::
+            This method is only for internal purposes and is not part
+            of the official API. You should never call it directly!
+        """
+        data = self.outgoing.read()
+        if not data and request is None:
+            return
+        on_write = None if request is None else request.on_stream_write
+        try:
+            self.stream.write(data, on_write=on_write, copy=False)
+        except error.UVError as uv_error:
+            if request is not None:
+                request.on_write(request, uv_error.code)
 
-    def read_start(self, callback=None):
-        self.on_read = callback or self.on_read
-        self.readable = True
-        self._update_events()
+    def update_reading(self):
+        """
+        Read from the underlying stream while the handshake is running
+        or decrypted data is requested.
 
-    def read_stop(self):
-        self.readable = False
-        self._update_events()
-    """
+        .. warning::
+            This method is only for internal purposes and is not part
+            of the official API. You should never call it directly!
+        """
+        if self.closing:
+            return
+        waiting = not self.handshaken and (self.handshake_requests or self.pending_writes)
+        reading = self.stream_status is None and bool(self.reading or waiting)
+        if reading == self.stream_reading:
+            return
+        if reading:
+            self.stream.read_start(on_read=self.on_stream_read)
+        else:
+            self.stream.read_stop()
+        self.stream_reading = reading
 
-    def close(self):
-        self.poll.close()
+    def on_stream_read(self, stream, status, data):
+        """
+        .. warning::
+            This method is only for internal purposes and is not part
+            of the official API. You should never call it directly!
+        """
+        if status == error.StatusCodes.SUCCESS:
+            self.incoming.write(data)
+        else:
+            self.incoming.write_eof()
+            self.stream_status = status
+        if self.handshaken:
+            self.decrypt()
+            self.encrypt()
+        else:
+            self.do_handshake()
+        self.update_reading()
 
 
 abstract.Request.register(SecureWriteRequest)
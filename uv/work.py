@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2016, Maximilian Köhl <mail@koehlma.de>
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License version 3 as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along
+# with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import print_function, unicode_literals, division, absolute_import
+
+import os
+
+from . import base, common, error, request
+from .library import ffi, lib
+from .loop import Loop
+
+__all__ = ['WorkRequest', 'set_threadpool_size']
+
+
+MAX_THREADPOOL_SIZE = 1024
+
+
+def set_threadpool_size(size):
+    """
+    Set the number of threads of libuv's thread pool. The thread pool
+    is shared by all loops and is started on first use, therefore the
+    size has to be set before the first loop is created. This is the
+    same as setting the `UV_THREADPOOL_SIZE` environment variable.
+
+    :raises RuntimeError:
+        a loop has already been created
+    :raises ValueError:
+        size is out of range
+
+    :param size:
+        number of threads (between 1 and 1024)
+
+    :type size:
+        int
+    """
+    if Loop._instantiated:
+        raise RuntimeError('thread pool size must be set before the first loop is created')
+    if not 1 <= size <= MAX_THREADPOOL_SIZE:
+        raise ValueError('thread pool size must be between 1 and %d' % MAX_THREADPOOL_SIZE)
+    os.environ['UV_THREADPOOL_SIZE'] = str(size)
+
+
+@ffi.callback('uv_work_cb')
+def uv_work_cb(uv_work):
+    # runs on a thread of the thread pool, the request is pending and
+    # therefore kept alive by its loop until the after work callback
+    work_request = ffi.from_handle(uv_work.data).user_request
+    """ :type: uv.WorkRequest """
+    if work_request is not None:
+        work_request.run()
+
+
+@base.request_callback('uv_after_work_cb')
+def uv_after_work_cb(work_request, status):
+    """
+    :type work_request:
+        uv.WorkRequest
+    :type status:
+        int
+    """
+    loop = work_request.loop
+    if status == error.StatusCodes.ECANCELED:
+        with loop.work_lock:
+            loop.work_queued -= 1
+    work_request.on_after_work(work_request, error.StatusCodes.get(status),
+                               work_request.result, work_request.exception)
+
+
+@request.RequestType.WORK
+class WorkRequest(request.UVRequest):
+    """
+    Request to run a function on libuv's thread pool. After the function
+    has returned the after work callback runs in the event loop's thread.
+
+    The function runs while holding the global interpreter lock. It is
+    intended for blocking calls which release the lock, e.g. hashing or
+    compressing large buffers with :mod:`hashlib` or :mod:`zlib`, and
+    should not be used for CPU bound pure Python code.
+
+    :raises uv.UVError:
+        error while initializing the request
+    :raises uv.ClosedLoopError:
+        loop has already been closed
+
+    :param work:
+        function which should run on the thread pool
+    :param arguments:
+        arguments passed to the function
+    :param on_after_work:
+        callback which should run after the function has returned
+    :param loop:
+        event loop the request should run on
+
+    :type work:
+        callable
+    :type arguments:
+        tuple
+    :type on_after_work:
+        ((uv.WorkRequest, uv.StatusCodes, Any, Exception | None) -> None) |
+        ((Any, uv.WorkRequest, uv.StatusCodes, Any, Exception | None) -> None)
+    :type loop:
+        uv.Loop
+    """
+
+    __slots__ = ['work', 'arguments', 'on_after_work', 'result', 'exception']
+
+    uv_request_type = 'uv_work_t*'
+    uv_request_init = lib.uv_queue_work
+
+    def __init__(self, work, arguments=(), on_after_work=None, loop=None):
+        self.work = work
+        """
+        Function which should run on the thread pool.
+
+        :readonly:
+            True
+        :type:
+            callable
+        """
+        self.arguments = arguments
+        """
+        Arguments passed to the function.
+
+        :readonly:
+            True
+        :type:
+            tuple
+        """
+        self.on_after_work = on_after_work or common.dummy_callback
+        """
+        Callback which should run after the function has returned.
+
+
+        .. function:: on_after_work(work_request, status, result, exception)
+
+            :param work_request:
+                request the call originates from
+            :param status:
+                status of the request, :attr:`uv.StatusCodes.ECANCELED`
+                if the request has been canceled
+            :param result:
+                return value of the function
+            :param exception:
+                exception raised by the function
+
+            :type work_request:
+                uv.WorkRequest
+            :type status:
+                uv.StatusCodes
+            :type result:
+                Any
+            :type exception:
+                Exception | None
+
+
+        :readonly:
+            False
+        :type:
+            ((uv.WorkRequest, uv.StatusCodes, Any, Exception | None) -> None) |
+            ((Any, uv.WorkRequest, uv.StatusCodes, Any, Exception | None) -> None)
+        """
+        self.result = None
+        """
+        Return value of the function.
+
+        :readonly:
+            True
+        :type:
+            Any
+        """
+        self.exception = None
+        """
+        Exception raised by the function.
+
+        :readonly:
+            True
+        :type:
+            Exception | None
+        """
+        loop = loop or Loop.get_current()
+        # the function may start running before the initializer returns
+        with loop.work_lock:
+            loop.work_queued += 1
+            work_queued = loop.work_queued
+        try:
+            super(WorkRequest, self).__init__(loop, (uv_work_cb, uv_after_work_cb))
+        except Exception:
+            with loop.work_lock:
+                loop.work_queued -= 1
+            raise
+        if loop.metrics_collector is not None:
+            loop.metrics_collector.record_work_queued(work_queued)
+
+    def run(self):
+        """
+        Run the function. This method is called from within the thread
+        pool.
+
+        .. warning::
+            This method is only for internal purposes and is not part
+            of the official API. You should never call it directly!
+        """
+        loop = self.loop
+        with loop.work_lock:
+            loop.work_queued -= 1
+            loop.work_running += 1
+        try:
+            self.result = self.work(*self.arguments)
+        except Exception as exception:
+            self.exception = exception
+        finally:
+            with loop.work_lock:
+                loop.work_running -= 1